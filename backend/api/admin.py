@@ -1,34 +1,148 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DefaultUserAdmin
-from .models import User, Assignment, Submission, Book, CalendarEvent
+from django.core.cache import cache
+from .models import User, Assignment, Submission, SubmissionArchive, SubmissionPack, Book, CalendarEvent, \
+    StudentSummary, AuditLog, StudyGroup, GroupMembership, RevokedToken
+from .pagination import EstimatedCountPaginator
 
-class UserAdmin(DefaultUserAdmin):
+SUBJECT_CHOICES_SECONDS = 10 * 60
+
+# Katta jadvallar: COUNT(*) o'rniga planner bahosi, FK'lar uchun sidebar filtr emas autocomplete,
+# qidiruv faqat indeksli prefiks/aniq moslik bo'yicha (0009_admin_search_indexes)
+
+class LargeTableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+class GradedFilter(admin.SimpleListFilter):
+    title = 'baholangan'
+    parameter_name = 'graded'
+
+    def lookups(self, request, model_admin):
+        return (('yes', 'Ha'), ('no', "Yo'q"))
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(grade__isnull=False)
+        if self.value() == 'no':
+            return queryset.filter(grade__isnull=True)
+        return queryset
+
+class ObjectTypeFilter(admin.SimpleListFilter):
+    # AllValuesFieldListFilter butun jadval bo'yicha DISTINCT qiladi, shuning uchun ro'yxat qat'iy
+    title = 'obyekt turi'
+    parameter_name = 'object_type'
+
+    def lookups(self, request, model_admin):
+        models = (Submission, Assignment, Book, CalendarEvent)
+        return [(model._meta.label, model._meta.verbose_name) for model in models]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(object_type=self.value())
+        return queryset
+
+class SubjectFilter(admin.SimpleListFilter):
+    # fan erkin matn, shuning uchun ro'yxat DISTINCT bilan olinadi - lekin har changelist'da emas, keshdan
+    title = 'fan'
+    parameter_name = 'subject'
+    cache_key = 'admin:book_subjects'
+
+    def lookups(self, request, model_admin):
+        subjects = cache.get(self.cache_key)
+        if subjects is None:
+            subjects = list(Book.objects.order_by('subject').values_list('subject', flat=True).distinct())
+            cache.set(self.cache_key, subjects, SUBJECT_CHOICES_SECONDS)
+        return [(subject, subject) for subject in subjects]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(subject=self.value())
+        return queryset
+
+class GroupMembershipInline(admin.TabularInline):
+    model = GroupMembership
+    autocomplete_fields = ('user',)
+    extra = 1
+
+class StudyGroupAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'created_at')
+    search_fields = ('^name',)
+    inlines = (GroupMembershipInline,)
+
+class UserAdmin(LargeTableAdminMixin, DefaultUserAdmin):
     list_display = ('id', 'fullname', 'username', 'role', 'gender', 'birthday_date')
-    search_fields = ('fullname', 'username')
+    search_fields = ('=username', '^fullname')
     list_filter = ('role', 'gender')
 
-class AssignmentAdmin(admin.ModelAdmin):
+class AssignmentAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'title', 'teacher', 'deadline')
-    search_fields = ('title',)
-    list_filter = ('teacher',)
+    list_select_related = ('teacher',)
+    search_fields = ('^title',)
+    autocomplete_fields = ('teacher', 'group')
 
-class SubmissionAdmin(admin.ModelAdmin):
+class SubmissionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'assignment', 'student', 'submitted_at', 'grade', 'attempt')
-    search_fields = ('assignment__title', 'student__fullname')
-    list_filter = ('assignment',)
+    list_select_related = ('assignment', 'student')
+    search_fields = ('=student__username', '^student__fullname', '^assignment__title')
+    list_filter = (GradedFilter, 'is_latest')
+    autocomplete_fields = ('assignment', 'student', 'claimed_by')
+
+class SubmissionPackInline(admin.TabularInline):
+    model = SubmissionPack
+    fields = readonly_fields = ('name', 'file_count', 'original_size', 'packed_size', 'created_at')
+    extra = 0
+    can_delete = False
 
-class BookAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request, obj=None):
+        return False
+
+class SubmissionArchiveAdmin(admin.ModelAdmin):
+    list_display = ('term', 'pack', 'file_count', 'original_size', 'packed_size', 'saved_size', 'updated_at')
+    readonly_fields = ('term', 'pack', 'file_count', 'original_size', 'packed_size', 'updated_at')
+    inlines = (SubmissionPackInline,)
+
+class BookAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'title', 'subject', 'uploaded_by')
-    search_fields = ('title', 'subject')
-    list_filter = ('subject',)
+    list_select_related = ('uploaded_by',)
+    search_fields = ('^title', '^subject')
+    list_filter = (SubjectFilter,)
+    autocomplete_fields = ('uploaded_by',)
 
-class CalendarEventAdmin(admin.ModelAdmin):
+class CalendarEventAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'title', 'event_type', 'start_time', 'end_time', 'created_by')
-    search_fields = ('title',)
-    list_filter = ('event_type',)
+    list_select_related = ('created_by',)
+    search_fields = ('^title',)
+    list_filter = ('event_type', 'role')
+    autocomplete_fields = ('created_by', 'group')
+
+class StudentSummaryAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('student', 'pending_assignments', 'graded_submissions', 'ungraded_submissions',
+                    'average_grade', 'next_event', 'updated_at')
+    list_select_related = ('student', 'next_event')
+    search_fields = ('=student__username', '^student__fullname')
+    readonly_fields = ('student', 'pending_assignments', 'graded_submissions', 'ungraded_submissions',
+                       'grade_total', 'next_event', 'next_event_start', 'valid_until', 'updated_at')
+
+class AuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('created_at', 'actor', 'action', 'object_type', 'object_id', 'object_repr')
+    list_select_related = ('actor',)
+    list_filter = ('action', ObjectTypeFilter)
+    search_fields = ('=object_id', '=actor__username')
+    readonly_fields = ('created_at', 'actor', 'action', 'object_type', 'object_id', 'object_repr', 'changes')
+
+class RevokedTokenAdmin(LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('jti', 'revoked_at', 'expires_at')
+    search_fields = ('=jti',)
+    readonly_fields = ('jti', 'revoked_at', 'expires_at')
 
 admin.site.register(User, UserAdmin)
+admin.site.register(StudyGroup, StudyGroupAdmin)
 admin.site.register(Assignment, AssignmentAdmin)
 admin.site.register(Submission, SubmissionAdmin)
+admin.site.register(SubmissionArchive, SubmissionArchiveAdmin)
 admin.site.register(Book, BookAdmin)
 admin.site.register(CalendarEvent, CalendarEventAdmin)
+admin.site.register(StudentSummary, StudentSummaryAdmin)
+admin.site.register(AuditLog, AuditLogAdmin)
+admin.site.register(RevokedToken, RevokedTokenAdmin)
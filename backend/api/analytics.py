@@ -0,0 +1,215 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import User, Assignment, Submission
+from .partitions import term_filter
+from .terms import term_for
+
+PERCENTILES = (10, 25, 50, 75, 90)
+GRADE_DTYPE = np.dtype([('student', 'i8'), ('assignment', 'i8'), ('teacher', 'i8'), ('grade', 'f8')])
+# Barcha termlar hisobotini bir vaqtda eskirgan deb belgilash uchun umumiy versiya
+GENERATION_KEY = 'analytics:generation'
+TERM_VERSION_KEY = 'analytics:term:{}'
+REPORT_KEY = 'analytics:report:{}:{}:{}'
+
+
+def resolve_term(term):
+    """
+    Term label for "current" or a "YYYY-MM" label; raises ValueError for a bad one.
+    """
+    if term == 'current':
+        return term_for(timezone.now())
+    term_filter(term)
+    return term
+
+
+def load_grades(term):
+    """
+    Graded submissions of the term (soft-deleted assignments excluded) as a structured array,
+    streamed from the DB in chunks (a server-side cursor on PostgreSQL) without model instances.
+    """
+    rows = (
+        Submission.objects
+        .filter(term_filter(term), assignment__deleted_at=None)
+        .exclude(grade=None)
+        .annotate(value=Cast('grade', FloatField()))
+        .values_list('student_id', 'assignment_id', 'assignment__teacher_id', 'value')
+        .iterator(chunk_size=settings.ANALYTICS_CHUNK_SIZE)
+    )
+    return np.fromiter(rows, dtype=GRADE_DTYPE)
+
+
+def grade_points(grades):
+    # GPA_SCALE: (eng past baho, ball) kamayish tartibida
+    thresholds = np.array([low for low, _ in reversed(settings.GPA_SCALE)], dtype=float)
+    points = np.array([value for _, value in reversed(settings.GPA_SCALE)], dtype=float)
+    return points[np.clip(np.searchsorted(thresholds, grades, side='right') - 1, 0, None)]
+
+
+def _group_quantiles(values, groups, count, q):
+    """
+    Linear-interpolated quantiles q (0..1) of values per group label 0..count-1, all groups at once.
+    Returns a (count, len(q)) array; empty groups get NaN.
+    """
+    ordered = values[np.lexsort((values, groups))]
+    sizes = np.bincount(groups, minlength=count)
+    if not len(ordered):
+        return np.full((count, len(q)), np.nan)
+    starts = np.cumsum(sizes) - sizes
+    last = np.minimum(starts + np.maximum(sizes - 1, 0), len(ordered) - 1)[:, None]
+    positions = np.minimum(starts[:, None] + np.asarray(q)[None, :] * np.maximum(sizes - 1, 0)[:, None], last)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, last)
+    result = ordered[lower] + (ordered[upper] - ordered[lower]) * (positions - lower)
+    result[sizes == 0] = np.nan
+    return result
+
+
+def _group_slopes(x, y, groups, count):
+    # Har bir guruh uchun eng kichik kvadratlar chizig'ining qiyaligi; bitta nuqtali guruhda NaN
+    n = np.bincount(groups, minlength=count)
+    sx, sy = np.bincount(groups, x, count), np.bincount(groups, y, count)
+    sxx, sxy = np.bincount(groups, x * x, count), np.bincount(groups, x * y, count)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+
+
+def _rounded(values):
+    return [None if np.isnan(value) else round(value, 2) for value in np.asarray(values, dtype=float).tolist()]
+
+
+def _quantile_map(row):
+    return dict(zip((str(p) for p in PERCENTILES), _rounded(row)))
+
+
+def _fullnames(pks, batch_size=10_000):
+    # SQLite'da bitta so'rovdagi parametrlar soni cheklangan
+    names = {}
+    for start in range(0, len(pks), batch_size):
+        names.update(User.objects.filter(pk__in=pks[start:start + batch_size]).values_list('pk', 'fullname'))
+    return names
+
+
+def compute_report(term):
+    """
+    Term report: cohort percentiles, each student's average, GPA and percentile rank, per-teacher
+    grade distributions and per-assignment averages with the trend across assignments.
+    """
+    data = load_grades(term)
+    grades = data['grade']
+    points = grade_points(grades)
+    q = np.array(PERCENTILES) / 100
+
+    student_ids, student_index, student_counts = np.unique(data['student'], return_inverse=True, return_counts=True)
+    averages = np.bincount(student_index, grades, len(student_ids)) / np.maximum(student_counts, 1)
+    gpas = np.bincount(student_index, points, len(student_ids)) / np.maximum(student_counts, 1)
+    # Percentil rank: o'rtachasi shu studentnikidan oshmaydigan studentlar ulushi
+    ranks = np.searchsorted(np.sort(averages), averages, side='right') / max(len(student_ids), 1) * 100
+
+    teacher_ids, teacher_index = np.unique(data['teacher'], return_inverse=True)
+    teacher_counts = np.bincount(teacher_index, minlength=len(teacher_ids))
+    teacher_means = np.bincount(teacher_index, grades, len(teacher_ids)) / np.maximum(teacher_counts, 1)
+    teacher_quantiles = _group_quantiles(grades, teacher_index, len(teacher_ids), q)
+    bands = [str(value) for _, value in settings.GPA_SCALE]
+    band_index = np.searchsorted(-np.array([value for _, value in settings.GPA_SCALE], dtype=float), -points)
+    distribution = np.bincount(teacher_index * len(bands) + band_index,
+                               minlength=len(teacher_ids) * len(bands)).reshape(len(teacher_ids), len(bands))
+
+    assignment_ids, assignment_index = np.unique(data['assignment'], return_inverse=True)
+    assignment_counts = np.bincount(assignment_index, minlength=len(assignment_ids))
+    assignment_means = np.bincount(assignment_index, grades, len(assignment_ids)) / np.maximum(assignment_counts, 1)
+    assignment_medians = _group_quantiles(grades, assignment_index, len(assignment_ids), [0.5])[:, 0]
+    assignments = Assignment.all_objects.only('title', 'deadline', 'teacher_id').in_bulk(assignment_ids.tolist())
+    # Trend: dedlayn tartibidagi topshiriqlar o'rtachasi bir topshiriqdan keyingisiga qanchaga o'zgaradi
+    deadlines = np.array([assignments[pk].deadline.timestamp() for pk in assignment_ids.tolist()], dtype=float)
+    assignment_teacher = np.searchsorted(
+        teacher_ids, np.array([assignments[pk].teacher_id for pk in assignment_ids.tolist()], dtype=np.int64))
+    order = np.lexsort((assignment_ids, deadlines))
+    sequence = np.empty(len(order))
+    sequence[order] = np.arange(len(order))
+    # Ustoz ichidagi tartib raqami: umumiy tartib raqamidan oldingi topshiriqlari sonini ayiramiz
+    teacher_order = np.lexsort((sequence, assignment_teacher))
+    teacher_sizes = np.bincount(assignment_teacher, minlength=len(teacher_ids))
+    teacher_sequence = np.empty(len(order))
+    teacher_sequence[teacher_order] = np.arange(len(order)) - np.repeat(np.cumsum(teacher_sizes) - teacher_sizes,
+                                                                         teacher_sizes)
+    teacher_trends = _group_slopes(teacher_sequence, assignment_means, assignment_teacher, len(teacher_ids))
+    cohort_trend = _group_slopes(sequence, assignment_means, np.zeros(len(order), dtype=np.int64), 1)[0]
+
+    names = _fullnames(np.union1d(student_ids, teacher_ids).tolist())
+    student_order = np.lexsort((student_ids, -averages))
+    return {
+        'term': term,
+        'generated_at': timezone.now().isoformat(),
+        'cohort': {
+            'students': len(student_ids),
+            'grades': len(grades),
+            'average': _rounded([grades.mean() if len(grades) else np.nan])[0],
+            'gpa': _rounded([gpas.mean() if len(gpas) else np.nan])[0],
+            'percentiles': _quantile_map(np.percentile(averages, PERCENTILES) if len(averages)
+                                         else np.full(len(PERCENTILES), np.nan)),
+            'trend': _rounded([cohort_trend])[0],
+        },
+        'students': [
+            {'id': pk, 'fullname': names.get(pk, ''), 'grades': count, 'average': average, 'gpa': gpa,
+             'percentile': rank}
+            for pk, count, average, gpa, rank in zip(
+                student_ids[student_order].tolist(), student_counts[student_order].tolist(),
+                _rounded(averages[student_order]), _rounded(gpas[student_order]), _rounded(ranks[student_order]),
+            )
+        ],
+        'teachers': [
+            {'id': pk, 'fullname': names.get(pk, ''), 'grades': count, 'average': average,
+             'percentiles': _quantile_map(quantiles), 'distribution': dict(zip(bands, counts)), 'trend': trend}
+            for pk, count, average, quantiles, counts, trend in zip(
+                teacher_ids.tolist(), teacher_counts.tolist(), _rounded(teacher_means), teacher_quantiles,
+                distribution.tolist(), _rounded(teacher_trends),
+            )
+        ],
+        'assignments': [
+            {'id': pk, 'title': assignments[pk].title, 'teacher_id': assignments[pk].teacher_id,
+             'deadline': assignments[pk].deadline.isoformat(), 'grades': count, 'average': average, 'median': median}
+            for pk, count, average, median in zip(
+                assignment_ids[order].tolist(), assignment_counts[order].tolist(), _rounded(assignment_means[order]),
+                _rounded(assignment_medians[order]),
+            )
+        ],
+    }
+
+
+def _cache():
+    return caches[settings.ANALYTICS_CACHE]
+
+
+def _version(key):
+    return _cache().get_or_set(key, 0, None)
+
+
+def get_report(term):
+    """
+    Cached compute_report(term). Cache keys carry a global and a per-term version, so
+    invalidate() only bumps a counter and a report computed while grades changed is never served.
+    The counters live in the shared ANALYTICS_CACHE, so an invalidation reaches every worker.
+    """
+    cache = _cache()
+    key = REPORT_KEY.format(_version(GENERATION_KEY), term, _version(TERM_VERSION_KEY.format(term)))
+    report = cache.get(key)
+    if report is None:
+        report = compute_report(term)
+        cache.set(key, report, settings.ANALYTICS_CACHE_SECONDS)
+    return report
+
+
+def invalidate(term=None):
+    """
+    Marks the cached report of a term (of every term when None) stale.
+    """
+    key = GENERATION_KEY if term is None else TERM_VERSION_KEY.format(term)
+    cache = _cache()
+    cache.add(key, 0, None)
+    cache.incr(key)
@@ -0,0 +1,106 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .tasks import submit
+
+logger = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    """
+    Collects AuditLog rows in memory and writes them with one bulk_create per batch,
+    when AUDIT_BATCH_SIZE rows are waiting or every AUDIT_FLUSH_SECONDS, off the request path.
+    Rows still buffered when the process dies without a clean exit are lost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = []
+        self._timer = None
+
+    def add(self, row):
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= settings.AUDIT_BATCH_SIZE or settings.BACKGROUND_TASKS_EAGER
+            if not full and self._timer is None:
+                self._timer = threading.Timer(settings.AUDIT_FLUSH_SECONDS, self._flush_later)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self._flush_later()
+
+    def _flush_later(self):
+        submit(self.flush)
+
+    def flush(self):
+        from .models import AuditLog
+
+        with self._lock:
+            rows, self._rows = self._rows, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not rows:
+            return 0
+        try:
+            AuditLog.objects.bulk_create(rows, batch_size=settings.AUDIT_BATCH_SIZE)
+        except Exception:
+            logger.exception("Failed to write %d audit log rows", len(rows))
+            return 0
+        return len(rows)
+
+
+buffer = AuditBuffer()
+atexit.register(buffer.flush)
+
+
+def _row(actor, action, instance, changes):
+    from .models import AuditLog
+
+    return AuditLog(
+        actor=actor if actor is not None and actor.is_authenticated else None,
+        action=action,
+        object_type=instance._meta.label,
+        object_id=str(instance.pk),
+        # o'chirilgan obyektni keyin ham tanib olish uchun (boshqa hollarda qo'shimcha so'rov qilmaymiz)
+        object_repr=str(instance)[:255] if action == 'delete' else '',
+        changes=changes or {},
+        created_at=timezone.now(),
+    )
+
+
+def record(actor, action, instance, changes=None):
+    """
+    Queues an audit row for instance; it is buffered only once the current transaction commits.
+    changes maps field names to [old, new] pairs.
+    """
+    row = _row(actor, action, instance, changes)
+    transaction.on_commit(lambda: buffer.add(row))
+
+
+def delete(actor, instance):
+    """
+    Deletes instance and queues a 'delete' audit row for it.
+    """
+    row = _row(actor, 'delete', instance, None)
+    instance.delete()
+    transaction.on_commit(lambda: buffer.add(row))
+
+
+def diff(model, old, new, fields):
+    """
+    Returns {field: [old, new]} for the fields whose values differ after the model field's
+    to_python() (so "80" and Decimal("80.00") are equal), as JSON-friendly strings.
+    """
+    changes = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        before, after = field.to_python(old.get(name)), field.to_python(new.get(name))
+        if before != after:
+            changes[name] = [None if before is None else str(before), None if after is None else str(after)]
+    return changes
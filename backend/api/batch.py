@@ -0,0 +1,99 @@
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+
+class BatchError(ValueError):
+    pass
+
+
+def batch_cache(request):
+    """
+    The dict shared by the sub-requests of one batch, or None outside a batch.
+    """
+    return getattr(request, 'batch_cache', None)
+
+
+def _sub_request(request, method, path):
+    parts = urlsplit(path)
+    sub = HttpRequest()
+    sub.method = method
+    sub.path = sub.path_info = parts.path
+    sub.GET = QueryDict(parts.query)
+    sub.META = {
+        key: value for key, value in request.META.items()
+        if key not in ('CONTENT_LENGTH', 'CONTENT_TYPE', 'QUERY_STRING', 'PATH_INFO')
+    }
+    sub.META.update(REQUEST_METHOD=method, PATH_INFO=parts.path, QUERY_STRING=parts.query)
+    # JWT bir marta tekshiriladi; ichki so'rovlar shu foydalanuvchi bilan ishlaydi
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    sub.batch_cache = request.batch_cache
+    sub.resolver_match = None
+    return sub
+
+
+def run_batch(request, items):
+    """
+    Executes GET sub-requests against the API routes (api.urls) in-process, sharing the caller's
+    authentication and a per-batch cache dict, and returns their statuses and bodies. A failing
+    sub-request only produces its own error entry.
+    """
+    if not isinstance(items, list) or not items:
+        raise BatchError("'requests' bo'sh bo'lmagan ro'yxat bo'lishi kerak.")
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise BatchError(f"Bitta batch'da ko'pi bilan {settings.BATCH_MAX_REQUESTS} ta so'rov bo'lishi mumkin.")
+
+    request.batch_cache = request._request.batch_cache = {}
+    results = []
+    for item in items:
+        method = str(item.get('method', 'GET')).upper() if isinstance(item, dict) else None
+        path = item.get('path') if isinstance(item, dict) else None
+        if not isinstance(path, str) or not path.startswith('/'):
+            results.append({'status': 400, 'body': {'error': "'path' '/' bilan boshlanishi kerak."}})
+            continue
+        if method not in settings.BATCH_ALLOWED_METHODS:
+            results.append({'status': 405, 'body': {'error': f"{method} batch ichida ruxsat etilmagan."}})
+            continue
+        try:
+            # Faqat API marshrutlari: admin, docs, schema va media batch'dan ko'rinmaydi
+            match = resolve(urlsplit(path).path, urlconf='api.urls')
+        except Resolver404:
+            results.append({'status': 404, 'body': {'detail': "Not found."}})
+            continue
+        if match.url_name in settings.BATCH_EXCLUDED_ROUTES:
+            results.append({'status': 400, 'body': {'error': f"{match.url_name} batch ichida ishlatilmaydi."}})
+            continue
+
+        sub = _sub_request(request, method, path)
+        sub.resolver_match = match
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Http404:
+            results.append({'status': 404, 'body': {'detail': "Not found."}})
+            continue
+        except PermissionDenied:
+            results.append({'status': 403, 'body': {'error': "Ruxsat yo'q"}})
+            continue
+        except Exception:
+            logger.exception("Batch sub-request %s %s failed", method, path)
+            results.append({'status': 500, 'body': {'error': "Server xatosi"}})
+            continue
+        if hasattr(response, 'data'):
+            body = response.data
+        elif response.streaming or not response.content:
+            body = None
+        else:
+            try:
+                body = json.loads(response.content)
+            except ValueError:
+                body = response.content.decode(errors='replace')
+        results.append({'status': response.status_code, 'body': body})
+    return results
@@ -0,0 +1,194 @@
+import hashlib
+import itertools
+import urllib.request
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import direct_uploads
+from api.models import User, Assignment, Submission, Book, CalendarEvent
+from .seed import PREFIX, PASSWORD, SUBMISSION_FILE, BOOK_FILE, ARCHIVED_SUBMISSION_FILE
+
+# role: kim nomidan so'rov yuboriladi (None - anonim, 'metrics' - METRICS_TOKEN bilan)
+# build(ctx, i) -> (path, data); write/delete ssenariylari kerakli obyektni shu yerda yaratadi
+Scenario = namedtuple('Scenario', 'role method build format')
+
+DATETIME_INPUT = '%d-%m-%Y %H:%M:%S'
+_counter = itertools.count()
+
+
+class Context:
+    def __init__(self):
+        self.student = User.objects.filter(username__startswith=f"{PREFIX}student_").order_by('pk').first()
+        self.teacher = (
+            User.objects.filter(username__startswith=f"{PREFIX}ustoz_", assignments__isnull=False)
+            .order_by('pk').first()
+        )
+        self.admin = User.objects.filter(username__startswith=f"{PREFIX}admin_").order_by('pk').first()
+        if not (self.student and self.teacher and self.admin):
+            raise LookupError("Benchmark data not found, run seed_benchmark_data first.")
+        self.assignment = Assignment.objects.filter(teacher=self.teacher).order_by('pk').first()
+        self.submission = Submission.objects.filter(assignment__teacher=self.teacher).order_by('pk').first()
+        self.book = Book.objects.order_by('pk').first()
+        self.event = CalendarEvent.objects.order_by('pk').first()
+        if not Submission.objects.filter(student=self.student, file=ARCHIVED_SUBMISSION_FILE).exists():
+            raise LookupError("Archived benchmark submission not found, run seed_benchmark_data again.")
+        self.tag = f"{timezone.now():%H%M%S}"
+
+    def user(self, role):
+        return {'student': self.student, 'ustoz': self.teacher, 'admin': self.admin}.get(role)
+
+    def unique(self, name):
+        return f"{PREFIX}{name}_{self.tag}_{next(_counter)}"
+
+
+def _deadline():
+    return (timezone.localtime() + timedelta(days=7)).strftime(DATETIME_INPUT)
+
+
+def _user_row(ctx):
+    return {
+        'fullname': "Benchmark User", 'username': ctx.unique('reg'), 'birthday_date': '01-01-2005',
+        'gender': 'erkak', 'address': 'Toshkent', 'temporarily_address': 'Toshkent', 'password': PASSWORD,
+    }
+
+
+def _register(ctx, i):
+    data = _user_row(ctx)
+    data.update(confirm_password=PASSWORD, role='student', is_staff=False, is_superuser=False)
+    return reverse('register'), data
+
+
+def _new_assignment(ctx):
+    return Assignment.objects.create(title=ctx.unique('a'), description="tmp", deadline=timezone.now(),
+                                     teacher=ctx.teacher)
+
+
+def _ungraded_submission(ctx):
+    return Submission.objects.create(assignment=ctx.assignment, student=ctx.student, file=SUBMISSION_FILE,
+                                     attempt=99)
+
+
+def _assignment_payload(ctx):
+    return {'title': ctx.unique('assignment'), 'description': "Benchmark", 'deadline': _deadline()}
+
+
+def _event_payload(ctx):
+    start = timezone.localtime() + timedelta(days=1)
+    return {
+        'title': ctx.unique('event'), 'description': "Benchmark", 'event_type': 'lesson',
+        'start_time': start.strftime(DATETIME_INPUT),
+        'end_time': (start + timedelta(hours=1)).strftime(DATETIME_INPUT),
+    }
+
+
+BOOK_PDF = b"%PDF-1.4\nbenchmark book\n%%EOF\n"
+
+
+def _refresh_token(ctx, i):
+    return {'refresh': str(RefreshToken.for_user(ctx.student))}
+
+
+def _direct_upload(ctx, i):
+    return reverse('uploads-direct'), {
+        'target': 'book', 'filename': 'book.pdf', 'size': len(BOOK_PDF), 'sha256': hashlib.sha256(BOOK_PDF).hexdigest()}
+
+
+def _direct_upload_finalize(ctx, i):
+    # Obyekt ombori bo'lsa fayl oldindan presigned URL bilan yuklanadi; o'lchanadigani faqat finalize
+    data = {'title': ctx.unique('book'), 'subject': 'Matematika', 'token': ''}
+    if settings.DIRECT_UPLOADS:
+        ticket = direct_uploads.presign(ctx.teacher, 'book', 'book.pdf', len(BOOK_PDF),
+                                        hashlib.sha256(BOOK_PDF).hexdigest())
+        # urllib aks holda form Content-Type qo'yadi
+        headers = {**ticket['headers'], 'Content-Type': 'application/octet-stream'}
+        request = urllib.request.Request(ticket['url'], data=BOOK_PDF, headers=headers, method='PUT')
+        urllib.request.urlopen(request).close()
+        data['token'] = ticket['token']
+    return reverse('uploads-direct-finalize'), data
+
+
+# Talaba dashboardi ochilganda yuboriladigan so'rovlar
+DASHBOARD_ROUTES = ('profile-get', 'assignments-list', 'my-grades', 'calendar-list', 'books-list')
+
+
+def _dashboard_batch(ctx, i):
+    return reverse('batch'), {'requests': [{'method': 'GET', 'path': reverse(name)} for name in DASHBOARD_ROUTES]}
+
+
+SCENARIOS = {
+    'register': Scenario(None, 'post', _register, 'json'),
+    'login': Scenario(None, 'post', lambda ctx, i: (
+        reverse('login'), {'username': ctx.student.username, 'password': PASSWORD}), 'json'),
+    'token-refresh': Scenario(None, 'post', lambda ctx, i: (reverse('token-refresh'), _refresh_token(ctx, i)), 'json'),
+    'logout': Scenario(None, 'post', lambda ctx, i: (reverse('logout'), _refresh_token(ctx, i)), 'json'),
+    'users-search': Scenario('ustoz', 'get', lambda ctx, i: (f"{reverse('users-search')}?q=Student+1", None), None),
+    'users-import': Scenario('admin', 'post', lambda ctx, i: (reverse('users-import'), [_user_row(ctx)]), 'json'),
+    'profile-get': Scenario('student', 'get', lambda ctx, i: (reverse('profile-get'), None), None),
+    'profile-update': Scenario('student', 'put', lambda ctx, i: (reverse('profile-update'), {
+        'fullname': ctx.student.fullname, 'birthday_date': '01-01-2005', 'gender': ctx.student.gender,
+        'address': 'Toshkent', 'temporarily_address': 'Toshkent'}), 'json'),
+    'profile-update-field': Scenario('student', 'patch', lambda ctx, i: (
+        reverse('profile-update-field'), {'address': 'Toshkent'}), 'json'),
+    'assignments-list': Scenario('student', 'get', lambda ctx, i: (reverse('assignments-list'), None), None),
+    'assignments-create': Scenario('ustoz', 'post', lambda ctx, i: (
+        reverse('assignments-create'), _assignment_payload(ctx)), 'json'),
+    'assignments-detail': Scenario('student', 'get', lambda ctx, i: (
+        reverse('assignments-detail', kwargs={'pk': ctx.assignment.pk}), None), None),
+    'assignments-update': Scenario('ustoz', 'put', lambda ctx, i: (
+        reverse('assignments-update', kwargs={'pk': ctx.assignment.pk}), _assignment_payload(ctx)), 'json'),
+    'assignments-delete': Scenario('ustoz', 'delete', lambda ctx, i: (
+        reverse('assignments-delete', kwargs={'pk': _new_assignment(ctx).pk}), None), None),
+    'assignments-missing': Scenario('ustoz', 'get', lambda ctx, i: (
+        reverse('assignments-missing', kwargs={'pk': ctx.assignment.pk}), None), None),
+    'assignments-submit': Scenario('student', 'post', lambda ctx, i: (
+        reverse('assignments-submit', kwargs={'assignment_id': _new_assignment(ctx).pk}),
+        {'file': SimpleUploadedFile('answer.txt', b"benchmark answer\n")}), 'multipart'),
+    'assignments-submissions-zip': Scenario('ustoz', 'get', lambda ctx, i: (
+        reverse('assignments-submissions-zip', kwargs={'pk': ctx.assignment.pk}), None), None),
+    'assignments-grade': Scenario('ustoz', 'post', lambda ctx, i: (
+        reverse('assignments-grade', kwargs={'submission_id': ctx.submission.pk}),
+        {'grade': 90, 'feedback': "Yaxshi"}), 'json'),
+    'books-list': Scenario('student', 'get', lambda ctx, i: (reverse('books-list'), None), None),
+    'books-create': Scenario('ustoz', 'post', lambda ctx, i: (reverse('books-create'), {
+        'title': ctx.unique('book'), 'subject': 'Matematika',
+        'file': SimpleUploadedFile('book.pdf', BOOK_PDF)}), 'multipart'),
+    'books-detail': Scenario('student', 'get', lambda ctx, i: (
+        reverse('books-detail', kwargs={'pk': ctx.book.pk}), None), None),
+    'uploads-direct': Scenario('ustoz', 'post', _direct_upload, 'json'),
+    'uploads-direct-finalize': Scenario('ustoz', 'post', _direct_upload_finalize, 'json'),
+    'books-delete': Scenario('admin', 'delete', lambda ctx, i: (reverse('books-delete', kwargs={
+        'pk': Book.objects.create(title=ctx.unique('b'), subject='tmp', file=BOOK_FILE, uploaded_by=ctx.admin).pk
+    }), None), None),
+    'my-grades': Scenario('student', 'get', lambda ctx, i: (reverse('my-grades'), None), None),
+    'teacher-grades': Scenario('ustoz', 'get', lambda ctx, i: (reverse('teacher-grades'), None), None),
+    'all-grades': Scenario('admin', 'get', lambda ctx, i: (reverse('all-grades'), None), None),
+    'reports-grades': Scenario('admin', 'get', lambda ctx, i: (reverse('reports-grades'), None), None),
+    'set-grade': Scenario('ustoz', 'post', lambda ctx, i: (
+        reverse('set-grade', kwargs={'submission_id': ctx.submission.pk}),
+        {'grade': 85, 'feedback': "Yaxshi"}), 'json'),
+    'dashboard-summary': Scenario('student', 'get', lambda ctx, i: (reverse('dashboard-summary'), None), None),
+    'grading-queue': Scenario('ustoz', 'get', lambda ctx, i: (reverse('grading-queue'), None), None),
+    'grading-queue-next': Scenario('ustoz', 'post', lambda ctx, i: (reverse('grading-queue-next'), None), None),
+    'submission-claim': Scenario('ustoz', 'post', lambda ctx, i: (
+        reverse('submission-claim', kwargs={'submission_id': _ungraded_submission(ctx).pk}), None), None),
+    'calendar-list': Scenario('student', 'get', lambda ctx, i: (reverse('calendar-list'), None), None),
+    'calendar-create': Scenario('ustoz', 'post', lambda ctx, i: (
+        reverse('calendar-create'), _event_payload(ctx)), 'json'),
+    'calendar-detail': Scenario('student', 'get', lambda ctx, i: (
+        reverse('calendar-detail', kwargs={'pk': ctx.event.pk}), None), None),
+    'calendar-delete': Scenario('admin', 'delete', lambda ctx, i: (reverse('calendar-delete', kwargs={
+        'pk': CalendarEvent.objects.create(title=ctx.unique('e'), start_time=timezone.now(),
+                                           end_time=timezone.now(), created_by=ctx.admin).pk
+    }), None), None),
+    'audit-log': Scenario('admin', 'get', lambda ctx, i: (reverse('audit-log'), None), None),
+    'batch': Scenario('student', 'post', _dashboard_batch, 'json'),
+    'metrics': Scenario('metrics', 'get', lambda ctx, i: (reverse('metrics'), None), None),
+    'archived-file': Scenario('student', 'get', lambda ctx, i: (
+        reverse('archived-file', kwargs={'name': ARCHIVED_SUBMISSION_FILE}), None), None),
+}
@@ -0,0 +1,160 @@
+import io
+import random
+import zipfile
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import User, Assignment, Submission, Book, CalendarEvent, StudyGroup, GroupMembership
+from api.storage import ARCHIVE_SEPARATOR
+
+PASSWORD = 'benchmark-password'
+PREFIX = 'bench_'
+DEFAULT_VOLUMES = {
+    'students': 2000,
+    'teachers': 50,
+    'admins': 5,
+    'assignments_per_teacher': 20,
+    'submission_rate': 0.5,
+    'attempts': 3,
+    'books': 300,
+    'events': 1000,
+    'groups': 40,
+}
+SUBMISSION_FILE = 'submissions/benchmark.txt'
+BOOK_FILE = 'books/benchmark.txt'
+# archive_submissions natijasidagidek pack: birinchi studentning bitta javobi shu pack ichida
+ARCHIVE_PACK = f"{settings.ARCHIVE_DIR.rstrip('/')}/submissions-benchmark.zip"
+ARCHIVED_SUBMISSION_FILE = f"{ARCHIVE_PACK}{ARCHIVE_SEPARATOR}{SUBMISSION_FILE}"
+
+
+def _users(rng, role, count, password):
+    genders = [choice for choice, _ in User.GENDER_CHOICES]
+    return [
+        User(
+            username=f"{PREFIX}{role}_{index}",
+            fullname=f"{role.title()} {index}",
+            birthday_date=date(1970, 1, 1) + timedelta(days=rng.randrange(15000)),
+            gender=rng.choice(genders),
+            address="Toshkent",
+            temporarily_address="Toshkent",
+            role=role,
+            password=password,
+        )
+        for index in range(count)
+    ]
+
+
+def clear():
+    User.objects.filter(username__startswith=PREFIX).delete()
+    StudyGroup.objects.filter(name__startswith=PREFIX).delete()
+
+
+def seed(volumes=None, rng_seed=42, batch_size=2000):
+    """
+    Seeds a reproducible benchmark dataset; all users share PASSWORD.
+    Returns the number of rows created per model.
+    """
+    volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+    rng = random.Random(rng_seed)
+    password = make_password(PASSWORD)
+    now = timezone.now()
+
+    for name in (SUBMISSION_FILE, BOOK_FILE):
+        if not default_storage.exists(name):
+            default_storage.save(name, ContentFile(b"benchmark file\n"))
+    if not default_storage.exists(ARCHIVE_PACK):
+        pack = io.BytesIO()
+        with zipfile.ZipFile(pack, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(SUBMISSION_FILE, b"benchmark file\n")
+        default_storage.save(ARCHIVE_PACK, ContentFile(pack.getvalue()))
+
+    with transaction.atomic():
+        clear()
+        students = User.objects.bulk_create(_users(rng, 'student', volumes['students'], password), batch_size)
+        teachers = User.objects.bulk_create(_users(rng, 'ustoz', volumes['teachers'], password), batch_size)
+        admins = User.objects.bulk_create(_users(rng, 'admin', volumes['admins'], password), batch_size)
+
+        groups = StudyGroup.objects.bulk_create([
+            StudyGroup(name=f"{PREFIX}{index + 1}{'ABCD'[index % 4]}") for index in range(volumes['groups'])
+        ], batch_size)
+        # har bir student bitta guruhda; topshiriq/tadbirlarning bir qismi guruhsiz (hamma uchun)
+        GroupMembership.objects.bulk_create([
+            GroupMembership(group=groups[index % len(groups)], user=student) for index, student in enumerate(students)
+        ] if groups else [], batch_size)
+        targets = groups + [None] * max(1, len(groups) // 4)
+
+        assignments = Assignment.objects.bulk_create([
+            Assignment(
+                title=f"Topshiriq {teacher.pk}-{index}",
+                description="Benchmark topshirig'i. " * rng.randint(5, 40),
+                deadline=now + timedelta(days=rng.randint(-120, 60)),
+                teacher=teacher,
+                group=rng.choice(targets),
+            )
+            for teacher in teachers
+            for index in range(volumes['assignments_per_teacher'])
+        ], batch_size)
+
+        submissions, submission_count = [], 0
+        members = {membership.user_id: membership.group_id for membership in GroupMembership.objects.filter(
+            group__in=groups)}
+        for student in students:
+            for assignment in assignments:
+                if assignment.group_id not in (None, members.get(student.pk)):
+                    continue
+                if rng.random() >= volumes['submission_rate']:
+                    continue
+                for attempt in range(1, volumes['attempts'] + 1):
+                    graded = rng.random() < 0.6
+                    submissions.append(Submission(
+                        assignment=assignment,
+                        student=student,
+                        file=SUBMISSION_FILE,
+                        attempt=attempt,
+                        is_latest=attempt == volumes['attempts'],
+                        grade=rng.randint(40, 100) if graded else None,
+                        feedback="Yaxshi" if graded else None,
+                    ))
+            if len(submissions) >= batch_size:
+                Submission.objects.bulk_create(submissions, batch_size)
+                submission_count += len(submissions)
+                submissions = []
+        Submission.objects.bulk_create(submissions, batch_size)
+        submission_count += len(submissions)
+        archived = Submission.objects.filter(student__in=students[:1]).order_by('pk').values_list('pk', flat=True)[:1]
+        Submission.objects.filter(pk__in=list(archived)).update(file=ARCHIVED_SUBMISSION_FILE)
+
+        subjects = ['Matematika', 'Fizika', 'Ona tili', 'Ingliz tili', 'Tarix', 'Biologiya']
+        uploaders = teachers + admins
+        books = Book.objects.bulk_create([
+            Book(title=f"Darslik {index}", subject=rng.choice(subjects), file=BOOK_FILE,
+                 uploaded_by=rng.choice(uploaders))
+            for index in range(volumes['books'])
+        ], batch_size)
+
+        event_types = [choice for choice, _ in CalendarEvent.EVENT_TYPE_CHOICES]
+        roles = ['student', 'ustoz', '', '']
+        events = []
+        for index in range(volumes['events']):
+            start = now + timedelta(hours=rng.randint(-24 * 60, 24 * 60))
+            events.append(CalendarEvent(
+                title=f"Tadbir {index}", event_type=rng.choice(event_types), start_time=start,
+                end_time=start + timedelta(minutes=rng.choice([45, 90])), created_by=rng.choice(uploaders),
+                role=rng.choice(roles), group=rng.choice(targets),
+            ))
+        CalendarEvent.objects.bulk_create(events, batch_size)
+
+    return {
+        'users': len(students) + len(teachers) + len(admins),
+        'assignments': len(assignments),
+        'submissions': submission_count,
+        'books': len(books),
+        'events': len(events),
+        'groups': len(groups),
+    }
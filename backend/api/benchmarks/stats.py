@@ -0,0 +1,47 @@
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, queries=None, errors=0):
+    """
+    Summarizes per-request latencies (seconds) into a JSON-friendly dict with milliseconds.
+    """
+    ordered = sorted(latencies)
+    summary = {
+        'requests': len(ordered),
+        'errors': errors,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        'throughput_rps': round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+    }
+    if queries is not None:
+        summary['queries_per_request'] = round(sum(queries) / len(queries), 2) if queries else 0.0
+    return summary
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Compares results against a baseline report and returns regressions, keyed by benchmark name.
+    A regression is a p95 slower than baseline * (1 + tolerance) or more queries per request.
+    """
+    regressions = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or 'p95_ms' not in current:
+            continue
+        problems = []
+        if previous['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            problems.append(f"p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if current.get('queries_per_request', 0) > previous.get('queries_per_request', float('inf')):
+            problems.append(f"queries {previous['queries_per_request']} -> {current['queries_per_request']}")
+        if problems:
+            regressions[name] = problems
+    return regressions
@@ -0,0 +1,144 @@
+import base64
+import os
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.template.defaultfilters import filesizeformat
+from django.utils.text import get_valid_filename
+
+from .models import Assignment, Book, ConsumedUpload, Submission
+from .previews import generate_preview
+from .tasks import run_in_background
+from .uploads import FILE_TYPES, sniff
+
+SALT = 'api.direct_uploads'
+# Turini aniqlash uchun obyektning faqat boshi o'qiladi
+SNIFF_BYTES = 2048
+# direct upload turi -> (model, FileField upload_to, cheklovlari olinadigan UPLOAD_LIMITS route'i)
+TARGETS = {
+    'submission': (Submission, 'submissions/', 'assignments-submit'),
+    'book': (Book, 'books/', 'books-create'),
+    'assignment': (Assignment, 'assignments/', 'assignments-create'),
+}
+
+
+class DirectUploadError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _client():
+    # django-storages S3Storage ulanishi: presign va tekshiruv ombor bilan bir xil sozlamalarda
+    return default_storage.connection.meta.client
+
+
+def _checksum(sha256):
+    return base64.b64encode(bytes.fromhex(sha256)).decode()
+
+
+def _key(model, upload_to, filename):
+    # Kalit model FileField'ining max_length'iga sig'ishi kerak: uzun nom kengaytmasi saqlangan holda qisqartiriladi
+    prefix = f"{upload_to}{uuid.uuid4().hex}/"
+    name, extension = os.path.splitext(get_valid_filename(os.path.basename(filename)))
+    room = model._meta.get_field('file').max_length - len(prefix) - len(extension)
+    return f"{prefix}{name[:max(room, 1)]}{extension}"
+
+
+def presign(user, target, filename, size, sha256, **context):
+    """
+    Checks the declared file against the target's UPLOAD_LIMITS and returns a presigned PUT for
+    a fresh key plus a signed token for finalize(). Size and sha256 are signed headers, so the
+    object store rejects any other body.
+    """
+    model, upload_to, route = TARGETS[target]
+    limits = settings.UPLOAD_LIMITS[route]
+    if size > limits['max_size']:
+        raise DirectUploadError(f"Fayl hajmi {filesizeformat(limits['max_size'])} dan oshmasligi kerak.", 413)
+    extension = os.path.splitext(filename)[1].lower()
+    if not any(extension in FILE_TYPES[kind][1] for kind in limits['types']):
+        raise DirectUploadError(f"Fayl turi ruxsat etilmagan. Ruxsat etilgan turlar: {', '.join(limits['types'])}",
+                                415)
+    key = _key(model, upload_to, filename)
+    checksum = _checksum(sha256)
+    url = _client().generate_presigned_url('put_object', Params={
+        'Bucket': default_storage.bucket_name,
+        'Key': key,
+        'ContentLength': size,
+        'ChecksumSHA256': checksum,
+    }, ExpiresIn=settings.PRESIGNED_UPLOAD_SECONDS)
+    token = signing.dumps({'user': user.pk, 'target': target, 'key': key, 'size': size, 'sha256': sha256, **context},
+                          salt=SALT)
+    return {
+        'token': token,
+        'url': url,
+        'method': 'PUT',
+        'headers': {'Content-Length': str(size), 'x-amz-checksum-sha256': checksum},
+        'expires_in': settings.PRESIGNED_UPLOAD_SECONDS,
+    }
+
+
+def _reject(key, message, status):
+    default_storage.delete(key)
+    raise DirectUploadError(message, status)
+
+
+def finalize(token, user):
+    """
+    Verifies the uploaded object of a presign() token from its metadata and first bytes only:
+    size, stored sha256 checksum and sniffed type. Rejected objects are deleted. Returns the token
+    payload; the caller creates the row with file=payload['key']. payload['verified_sha256'] is the
+    sha256 only when the store returned a matching checksum, else empty.
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        payload = signing.loads(token, salt=SALT, max_age=settings.DIRECT_UPLOAD_FINALIZE_SECONDS)
+    except signing.BadSignature:
+        raise DirectUploadError("Upload token yaroqsiz yoki muddati o'tgan.")
+    if payload['user'] != user.pk:
+        raise DirectUploadError("Bu upload token boshqa foydalanuvchiga tegishli.", 403)
+    route = TARGETS[payload['target']][2]
+    key = payload['key']
+    if ConsumedUpload.objects.filter(key=key).exists():
+        raise DirectUploadError("Bu fayl allaqachon qabul qilingan.", 409)
+
+    client, bucket = _client(), default_storage.bucket_name
+    try:
+        head = client.head_object(Bucket=bucket, Key=key, ChecksumMode='ENABLED')
+    except ClientError:
+        raise DirectUploadError("Fayl hali yuklanmagan.", 409)
+    if head['ContentLength'] != payload['size']:
+        _reject(key, "Yuklangan fayl hajmi e'lon qilinganidan farq qiladi.", 400)
+    checksum = head.get('ChecksumSHA256')
+    if checksum != _checksum(payload['sha256']) and (checksum or settings.DIRECT_UPLOAD_REQUIRE_CHECKSUM):
+        _reject(key, "Yuklangan fayl sha256 summasi mos emas.", 400)
+    # Ombor summani tekshirgan bo'lsagina e'lon qilingan sha256 ga ishonish mumkin; aks holda preview faylni o'zi hash qiladi
+    payload['verified_sha256'] = payload['sha256'] if checksum else ''
+    first_bytes = client.get_object(Bucket=bucket, Key=key, Range=f'bytes=0-{SNIFF_BYTES - 1}')['Body'].read()
+    types = settings.UPLOAD_LIMITS[route]['types']
+    if sniff(first_bytes, key, types) is None:
+        _reject(key, f"Fayl turi ruxsat etilmagan yoki kengaytmasiga mos emas. Ruxsat etilgan turlar: "
+                     f"{', '.join(types)}", 415)
+    return payload
+
+
+def consume(key):
+    """
+    Records the key of a finalized upload. Returns False when it was already recorded, so a token
+    creates one row even when finalized by concurrent requests; call it in the row's transaction.
+    """
+    try:
+        with transaction.atomic():
+            ConsumedUpload.objects.create(key=key)
+    except IntegrityError:
+        return False
+    return True
+
+
+def schedule_preview(instance):
+    # Fayl allaqachon omborda (_committed) - mark_new_file/schedule_preview signallari uni yangi deb bilmaydi
+    run_in_background(generate_preview, instance._meta.label, instance.pk)
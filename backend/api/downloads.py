@@ -0,0 +1,99 @@
+import io
+import logging
+import os
+import re
+import zipfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import Submission
+from .storage import STORED_EXTENSIONS, split_archived_name
+
+logger = logging.getLogger(__name__)
+
+# Fayl nomida papka ajratuvchi va boshqaruv belgilari bo'lmasligi kerak
+_UNSAFE = re.compile(r'[\\/\x00-\x1f]+')
+
+
+class _Sink(io.RawIOBase):
+    """
+    Write-only, unseekable buffer that ZipFile writes into; drain() hands over what was written
+    so far. Being unseekable makes ZipFile write sizes in data descriptors after each member
+    instead of seeking back.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data, self._chunks = b''.join(self._chunks), []
+        return data
+
+
+def stream_zip(entries, chunk_size=None):
+    """
+    Yields a ZIP archive chunk by chunk, built on the fly from (arcname, storage name,
+    datetime) entries: memory stays at about one chunk whatever the archive size, and nothing
+    touches temp disk. Already-compressed formats are stored, the rest deflated. Files missing
+    from storage are skipped.
+    """
+    chunk_size = chunk_size or settings.ZIP_STREAM_CHUNK_SIZE
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', allowZip64=True) as archive:
+        for arcname, name, modified in entries:
+            try:
+                source = default_storage.open(name)
+            except (FileNotFoundError, KeyError):
+                logger.warning("Skipping missing file %s", name)
+                continue
+            info = zipfile.ZipInfo(arcname, date_time=timezone.localtime(modified).timetuple()[:6])
+            info.compress_type = (zipfile.ZIP_STORED if split_archived_name(name)[1].lower().endswith(STORED_EXTENSIONS)
+                                  else zipfile.ZIP_DEFLATED)
+            # Hajm oldindan ma'lum bo'lsa ZipFile katta fayllar uchun ZIP64'ni o'zi tanlaydi
+            info.file_size = source.size
+            with source, archive.open(info, 'w') as member:
+                while chunk := source.read(chunk_size):
+                    member.write(chunk)
+                    # zlib ma'lumotni ichida ushlab turishi mumkin - bo'sh bo'laklar yuborilmaydi
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    # Markaziy katalog ZipFile yopilganda yoziladi
+    yield sink.drain()
+
+
+def submission_entries(assignment):
+    """
+    (arcname, storage name, submitted_at) of every latest attempt of the assignment, named
+    "<student fullname> - <attempt>-urinish<ext>".
+    """
+    rows = (
+        Submission.objects
+        .filter(assignment=assignment, is_latest=True)
+        .exclude(file='')
+        .order_by('student__fullname', 'student_id')
+        .values_list('file', 'attempt', 'submitted_at', 'student__fullname', 'student__username')
+    )
+    used = set()
+    entries = []
+    for name, attempt, submitted_at, fullname, username in rows:
+        extension = os.path.splitext(split_archived_name(name)[1])[1]
+        student = _UNSAFE.sub('_', fullname).strip() or username
+        arcname = f"{student} - {attempt}-urinish{extension}"
+        if arcname in used:
+            # Ismdoshlar fayli ustma-ust tushmasin
+            arcname = f"{student} ({_UNSAFE.sub('_', username)}) - {attempt}-urinish{extension}"
+        used.add(arcname)
+        entries.append((arcname, name, submitted_at))
+    return entries
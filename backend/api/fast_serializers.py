@@ -0,0 +1,216 @@
+import decimal
+from decimal import Decimal
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.core.files.storage import FileSystemStorage
+from django.http import Http404
+from django.utils import timezone
+from rest_framework import fields as drf_fields, relations, status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() == 'iso-8601':
+        return None if output_format is None else field.to_representation
+
+    # tz har bir rows() chaqiruvida bir marta olinadi (activate() qilingan zona hisobga olinadi)
+    def bind(tz):
+        def convert(value):
+            if timezone.is_aware(value):
+                value = value.astimezone(tz)
+            return value.strftime(output_format)
+        return convert
+    bind.needs_timezone = True
+    return bind
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output:
+        return field.to_representation
+    if field.decimal_places is None:
+        return lambda value: '{:f}'.format(value)
+    exponent = Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+    return convert
+
+
+def _file_converter(model_field):
+    storage = model_field.storage
+    if not isinstance(storage, FileSystemStorage) or storage.base_url is None:
+        return lambda value: storage.url(value) if value else None
+    base_url = storage.base_url
+
+    def convert(value):
+        if not value:
+            return None
+        # Oddiy nisbiy nomlar uchun urljoin natijasi base_url + quote(name) bilan bir xil
+        if value[0] == '/' or ':' in value or '/.' in '/' + value or '\\' in value:
+            return storage.url(value)
+        return base_url + quote(value, safe="/~!*()'")
+    return convert
+
+
+def _converter(field, model_field):
+    if isinstance(field, drf_fields.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, drf_fields.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, drf_fields.FileField):
+        if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return None
+        return _file_converter(model_field)
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        return None
+    if isinstance(field, drf_fields.ChoiceField):
+        choices = field.choice_strings_to_values
+        return lambda value: value if value == '' else choices.get(str(value), value)
+    if isinstance(field, (drf_fields.CharField, drf_fields.IntegerField, drf_fields.BooleanField)):
+        return None
+    if isinstance(field, drf_fields.DateField):
+        return field.to_representation
+    raise UnsupportedField(f"{field.__class__.__name__} has no fast converter")
+
+
+class FieldSelectionError(ValueError):
+    pass
+
+
+class ReadPlan:
+    """
+    Precompiled read path for a ModelSerializer: the DB columns to fetch with values_list()
+    and one converter per output field, in the serializer's field order.
+
+    fields narrows the output (and the SELECT) to a subset of field names; expand replaces
+    forward foreign keys listed in Meta.expandable_fields with a nested object read through
+    the same JOINed query.
+    """
+
+    def __init__(self, serializer_class, fields=None, expand=(), prefix=''):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        expandable = getattr(serializer.Meta, 'expandable_fields', {})
+        readable = [name for name, field in serializer.fields.items() if not field.write_only]
+
+        unknown = set(fields or ()) - set(readable)
+        if unknown:
+            raise FieldSelectionError(f"Noma'lum maydon(lar): {', '.join(sorted(unknown))}")
+        not_expandable = set(expand) - set(expandable)
+        if not_expandable:
+            raise FieldSelectionError(f"Kengaytirib bo'lmaydigan maydon(lar): {', '.join(sorted(not_expandable))}")
+
+        self.names, self.columns, self.converters = [], [], []
+        # (output index, column slice, nested plan) - kengaytirilgan FK'lar uchun
+        self.nested = []
+        for name in readable:
+            if fields is not None and name not in fields and name not in expand:
+                continue
+            field = serializer.fields[name]
+            if '.' in field.source or field.source == '*':
+                raise UnsupportedField(f"{name}: nested source '{field.source}'")
+            model_field = model._meta.get_field(field.source)
+            if name in expand:
+                # Faqat bitta obyektga olib boradigan (many-to-one / one-to-one) bog'lanishlar
+                if not (model_field.many_to_one or model_field.one_to_one):
+                    raise FieldSelectionError(f"{name}: faqat ForeignKey maydonlarini kengaytirish mumkin")
+                nested = ReadPlan(expandable[name], prefix=f"{prefix}{model_field.name}__")
+                start = len(self.columns)
+                self.nested.append((len(self.names), slice(start, start + len(nested.columns)), nested))
+                self.names.append(name)
+                self.columns.extend(nested.columns)
+                self.converters.append(None)
+                continue
+            self.names.append(name)
+            self.columns.append(prefix + model_field.attname)
+            self.converters.append(_converter(field, model_field))
+
+    def bind(self, tz):
+        return [
+            convert(tz) if getattr(convert, 'needs_timezone', False) else convert for convert in self.converters
+        ]
+
+    def rows(self, tuples):
+        tz = timezone.get_current_timezone()
+        names, converters = self.names, self.bind(tz)
+        if not self.nested:
+            return [
+                {name: value if convert is None or value is None else convert(value)
+                 for name, convert, value in zip(names, converters, row)}
+                for row in tuples
+            ]
+        return [self._row(row, converters, tz) for row in tuples]
+
+    def _row(self, row, converters, tz):
+        values = list(row)
+        for index, columns, nested in reversed(self.nested):
+            chunk = values[columns]
+            # FK bo'sh bo'lsa (NULL) ichki obyekt ham None
+            has_value = any(value is not None for value in chunk)
+            values[columns] = [nested._row(chunk, nested.bind(tz), tz) if has_value else None]
+        return {
+            name: value if convert is None or value is None else convert(value)
+            for name, convert, value in zip(self.names, converters, values)
+        }
+
+
+@lru_cache(maxsize=256)
+def get_plan(serializer_class, fields=None, expand=()):
+    try:
+        return ReadPlan(serializer_class, fields, expand)
+    except UnsupportedField:
+        return None
+
+
+def parse_selection(request):
+    """
+    Reads ?fields=a,b and ?expand=c from the request into normalized, hashable tuples.
+    """
+    def split(param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return tuple(sorted({part.strip() for part in value.split(',') if part.strip()}))
+
+    return {'fields': split('fields') or None, 'expand': split('expand') or ()}
+
+
+def fast_serialize(serializer_class, queryset, fields=None, expand=()):
+    """
+    Read-only equivalent of serializer_class(queryset, many=True).data built from
+    values_list() tuples; falls back to the serializer when a field can't be compiled.
+    """
+    plan = get_plan(serializer_class, fields, expand)
+    if plan is None:
+        if fields is not None or expand:
+            raise FieldSelectionError("Bu ro'yxat uchun fields/expand qo'llab-quvvatlanmaydi")
+        return serializer_class(queryset, many=True).data
+    return plan.rows(queryset.values_list(*plan.columns).iterator(chunk_size=2000))
+
+
+def fast_response(serializer_class, queryset, request, many=True):
+    """
+    Builds the Response for a list (or, with many=False, a detail) endpoint honouring
+    ?fields= and ?expand=; invalid selections return 400 and a missing object 404.
+    """
+    try:
+        data = fast_serialize(serializer_class, queryset, **parse_selection(request))
+    except FieldSelectionError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    if many:
+        return Response(data)
+    if not data:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+    return Response(data[0])
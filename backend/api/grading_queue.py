@@ -0,0 +1,113 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Submission
+
+QUEUE_ORDERING = ('assignment__deadline', 'submitted_at', 'pk')
+
+
+class CursorError(ValueError):
+    pass
+
+
+def queue_for(user):
+    """
+    Ungraded latest attempts the user may grade, oldest deadline first (served by the
+    submission_grading_queue partial index).
+    """
+    submissions = Submission.objects.filter(grade__isnull=True, is_latest=True, assignment__deleted_at__isnull=True)
+    if user.role != 'admin':
+        submissions = submissions.filter(assignment__teacher=user)
+    return submissions.order_by(*QUEUE_ORDERING)
+
+
+def encode_cursor(deadline, submitted_at, pk):
+    raw = json.dumps([deadline.isoformat(), submitted_at.isoformat(), pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        deadline, submitted_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        deadline, submitted_at, pk = parse_datetime(deadline), parse_datetime(submitted_at), int(pk)
+    except (ValueError, TypeError):
+        raise CursorError("Noto'g'ri cursor")
+    if deadline is None or submitted_at is None:
+        raise CursorError("Noto'g'ri cursor")
+    return deadline, submitted_at, pk
+
+
+def page(queryset, cursor=None, limit=50):
+    """
+    Keyset pagination over QUEUE_ORDERING: returns (page pks, next cursor or None), so deep
+    pages cost the same as the first one.
+    """
+    if cursor:
+        deadline, submitted_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(assignment__deadline__gt=deadline)
+            | Q(assignment__deadline=deadline, submitted_at__gt=submitted_at)
+            | Q(assignment__deadline=deadline, submitted_at=submitted_at, pk__gt=pk)
+        )
+    keys = list(queryset.values_list('assignment__deadline', 'submitted_at', 'pk')[:limit + 1])
+    next_cursor = encode_cursor(*keys[limit - 1]) if len(keys) > limit else None
+    return [key[2] for key in keys[:limit]], next_cursor
+
+
+def _claim_expiry():
+    return timezone.now() - timedelta(seconds=settings.GRADING_CLAIM_SECONDS)
+
+
+def _available(user):
+    return Q(claimed_by__isnull=True) | Q(claimed_by=user) | Q(claimed_at__lt=_claim_expiry())
+
+
+def claim(submission_id, user):
+    """
+    Atomically claims an ungraded latest attempt for the user. Returns False when another
+    grader holds an unexpired claim.
+    """
+    return bool(
+        Submission.objects.filter(_available(user), pk=submission_id, grade__isnull=True, is_latest=True)
+        .update(claimed_by=user, claimed_at=timezone.now())
+    )
+
+
+def lock_for_grading(submission_id, user):
+    """
+    Takes the claim with a conditional UPDATE, which also locks the row until the surrounding
+    transaction ends, so the grade can be saved without another grader slipping in. Returns
+    False when another grader holds an unexpired claim. Must run inside transaction.atomic().
+    """
+    return bool(
+        Submission.objects.filter(_available(user), pk=submission_id)
+        .update(claimed_by=user, claimed_at=timezone.now())
+    )
+
+
+def claim_next(user, attempts=5):
+    """
+    Claims the first unclaimed item of the user's queue; conditional updates make concurrent
+    callers pick different items.
+    """
+    for _ in range(attempts):
+        candidates = list(
+            queue_for(user).filter(Q(claimed_by__isnull=True) | Q(claimed_at__lt=_claim_expiry()))
+            .values_list('pk', flat=True)[:attempts]
+        )
+        if not candidates:
+            return None
+        for pk in candidates:
+            if claim(pk, user):
+                return pk
+    return None
+
+
+def release(submission_id, user):
+    return bool(Submission.objects.filter(pk=submission_id, claimed_by=user).update(claimed_by=None, claimed_at=None))
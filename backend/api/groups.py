@@ -0,0 +1,50 @@
+from django.db.models import Exists, OuterRef, Q
+
+from .models import User, Assignment, CalendarEvent, GroupMembership, Submission
+
+
+def member_groups(user, cache=None):
+    """
+    Subquery of the user's group ids (served by the unique (user, group) index); user may be an OuterRef.
+    With a batch cache the ids are read once and reused by the batch's other sub-requests.
+    """
+    groups = GroupMembership.objects.filter(user=user).values('group')
+    if cache is None:
+        return groups
+    key = ('member_groups', user.pk)
+    if key not in cache:
+        cache[key] = [row['group'] for row in groups]
+    return cache[key]
+
+
+def group_visible(user, cache=None):
+    # group bo'sh - hamma uchun, aks holda foydalanuvchi shu guruh a'zosi bo'lishi kerak
+    return Q(group__isnull=True) | Q(group__in=member_groups(user, cache))
+
+
+def visible_assignments(user, cache=None):
+    """
+    Assignments the user sees: students only get untargeted ones and those of their groups.
+    """
+    assignments = Assignment.objects.all()
+    if user.role == 'student':
+        assignments = assignments.filter(group_visible(user, cache))
+    return assignments
+
+
+def visible_events(user, cache=None):
+    """
+    Events targeted at everyone, at the user's role or at one of the user's groups.
+    """
+    return CalendarEvent.objects.filter(Q(role='') | Q(role=user.role), group_visible(user, cache))
+
+
+def missing_submitters(assignment):
+    """
+    Students the assignment targets who have not submitted anything for it, as one anti-join.
+    """
+    students = User.objects.filter(role='student')
+    if assignment.group_id is not None:
+        students = students.filter(Exists(GroupMembership.objects.filter(group_id=assignment.group_id,
+                                                                         user=OuterRef('pk'))))
+    return students.filter(~Exists(Submission.objects.filter(assignment=assignment, student=OuterRef('pk'))))
@@ -0,0 +1,118 @@
+import os
+import zipfile
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Submission, SubmissionArchive, SubmissionPack
+from api.storage import ARCHIVE_SEPARATOR, STORED_EXTENSIONS
+from api.terms import term_for
+
+
+class Command(BaseCommand):
+    help = "Moves submission files older than N days into per-term compressed zip packs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=180, help="Archive submissions older than this many days")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if settings.DIRECT_UPLOADS:
+            raise CommandError("Fayllar obyekt omborida (S3_BUCKET): bu komanda faqat MEDIA_ROOT bilan ishlaydi")
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        rows = (
+            Submission.objects
+            .filter(submitted_at__lt=cutoff)
+            .exclude(file='')
+            .exclude(file__contains=ARCHIVE_SEPARATOR)
+            .values_list('pk', 'file', 'submitted_at')
+        )
+        by_term = defaultdict(list)
+        for pk, name, submitted_at in rows.iterator():
+            by_term[term_for(submitted_at)].append((pk, name))
+
+        if not by_term:
+            self.stdout.write("Arxivlash uchun fayl topilmadi")
+            return
+
+        # Har bir ishga tushirish term uchun yangi pack yozadi: mavjud pack'larga hech qachon qo'shilmaydi
+        generation = timezone.now().strftime('%Y%m%d%H%M%S')
+        for term, items in sorted(by_term.items()):
+            if options['dry_run']:
+                self.stdout.write(f"{term}: {len(items)} ta fayl arxivlanadi")
+                continue
+            self.archive_term(term, items, generation, options['batch_size'])
+            archive = SubmissionArchive.objects.get(term=term)
+            self.stdout.write(self.style.SUCCESS(
+                f"{term}: {archive.file_count} fayl, {archive.original_size} -> {archive.packed_size} bayt "
+                f"({archive.saved_size} bayt tejaldi)"
+            ))
+
+    def write_pack(self, pack_path, items):
+        """
+        Writes the files into a temp file next to pack_path, fsyncs it and renames it into place,
+        so a reader or a crash never sees a half-written pack. Returns the archived (pk, name) rows
+        and their original size.
+        """
+        os.makedirs(os.path.dirname(pack_path), exist_ok=True)
+        tmp_path = f"{pack_path}.tmp"
+        archived, original_size = [], 0
+        try:
+            with open(tmp_path, 'wb') as fh:
+                with zipfile.ZipFile(fh, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                    for pk, name in items:
+                        if not default_storage.exists(name):
+                            self.stderr.write(f"Fayl topilmadi: {name} (submission #{pk})")
+                            continue
+                        compress = (zipfile.ZIP_STORED if name.lower().endswith(STORED_EXTENSIONS)
+                                    else zipfile.ZIP_DEFLATED)
+                        archive.write(default_storage.path(name), arcname=name, compress_type=compress)
+                        original_size += archive.getinfo(name).file_size
+                        archived.append((pk, name))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, pack_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # rename ham diskka tushishi uchun papkani fsync qilamiz
+        directory = os.open(os.path.dirname(pack_path), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        return archived, original_size
+
+    def archive_term(self, term, items, generation, batch_size):
+        pack = f"{settings.ARCHIVE_DIR.rstrip('/')}/submissions-{term}-{generation}.zip"
+        archived, original_size = self.write_pack(default_storage.path(pack), items)
+        if not archived:
+            default_storage.delete(pack)
+            return
+
+        # Pack diskka to'liq yozilgandan keyingina DB va asl fayllarga tegamiz
+        with transaction.atomic():
+            archive_row, _ = SubmissionArchive.objects.select_for_update().get_or_create(term=term, defaults={'pack': pack})
+            pack_row = SubmissionPack.objects.create(
+                archive=archive_row, name=pack, file_count=len(archived), original_size=original_size,
+                packed_size=default_storage.size(pack),
+            )
+            archive_row.pack = pack
+            archive_row.file_count += pack_row.file_count
+            archive_row.original_size += pack_row.original_size
+            archive_row.packed_size += pack_row.packed_size
+            archive_row.save()
+        for start in range(0, len(archived), batch_size):
+            batch = archived[start:start + batch_size]
+            with transaction.atomic():
+                for pk, name in batch:
+                    Submission.objects.filter(pk=pk, file=name).update(file=f"{pack}{ARCHIVE_SEPARATOR}{name}")
+                names = [name for _, name in batch]
+                transaction.on_commit(lambda names=names: [default_storage.delete(name) for name in names])
@@ -0,0 +1,82 @@
+import json
+import time
+
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from api.benchmarks.seed import PREFIX
+from api.benchmarks.stats import summarize
+from api.models import User
+
+# changelist -> qo'shimcha so'rov parametrlari (qidiruv va filtr bilan ham o'lchanadi)
+CHANGELISTS = {
+    'user': [{}, {'q': f'{PREFIX}student_1'}, {'role__exact': 'student'}],
+    'assignment': [{}, {'q': 'Topshiriq 1'}],
+    'submission': [{}, {'q': f'{PREFIX}student_1'}, {'graded': 'no'}, {'p': '50'}],
+    'book': [{}, {'q': 'Darslik'}, {'subject': 'Fizika'}],
+    'calendarevent': [{}, {'event_type__exact': 'exam'}],
+    'studentsummary': [{}],
+    'auditlog': [{}],
+}
+
+
+class Command(BaseCommand):
+    help = ("Loads every api admin changelist (plain, searched and filtered) and reports latency and query counts; "
+            "seed a large dataset first, e.g. make bench-admin")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if not apps.is_installed('django.contrib.admin'):
+            raise CommandError("Admin is not installed (APP_PROFILE=api).")
+        superuser = User.objects.filter(username__startswith=f"{PREFIX}admin_").first()
+        if superuser is None:
+            raise CommandError("Benchmark data not found, run seed_benchmark_data first.")
+        User.objects.filter(pk=superuser.pk).update(is_staff=True, is_superuser=True)
+
+        client = Client()
+        client.force_login(superuser)
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for model_name, variants in CHANGELISTS.items():
+                if not admin.site.is_registered(apps.get_model('api', model_name)):
+                    continue
+                url = reverse(f'admin:api_{model_name}_changelist')
+                for params in variants:
+                    label = model_name + ('?' + '&'.join(f"{k}={v}" for k, v in params.items()) if params else '')
+                    results[label] = self.measure(client, url, params, options)
+                    self.stderr.write(f"{label}: {results[label]}")
+
+        report = {
+            'database': connection.vendor,
+            'rows': {model: apps.get_model('api', model)._base_manager.count() for model in CHANGELISTS},
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    def measure(self, client, url, params, options):
+        latencies, queries, errors = [], [], 0
+        for _ in range(options['warmup']):
+            client.get(url, params)
+        started = time.perf_counter()
+        for _ in range(options['iterations']):
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                response = client.get(url, params)
+                latencies.append(time.perf_counter() - request_started)
+            queries.append(len(captured))
+            errors += response.status_code != 200
+        return summarize(latencies, time.perf_counter() - started, queries, errors)
@@ -0,0 +1,141 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.benchmarks.scenarios import SCENARIOS, Context
+from api.benchmarks.stats import compare, summarize
+
+
+class Command(BaseCommand):
+    help = "Drives every API route with seeded data and reports p50/p95/p99 latency, throughput and query counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--routes', help="Comma-separated URL names (default: all)")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+        parser.add_argument('--baseline', help="Compare against a previous JSON report")
+        parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed p95 slowdown vs baseline")
+        parser.add_argument('--base-url', help="Send real HTTP requests to a running server instead of in-process")
+        parser.add_argument('--concurrency', type=int, default=1, help="Parallel clients in --base-url mode")
+
+    def handle(self, *args, **options):
+        try:
+            ctx = Context()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        tokens = {}
+        for role in ('student', 'ustoz', 'admin'):
+            tokens[role] = str(RefreshToken.for_user(ctx.user(role)).access_token)
+        # --base-url rejimida server o'z METRICS_TOKEN'ini tekshiradi, shuning uchun u bir xil bo'lishi kerak
+        tokens['metrics'] = settings.METRICS_TOKEN or 'benchmark-metrics-token'
+
+        names = [pattern.name for pattern in get_resolver('api.urls').url_patterns if pattern.name]
+        if options['routes']:
+            names = [name for name in names if name in options['routes'].split(',')]
+        # Yangi route ssenariysiz jim o'tkazib yuborilmasin
+        missing = [name for name in names if name not in SCENARIOS]
+        if missing:
+            raise CommandError(f"No benchmark scenario for: {', '.join(missing)}")
+
+        results = {}
+        for name in names:
+            scenario = SCENARIOS[name]
+            if options['base_url']:
+                results[name] = self.run_http(ctx, scenario, tokens, options)
+            else:
+                results[name] = self.run_in_process(ctx, scenario, tokens, options)
+            self.stderr.write(f"{name}: {results[name]}")
+
+        report = {
+            'database': connection.vendor,
+            'mode': 'http' if options['base_url'] else 'in-process',
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                report['regressions'] = compare(results, json.load(fh)['results'], options['tolerance'])
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+        if report.get('regressions'):
+            raise CommandError(f"{len(report['regressions'])} route(s) regressed against the baseline")
+
+    # Token bucket limitlari o'lchovni 429 javoblar bilan buzmasligi uchun
+    @override_settings(THROTTLE_ENABLED=False)
+    def run_in_process(self, ctx, scenario, tokens, options):
+        with override_settings(METRICS_TOKEN=tokens['metrics']):
+            return self._run_in_process(ctx, scenario, tokens, options)
+
+    def _run_in_process(self, ctx, scenario, tokens, options):
+        client = APIClient()
+        if scenario.role:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[scenario.role]}")
+        latencies, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(options['warmup'] + options['iterations']):
+            path, data = scenario.build(ctx, i)
+            kwargs = {'format': scenario.format} if scenario.format else {}
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                response = getattr(client, scenario.method)(path, data, **kwargs)
+                if response.streaming:
+                    # Oqimli javob (zip) tana to'liq o'qilgandagina hosil bo'ladi
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - request_started
+            if i < options['warmup']:
+                started = time.perf_counter()
+                continue
+            latencies.append(elapsed)
+            queries.append(len(captured))
+            errors += response.status_code >= 400
+        return summarize(latencies, time.perf_counter() - started, queries, errors)
+
+    def run_http(self, ctx, scenario, tokens, options):
+        base_url = options['base_url'].rstrip('/')
+
+        def send(i):
+            path, data = scenario.build(ctx, i)
+            headers = {}
+            body = None
+            if scenario.role:
+                headers['Authorization'] = f"Bearer {tokens[scenario.role]}"
+            if data is not None and scenario.format == 'multipart':
+                body, headers['Content-Type'] = encode_multipart(BOUNDARY, data), MULTIPART_CONTENT
+            elif data is not None:
+                body, headers['Content-Type'] = json.dumps(data).encode(), 'application/json'
+            request = urllib.request.Request(base_url + path, data=body, headers=headers,
+                                             method=scenario.method.upper())
+            request_started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    failed = False
+            except urllib.error.HTTPError as exc:
+                exc.read()
+                failed = exc.code >= 400
+            return time.perf_counter() - request_started, failed
+
+        for i in range(options['warmup']):
+            send(i)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            outcomes = list(pool.map(send, range(options['iterations'])))
+        elapsed = time.perf_counter() - started
+        return summarize([latency for latency, _ in outcomes], elapsed, errors=sum(failed for _, failed in outcomes))
@@ -0,0 +1,73 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.benchmarks.scenarios import DASHBOARD_ROUTES, SCENARIOS, Context
+from api.benchmarks.stats import summarize
+
+
+class Command(BaseCommand):
+    help = "Compares loading the student dashboard with separate requests against a single /batch/ request"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        try:
+            ctx = Context()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(ctx.student).access_token}")
+
+        def separate(i):
+            failed = 0
+            for name in DASHBOARD_ROUTES:
+                path, data = SCENARIOS[name].build(ctx, i)
+                failed += client.get(path, data).status_code >= 400
+            return failed
+
+        def batched(i):
+            path, data = SCENARIOS['batch'].build(ctx, i)
+            response = client.post(path, data, format='json')
+            if response.status_code >= 400:
+                return 1
+            return sum(item['status'] >= 400 for item in json.loads(response.content)['responses'])
+
+        report = {
+            'database': connection.vendor,
+            'routes': list(DASHBOARD_ROUTES),
+            'iterations': options['iterations'],
+            'separate': self.measure(separate, options),
+            'batch': self.measure(batched, options),
+        }
+        separate_p50, batch_p50 = report['separate']['p50_ms'], report['batch']['p50_ms']
+        report['speedup_p50'] = round(separate_p50 / batch_p50, 2) if batch_p50 else None
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def measure(self, load, options):
+        latencies, queries, errors = [], [], 0
+        for i in range(options['warmup']):
+            load(i)
+        started = time.perf_counter()
+        for i in range(options['iterations']):
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                errors += load(i)
+                latencies.append(time.perf_counter() - request_started)
+            queries.append(len(captured))
+        return summarize(latencies, time.perf_counter() - started, queries, errors)
@@ -0,0 +1,90 @@
+import bisect
+import json
+import statistics
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api import analytics
+from api.benchmarks.stats import summarize
+from api.models import User, Submission
+
+
+def python_report(term):
+    """
+    The loop-over-rows approach the report replaces: model instances, per-student and
+    per-teacher lists, percentile ranks by bisect.
+    """
+    students, teachers, assignments = defaultdict(list), defaultdict(list), defaultdict(list)
+    submissions = (
+        Submission.objects.filter(analytics.term_filter(term), assignment__deleted_at=None)
+        .exclude(grade=None).select_related('assignment')
+    )
+    for submission in submissions:
+        grade = float(submission.grade)
+        students[submission.student_id].append(grade)
+        teachers[submission.assignment.teacher_id].append(grade)
+        assignments[submission.assignment_id].append(grade)
+    averages = {pk: sum(grades) / len(grades) for pk, grades in students.items()}
+    ordered = sorted(averages.values())
+    ranks = {pk: bisect.bisect_right(ordered, average) / len(ordered) * 100 for pk, average in averages.items()}
+    distributions = {pk: statistics.quantiles(grades, n=10) for pk, grades in teachers.items() if len(grades) > 1}
+    medians = {pk: statistics.median(grades) for pk, grades in assignments.items()}
+    return ranks, distributions, medians
+
+
+class Command(BaseCommand):
+    help = ("Measures the term grade report: NumPy computation against a Python loop over Submission rows, "
+            "and cached reads through the reports endpoint")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', default='current')
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--reads', type=int, default=200, help="Cached endpoint reads")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        admin = User.objects.filter(role='admin').first()
+        if admin is None:
+            raise CommandError("Admin topilmadi: avval seed_benchmark_data ishga tushiring")
+        try:
+            term = analytics.resolve_term(options['term'])
+        except ValueError:
+            raise CommandError("Noto'g'ri term: YYYY-MM yoki current bo'lishi kerak")
+
+        report = {
+            'database': connection.vendor,
+            'term': term,
+            'grades': len(analytics.load_grades(term)),
+            'numpy': self.measure(lambda: analytics.compute_report(term), options['iterations']),
+            'python_loop': self.measure(lambda: python_report(term), options['iterations']),
+        }
+        report['speedup'] = round(report['python_loop']['mean_ms'] / max(report['numpy']['mean_ms'], 1e-6), 1)
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        url = reverse('reports-grades')
+        analytics.invalidate(term)
+        with override_settings(THROTTLE_ENABLED=False):
+            client.get(url, {'term': term})
+            report['cached_read'] = self.measure(lambda: client.get(url, {'term': term}), options['reads'])
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    def measure(self, load, iterations):
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            request_started = time.perf_counter()
+            load()
+            latencies.append(time.perf_counter() - request_started)
+        return summarize(latencies, time.perf_counter() - started)
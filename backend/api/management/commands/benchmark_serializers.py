@@ -0,0 +1,58 @@
+import itertools
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import get_plan
+from api.renderers import FastJSONRenderer
+from api.serializers import AssignmentSerializer, BookSerializer, CalendarEventSerializer, SubmissionSerializer
+
+SERIALIZERS = [SubmissionSerializer, AssignmentSerializer, BookSerializer, CalendarEventSerializer]
+
+
+def _timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Compares DRF serialization + JSON rendering with the fast read path at N rows and checks equal output"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--sample', type=int, default=5000,
+                            help="Rows fetched from the DB; repeated in memory up to --rows")
+
+    def handle(self, *args, **options):
+        report = {}
+        for serializer_class in SERIALIZERS:
+            model = serializer_class.Meta.model
+            plan = get_plan(serializer_class)
+            if plan is None:
+                raise CommandError(f"{serializer_class.__name__} has no fast read plan")
+            sample = model.objects.order_by('pk')[:options['sample']]
+            instances = list(sample)
+            if not instances:
+                self.stderr.write(f"{model.__name__}: no rows, skipped (run seed_benchmark_data)")
+                continue
+            tuples = list(sample.values_list(*plan.columns))
+            instances = list(itertools.islice(itertools.cycle(instances), options['rows']))
+            tuples = list(itertools.islice(itertools.cycle(tuples), options['rows']))
+
+            drf_body, drf_seconds = _timed(
+                lambda: JSONRenderer().render(serializer_class(instances, many=True).data))
+            fast_body, fast_seconds = _timed(lambda: FastJSONRenderer().render(plan.rows(tuples)))
+            report[serializer_class.__name__] = {
+                'rows': len(tuples),
+                'drf_ms': round(drf_seconds * 1000, 1),
+                'fast_ms': round(fast_seconds * 1000, 1),
+                'speedup': round(drf_seconds / fast_seconds, 1) if fast_seconds else None,
+                'identical': drf_body == fast_body,
+                'bytes': len(fast_body),
+            }
+        self.stdout.write(json.dumps(report, indent=2))
+        if not all(result['identical'] for result in report.values()):
+            raise CommandError("Fast read path output differs from DRF output")
@@ -0,0 +1,78 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+# Worker ishga tushishini takrorlaydi: settings, ilovalar, URLconf va view'lar
+STARTUP_CODE = """
+import time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(time.perf_counter() - started)
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Returns {module: self microseconds} from `python -X importtime` output.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Measures worker cold-start time and per-module import time for each settings profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default='full,api', help="Comma-separated APP_PROFILE values")
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=20, help="Number of slowest modules/packages to report")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        report = {}
+        for profile in options['profiles'].split(','):
+            env = {**os.environ, 'APP_PROFILE': profile}
+            totals, modules = [], Counter()
+            for _ in range(options['runs']):
+                result = subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+                    capture_output=True, text=True, env=env, check=True,
+                )
+                totals.append(float(result.stdout.strip().splitlines()[-1]))
+                modules.update(parse_importtime(result.stderr))
+
+            runs = options['runs']
+            packages = Counter()
+            for name, micros in modules.items():
+                packages[name.split('.')[0]] += micros
+            report[profile] = {
+                'startup_ms': {
+                    'median': round(statistics.median(totals) * 1000, 1),
+                    'min': round(min(totals) * 1000, 1),
+                    'max': round(max(totals) * 1000, 1),
+                },
+                'import_ms': round(sum(modules.values()) / runs / 1000, 1),
+                'packages_ms': {name: round(micros / runs / 1000, 2)
+                                for name, micros in packages.most_common(options['top'])},
+                'modules_ms': {name: round(micros / runs / 1000, 2)
+                               for name, micros in modules.most_common(options['top'])},
+            }
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
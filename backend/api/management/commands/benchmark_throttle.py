@@ -0,0 +1,50 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from api.models import User
+from api.throttling import TokenBucketThrottle
+
+
+class Command(BaseCommand):
+    help = "Measures the per-request overhead of TokenBucketThrottle with Redis (THROTTLE_CACHE) and in-process buckets"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+        parser.add_argument('--users', type=int, default=100, help="Distinct buckets to spread the requests over")
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        requests = []
+        for i in range(options['users']):
+            request = Request(factory.get('/assignments/'))
+            request._request.resolver_match = mock.Mock(url_name='assignments-list')
+            request.user = User(pk=i + 1, role='student')
+            requests.append(request)
+        view = APIView()
+
+        with override_settings(THROTTLE_ENABLED=True, THROTTLE_BUCKETS={'default': (10 ** 9, 1)}):
+            with override_settings(THROTTLE_CACHE=None):
+                local_us = self.measure(requests, view, options['iterations'])
+            if not settings.THROTTLE_CACHE:
+                self.stdout.write(self.style.SUCCESS(
+                    f"in-process: {local_us:.1f} µs/so'rov (REDIS_URL berilmagan - Redis o'lchanmadi)"
+                ))
+                return
+            redis_us = self.measure(requests, view, options['iterations'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Redis: {redis_us:.1f} µs/so'rov, in-process: {local_us:.1f} µs/so'rov"
+        ))
+
+    def measure(self, requests, view, iterations):
+        throttle = TokenBucketThrottle()
+        started = time.perf_counter()
+        for i in range(iterations):
+            throttle.allow_request(requests[i % len(requests)], view)
+        return (time.perf_counter() - started) / iterations * 1e6
@@ -0,0 +1,123 @@
+import json
+import time
+import uuid
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.benchmarks.stats import summarize
+from api.models import RevokedToken, User
+from api.revocation import revoked
+
+BENCH_PREFIX = 'bench-'
+
+
+class Command(BaseCommand):
+    help = ("Measures refresh-token rotation throughput with many revoked tokens: the in-memory filter check "
+            "against a DB lookup on every refresh")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--revoked', type=int, default=1_000_000, help="Revoked tokens to keep in the table")
+        parser.add_argument('--refreshes', type=int, default=500)
+        parser.add_argument('--lookups', type=int, default=100_000, help="Filter lookups of unrevoked JTIs")
+        parser.add_argument('--cleanup', action='store_true', help="Delete the seeded revoked tokens afterwards")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(role='student').first()
+        if user is None:
+            raise CommandError("Student topilmadi: avval seed_benchmark_data ishga tushiring")
+
+        self.seed(options['revoked'])
+        started = time.perf_counter()
+        bloom = revoked.rebuild()
+        report = {
+            'database': connection.vendor,
+            'revoked_tokens': RevokedToken.objects.count(),
+            'filter': {
+                'build_seconds': round(time.perf_counter() - started, 2),
+                'size_bytes': len(bloom.bits),
+                'hashes': bloom.hashes,
+            },
+            'lookup': self.lookups(bloom, options['lookups']),
+        }
+
+        client = APIClient()
+        url = reverse('token-refresh')
+        issued = []
+        refresh = str(RefreshToken.for_user(user))
+
+        def rotate(i):
+            nonlocal refresh
+            issued.append(RefreshToken(refresh)[api_settings.JTI_CLAIM])
+            response = client.post(url, {'refresh': refresh}, format='json')
+            if response.status_code != 200:
+                return 1
+            refresh = response.data['refresh']
+            return 0
+
+        report['refresh_filter'] = self.measure(rotate, options['refreshes'])
+        # token_blacklist kabi: har bir refresh'da DB'dan tekshirish
+        with mock.patch.object(revoked, 'might_contain', return_value=True):
+            report['refresh_db_lookup'] = self.measure(rotate, options['refreshes'])
+        # Rotatsiyadan keyin eski refresh token qayta ishlamasligi kerak
+        previous = refresh
+        rotate(0)
+        report['replay_rejected'] = client.post(url, {'refresh': previous}, format='json').status_code == 401
+
+        RevokedToken.objects.filter(jti__in=issued).delete()
+        if options['cleanup']:
+            RevokedToken.objects.filter(jti__startswith=BENCH_PREFIX).delete()
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    def seed(self, total, batch_size=10_000):
+        existing = RevokedToken.objects.filter(jti__startswith=BENCH_PREFIX).count()
+        expires_at = timezone.now() + api_settings.REFRESH_TOKEN_LIFETIME
+        for start in range(existing, total, batch_size):
+            RevokedToken.objects.bulk_create(
+                [RevokedToken(jti=f"{BENCH_PREFIX}{i:09d}", expires_at=expires_at)
+                 for i in range(start, min(total, start + batch_size))],
+                batch_size=batch_size,
+            )
+        if total > existing:
+            self.stdout.write(f"{total - existing} ta bekor qilingan token qo'shildi")
+
+    def lookups(self, bloom, count):
+        jtis = [uuid.uuid4().hex for _ in range(count)]
+        started = time.perf_counter()
+        false_positives = sum(jti in bloom for jti in jtis)
+        filter_us = (time.perf_counter() - started) / count * 1e6
+        sample = jtis[:min(count, 1000)]
+        started = time.perf_counter()
+        for jti in sample:
+            RevokedToken.objects.filter(jti=jti).exists()
+        db_us = (time.perf_counter() - started) / len(sample) * 1e6
+        return {
+            'filter_us': round(filter_us, 2),
+            'db_us': round(db_us, 2),
+            'false_positive_rate': round(false_positives / count, 5),
+        }
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def measure(self, load, iterations):
+        latencies, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                request_started = time.perf_counter()
+                errors += load(i)
+                latencies.append(time.perf_counter() - request_started)
+            queries.append(len(captured))
+        return summarize(latencies, time.perf_counter() - started, queries, errors)
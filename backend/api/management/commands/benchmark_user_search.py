@@ -0,0 +1,113 @@
+import json
+import random
+import time
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.benchmarks.seed import PASSWORD, PREFIX
+from api.benchmarks.stats import summarize
+from api.models import User
+from api.user_search import index
+
+USERNAME_PREFIX = f'{PREFIX}dir_'
+FIRST_NAMES = ['Abdullo', 'Akmal', 'Alisher', 'Anvar', 'Aziza', 'Bekzod', 'Bobur', 'Dilnoza', 'Diyor', 'Farrux',
+               'Feruza', 'Gulnora', 'Hasan', 'Husan', 'Javohir', 'Jasur', 'Kamola', 'Laylo', 'Madina', 'Malika',
+               'Mirzo', 'Nigora', 'Nodir', 'Otabek', 'Ozoda', 'Rustam', 'Sardor', 'Sevara', 'Shahzod', 'Shoxrux',
+               'Temur', 'Ulugbek', 'Umida', 'Zarina', 'Zafar']
+LAST_NAMES = ['Abdullayev', 'Aliyev', 'Azimov', 'Ergashev', 'Fayziyev', 'Hamidov', 'Ibragimov', 'Ismoilov',
+              'Jurayev', 'Karimov', 'Mahmudov', 'Mirzayev', 'Nazarov', 'Normatov', 'Qodirov', 'Rahimov',
+              'Rashidov', 'Saidov', 'Salimov', 'Sultonov', 'Tursunov', 'Umarov', 'Usmonov', 'Xolmatov', 'Yusupov']
+
+
+def _typo(text, rng):
+    # Qo'shni ikki harfni almashtiradi (klaviaturada tez yozishdagi eng ko'p xato)
+    position = rng.randrange(1, len(text) - 2)
+    return text[:position] + text[position + 1] + text[position] + text[position + 2:]
+
+
+class Command(BaseCommand):
+    help = "Measures user directory autocomplete latency per keystroke against a large user table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000, help="Directory users to keep in the table")
+        parser.add_argument('--targets', type=int, default=50, help="Names typed keystroke by keystroke")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        searcher = User.objects.filter(role='ustoz').first()
+        if searcher is None:
+            raise CommandError("Ustoz topilmadi: avval seed_benchmark_data ishga tushiring")
+        rng = random.Random(options['seed'])
+        self.seed(options['users'], rng)
+
+        client = APIClient()
+        client.force_authenticate(searcher)
+        url = reverse('users-search')
+        started = time.perf_counter()
+        if connection.vendor != 'postgresql':
+            index.rebuild()
+        build_seconds = round(time.perf_counter() - started, 2)
+
+        targets = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('?')
+                       .values_list('fullname', flat=True)[:options['targets']])
+        keystrokes, typos = [], []
+        found = {'typed': 0, 'typo': 0}
+        with override_settings(THROTTLE_ENABLED=False):
+            for fullname in targets:
+                for length in range(1, len(fullname) + 1):
+                    latency, _ = self.search(client, url, fullname[:length])
+                    keystrokes.append(latency)
+                _, results = self.search(client, url, fullname)
+                found['typed'] += fullname in results
+                latency, results = self.search(client, url, _typo(fullname, rng))
+                typos.append(latency)
+                found['typo'] += fullname in results
+
+        report = {
+            'database': connection.vendor,
+            'users': User.objects.count(),
+            'index_build_seconds': build_seconds,
+            'keystroke': summarize(keystrokes, sum(keystrokes)),
+            'typo': summarize(typos, sum(typos)),
+            # to'liq yozilgan (yoki xato yozilgan) ism birinchi sahifada chiqqan hollar ulushi
+            'found_typed': round(found['typed'] / len(targets), 3),
+            'found_typo': round(found['typo'] / len(targets), 3),
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output)
+        self.stdout.write(output)
+
+    def search(self, client, url, query):
+        started = time.perf_counter()
+        response = client.get(url, {'q': query, 'role': 'student', 'limit': 10})
+        latency = time.perf_counter() - started
+        return latency, {row['fullname'] for row in response.data}
+
+    def seed(self, total, rng, batch_size=5000):
+        existing = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+        password = make_password(PASSWORD)
+        for start in range(existing, total, batch_size):
+            User.objects.bulk_create([
+                User(
+                    username=f"{USERNAME_PREFIX}{number}",
+                    fullname=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    birthday_date=date(2005, 1, 1),
+                    gender='erkak',
+                    address="Toshkent",
+                    temporarily_address="Toshkent",
+                    role='student',
+                    password=password,
+                )
+                for number in range(start, min(total, start + batch_size))
+            ], batch_size=batch_size)
+        if total > existing:
+            self.stdout.write(f"{total - existing} ta foydalanuvchi qo'shildi")
@@ -0,0 +1,114 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from api.models import Assignment, Book, Submission, SubmissionArchive, SubmissionPack
+from api.partitions import archived_prefixes, archived_values
+from api.storage import ARCHIVE_SEPARATOR
+
+
+class Command(BaseCommand):
+    help = ("Walks the upload directories and deletes files no database row refers to, "
+            "checking the DB in batches while streaming the directory listing; archive packs "
+            "are deleted once no submission points into them")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--min-age-hours', type=float, default=24,
+                            help="Skip files newer than this (uploads whose row may not be committed yet)")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if settings.DIRECT_UPLOADS:
+            raise CommandError("Fayllar obyekt omborida (S3_BUCKET): bu komanda faqat MEDIA_ROOT bilan ishlaydi")
+        self.options = options
+        self.cutoff = time.time() - options['min_age_hours'] * 3600
+        self.found = self.freed = 0
+        # papka -> (modellar, nom bo'yicha tekshiruv)
+        targets = [
+            ('assignments', [Assignment], self.referenced_files),
+            ('submissions', [Submission], self.referenced_files),
+            ('books', [Book], self.referenced_files),
+            (settings.PREVIEW_DIR.strip('/'), [Submission, Book], self.referenced_previews),
+            (settings.ARCHIVE_DIR.strip('/'), [Submission], self.referenced_packs),
+        ]
+        for directory, models, referenced in targets:
+            batch = []
+            for name, path in self.walk(directory):
+                batch.append((name, path))
+                if len(batch) >= options['batch_size']:
+                    self.purge(batch, models, referenced)
+                    batch = []
+            self.purge(batch, models, referenced)
+
+        verb = "o'chiriladi" if options['dry_run'] else "o'chirildi"
+        self.stdout.write(self.style.SUCCESS(f"{self.found} ta yetim fayl {verb} ({self.freed} bayt)"))
+
+    def walk(self, directory):
+        root = default_storage.path('')
+        for dirpath, _, filenames in os.walk(os.path.join(root, directory)):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                yield os.path.relpath(path, root).replace(os.sep, '/'), path
+
+    def referenced_files(self, models, names):
+        found = set()
+        for model in models:
+            found.update(model._base_manager.filter(file__in=names).values_list('file', flat=True))
+            if model is Submission:
+                # ajratilgan (arxiv) partitionlardagi javoblar fayllari ham ishlatilmoqda
+                found.update(archived_values('file', names))
+        return found
+
+    def referenced_previews(self, models, names):
+        # previews/<h[:2]>/<hash>.jpg|.json - content_hash bo'yicha ulashiladigan kesh
+        hashes = {name: os.path.splitext(os.path.basename(name))[0] for name in names}
+        found = set()
+        for model in models:
+            found.update(model._base_manager.filter(content_hash__in=set(hashes.values()))
+                         .values_list('content_hash', flat=True))
+            if model is Submission:
+                found.update(archived_values('content_hash', set(hashes.values())))
+        return {name for name, content_hash in hashes.items() if content_hash in found}
+
+    def referenced_packs(self, models, names):
+        # Reaper qatorlarni o'chirsa pack'dagi a'zolar qoladi: pack'ga "<pack>::" bilan birorta qator ishora qilsa kerak
+        prefixes = {name: f"{name}{ARCHIVE_SEPARATOR}" for name in names}
+        found = {name for name, prefix in prefixes.items()
+                 if Submission._base_manager.filter(file__startswith=prefix).exists()}
+        archived = archived_prefixes('file', [prefixes[name] for name in names if name not in found])
+        return found | {name for name, prefix in prefixes.items() if prefix in archived}
+
+    def forget_pack(self, name):
+        with transaction.atomic():
+            pack = SubmissionPack.objects.filter(name=name).first()
+            if pack is None:
+                return
+            SubmissionArchive.objects.filter(pk=pack.archive_id).update(
+                file_count=F('file_count') - pack.file_count,
+                original_size=F('original_size') - pack.original_size,
+                packed_size=F('packed_size') - pack.packed_size,
+            )
+            pack.delete()
+
+    def purge(self, batch, models, referenced):
+        batch = [(name, path) for name, path in batch if os.path.getmtime(path) < self.cutoff]
+        if not batch:
+            return
+        in_use = referenced(models, [name for name, _ in batch])
+        for name, path in batch:
+            if name in in_use:
+                continue
+            self.found += 1
+            self.freed += os.path.getsize(path)
+            if self.options['dry_run']:
+                self.stdout.write(name)
+            else:
+                default_storage.delete(name)
+                if referenced == self.referenced_packs:
+                    self.forget_pack(name)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Book, Submission
+from api.previews import generate_preview
+
+
+class Command(BaseCommand):
+    help = "Generates missing previews for Book and Submission files (unchanged files are skipped)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=['book', 'submission'], help="Only process one model")
+
+    def handle(self, *args, **options):
+        models = [Book, Submission]
+        if options['model']:
+            models = [Book if options['model'] == 'book' else Submission]
+        for model in models:
+            pks = model.objects.exclude(file='').filter(preview__isnull=True, page_count__isnull=True)
+            count = 0
+            for pk in pks.values_list('pk', flat=True).iterator():
+                generate_preview(model._meta.label, pk)
+                count += 1
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: {count} ta fayl tekshirildi"))
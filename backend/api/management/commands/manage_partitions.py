@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api import analytics, partitions
+from api.summaries import reconcile_summaries
+
+
+class Command(BaseCommand):
+    help = ("Creates Submission partitions for the upcoming terms and detaches (or drops) the ones older than "
+            "the retention window; on a plain table (SQLite) retention deletes the old rows instead")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=settings.SUBMISSION_PARTITIONS_AHEAD,
+                            help="Number of future terms to create partitions for")
+        parser.add_argument('--retain-terms', type=int, default=settings.SUBMISSION_RETAIN_TERMS,
+                            help="Keep this many terms including the current one (default: keep everything)")
+        parser.add_argument('--drop', action='store_true',
+                            help="Drop old partitions instead of keeping them as archive tables")
+        parser.add_argument('--batch-size', type=int, default=settings.REAPER_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        partitioned = partitions.is_partitioned()
+        if partitioned:
+            attached = set(partitions.attached_terms())
+            for term in partitions.upcoming_terms(options['ahead']):
+                if term in attached:
+                    continue
+                if not dry_run:
+                    partitions.create_partition(term)
+                self.stdout.write(f"{partitions.partition_name(term)} yaratildi")
+        else:
+            self.stdout.write("Submission jadvali partitionlanmagan (PostgreSQL emas): yangi partitionlar kerak emas")
+
+        if options['retain_terms']:
+            self.apply_retention(partitioned, options)
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
+
+    def apply_retention(self, partitioned, options):
+        dry_run = options['dry_run']
+        oldest = partitions.oldest_retained_term(options['retain_terms'])
+        if partitioned:
+            expired = [term for term in partitions.attached_terms() if term < oldest]
+            for term in expired:
+                if not dry_run:
+                    partitions.detach_partition(term, drop=options['drop'])
+                verb = "o'chirildi" if options['drop'] else "ajratildi (arxiv jadvali sifatida qoldi)"
+                self.stdout.write(f"{partitions.partition_name(term)} {verb}")
+            changed = bool(expired)
+        elif not options['drop']:
+            self.stdout.write(f"{oldest} dan eski javoblar saqlanib qoldi: oddiy jadvalda ularni faqat --drop o'chiradi")
+            changed = False
+        elif dry_run:
+            self.stdout.write(f"{oldest} dan eski javoblar o'chiriladi")
+            changed = False
+        else:
+            deleted = partitions.delete_before(oldest, options['batch_size'])
+            self.stdout.write(f"{oldest} dan eski {deleted} ta javob o'chirildi")
+            changed = bool(deleted)
+
+        if changed and not dry_run:
+            # Olib tashlangan javoblar dashboard hisoblagichlaridan va baholar hisobotidan ham chiqariladi
+            reconcile_summaries()
+            analytics.invalidate()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.revocation import prune
+
+
+class Command(BaseCommand):
+    help = "Deletes revoked refresh tokens that have expired anyway, in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        deleted = prune(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta muddati o'tgan token o'chirildi"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.reaper import reap_deleted
+
+
+class Command(BaseCommand):
+    help = "Removes soft-deleted assignments (with their submissions) and books in bounded batches, then their files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help="Rows per transaction (default REAPER_BATCH_SIZE)")
+
+    def handle(self, *args, **options):
+        counts = reap_deleted(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"O'chirildi: {counts['assignments']} topshiriq, {counts['submissions']} javob, {counts['books']} kitob"
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api.summaries import reconcile_summaries
+
+
+class Command(BaseCommand):
+    help = "Recomputes every student's dashboard summary from the source tables (run periodically, e.g. nightly cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        fixed = reconcile_summaries(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Xulosalar yangilandi, {fixed} ta farq tuzatildi"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.seed import DEFAULT_VOLUMES, clear, seed
+
+
+class Command(BaseCommand):
+    help = "Seeds a reproducible benchmark dataset (all benchmark users are prefixed with 'bench_')"
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--clear', action='store_true', help="Only remove existing benchmark data")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            clear()
+            self.stdout.write(self.style.SUCCESS("Benchmark ma'lumotlari o'chirildi"))
+            return
+        counts = seed({name: options[name] for name in DEFAULT_VOLUMES}, rng_seed=options['seed'])
+        self.stdout.write(self.style.SUCCESS(', '.join(f"{name}: {count}" for name, count in counts.items())))
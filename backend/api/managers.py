@@ -1,5 +1,6 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.core.exceptions import ValidationError
+from django.db import models
 
 
 class UserManager(BaseUserManager):
@@ -41,4 +42,12 @@ class UserManager(BaseUserManager):
         if not extra_fields.get('is_staff'):
             raise ValueError('Superuser must have is_staff=True.')  # Extra validation
 
-        return self._create_user(username, password, **extra_fields)
\ No newline at end of file
+        return self._create_user(username, password, **extra_fields)
+
+class ActiveManager(models.Manager):
+    """
+    Hides soft-deleted rows (deleted_at set); they stay reachable via all_objects until the reaper removes them.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
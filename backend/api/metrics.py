@@ -0,0 +1,64 @@
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    """
+    In-process Prometheus-style histogram keyed by a tuple of label values.
+    """
+
+    def __init__(self, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series[0]), series[1], series[2]) for labels, series in self._series.items()]
+        for labels, counts, total, count in sorted(items):
+            label_text = ','.join(f'{name}="{value}"' for name, value in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+            lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return '\n'.join(lines)
+
+
+LABELS = ('view', 'method', 'status')
+# Boshqa metodlar 'other' bo'ladi: klient label qiymatlarini (va seriyalar sonini) ko'paytira olmaydi
+METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'))
+
+REQUEST_SECONDS = Histogram('lms_request_seconds', "Request wall time", LABELS)
+DB_SECONDS = Histogram('lms_request_db_seconds', "Time spent in DB queries per request", LABELS)
+DB_QUERIES = Histogram('lms_request_db_queries', "DB queries per request", LABELS, COUNT_BUCKETS)
+VIEW_CPU_SECONDS = Histogram(
+    'lms_request_view_cpu_seconds', "View time outside the DB plus response rendering", LABELS
+)
+RESPONSE_BYTES = Histogram('lms_response_bytes', "Response body size", LABELS, SIZE_BUCKETS)
+
+REGISTRY = [REQUEST_SECONDS, DB_SECONDS, DB_QUERIES, VIEW_CPU_SECONDS, RESPONSE_BYTES]
+
+
+def expose_all():
+    return '\n'.join(histogram.expose() for histogram in REGISTRY) + '\n'
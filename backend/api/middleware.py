@@ -0,0 +1,137 @@
+import cProfile
+import io
+import logging
+import pstats
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import metrics, routers
+
+slow_logger = logging.getLogger('api.slow_requests')
+
+
+class QueryRecorder:
+    def __init__(self, capture_sql):
+        self.count = 0
+        self.seconds = 0.0
+        self.capture_sql = capture_sql
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if self.capture_sql and len(self.queries) < 100:
+                self.queries.append((elapsed, sql))
+
+
+class RequestMetricsMiddleware:
+    """
+    Records wall time, DB query count/time, view time outside the DB and response size per URL name.
+    Enabled with REQUEST_METRICS_ENABLED; histograms are exposed at the metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, 'SLOW_REQUEST_SECONDS', 0)
+        self.profile_rate = getattr(settings, 'SLOW_REQUEST_PROFILE_RATE', 0)
+
+    def __call__(self, request):
+        recorder = QueryRecorder(capture_sql=bool(self.slow_seconds))
+        request._metrics_render = 0.0
+        profiler = None
+        if self.slow_seconds and self.profile_rate and random.random() < self.profile_rate:
+            profiler = cProfile.Profile()
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.url_name or match.view_name) if match else 'unresolved'
+        method = request.method if request.method in metrics.METHODS else 'other'
+        labels = (view_name, method, str(response.status_code))
+        view_seconds = getattr(request, '_metrics_view', None)
+        if view_seconds is None:
+            view_seconds = time.perf_counter() - getattr(request, '_metrics_view_started', time.perf_counter())
+
+        metrics.REQUEST_SECONDS.observe(labels, elapsed)
+        metrics.DB_SECONDS.observe(labels, recorder.seconds)
+        metrics.DB_QUERIES.observe(labels, recorder.count)
+        metrics.VIEW_CPU_SECONDS.observe(labels, max(view_seconds - recorder.seconds, 0.0) + request._metrics_render)
+        if not response.streaming:
+            metrics.RESPONSE_BYTES.observe(labels, len(response.content))
+
+        if self.slow_seconds and elapsed >= self.slow_seconds:
+            self.log_slow_request(request, view_name, elapsed, recorder, profiler)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF Response render() shu hookdan keyin chaqiriladi
+        started = time.perf_counter()
+        request._metrics_view = started - getattr(request, '_metrics_view_started', started)
+
+        def rendered(_response):
+            request._metrics_render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log_slow_request(self, request, view_name, elapsed, recorder, profiler):
+        queries = sorted(recorder.queries, reverse=True)[:20]
+        lines = [
+            f"Slow request {request.method} {request.path} ({view_name}): {elapsed * 1000:.1f} ms, "
+            f"{recorder.count} queries, {recorder.seconds * 1000:.1f} ms in DB"
+        ]
+        lines += [f"  {seconds * 1000:.1f} ms  {sql}" for seconds, sql in queries]
+        if profiler is not None:
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(25)
+            lines.append(stream.getvalue())
+        slow_logger.warning('\n'.join(lines))
+
+
+class ReplicaPinMiddleware:
+    """
+    Tracks per-request routing state for PrimaryReplicaRouter and pins a user's reads
+    to the primary for REPLICA_PIN_SECONDS after a request that wrote to the database.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REPLICA_DATABASES', None):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = routers.begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = routers.end_request(token)
+        user = getattr(request, 'user', None)
+        if state.wrote and user is not None and user.is_authenticated:
+            routers.pin(user)
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_file_previews'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=7, unique=True)),
+                ('pack', models.CharField(max_length=255)),
+                ('file_count', models.PositiveIntegerField(default=0)),
+                ('original_size', models.BigIntegerField(default=0)),
+                ('packed_size', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_submission_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSummary',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('pending_assignments', models.IntegerField(default=0)),
+                ('graded_submissions', models.IntegerField(default=0)),
+                ('ungraded_submissions', models.IntegerField(default=0)),
+                ('grade_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('next_event_start', models.DateTimeField(blank=True, null=True)),
+                ('valid_until', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('next_event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.calendarevent')),
+            ],
+        ),
+    ]
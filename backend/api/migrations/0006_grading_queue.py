@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_earlier_attempts(apps, schema_editor):
+    Submission = apps.get_model('api', 'Submission')
+    newer = Submission.objects.filter(
+        assignment=models.OuterRef('assignment'), student=models.OuterRef('student'),
+        attempt__gt=models.OuterRef('attempt'),
+    )
+    Submission.objects.filter(models.Exists(newer)).update(is_latest=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_student_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_submissions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='is_latest',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(mark_earlier_attempts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(condition=models.Q(('grade__isnull', True), ('is_latest', True)), fields=['assignment', 'submitted_at'], name='submission_grading_queue'),
+        ),
+    ]
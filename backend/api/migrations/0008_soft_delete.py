@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_audit_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='assignment',
+            name='file',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='assignments/'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='books/'),
+        ),
+        migrations.AlterField(
+            model_name='submission',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='submissions/'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# Admin qidiruvi (^ - istartswith, = - iexact) PostgreSQL'da UPPER(col::text) LIKE 'X%' ko'rinishida bo'ladi
+SEARCH_INDEXES = [
+    ('api_user_username_upper', 'api_user', 'username'),
+    ('api_user_fullname_upper', 'api_user', 'fullname'),
+    ('api_assignment_title_upper', 'api_assignment', 'title'),
+    ('api_book_title_upper', 'api_book', 'title'),
+    ('api_calendarevent_title_upper', 'api_calendarevent', 'title'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} (UPPER({column}::text) text_pattern_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_soft_delete'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+ROLES = ('student', 'ustoz', 'admin')
+EVERYONE = ('', 'all')
+
+
+def for_group_to_targets(apps, schema_editor):
+    # for_group: rol nomi -> role, "All"/bo'sh -> hamma, boshqa matn (masalan "10A") -> StudyGroup
+    CalendarEvent = apps.get_model('api', 'CalendarEvent')
+    StudyGroup = apps.get_model('api', 'StudyGroup')
+    values = CalendarEvent.objects.exclude(for_group=None).values_list('for_group', flat=True).distinct()
+    for value in values:
+        name = value.strip()
+        events = CalendarEvent.objects.filter(for_group=value)
+        if name.lower() in EVERYONE:
+            continue
+        if name in ROLES:
+            events.update(role=name)
+        else:
+            group, _ = StudyGroup.objects.get_or_create(name=name)
+            events.update(group=group)
+
+
+def targets_to_for_group(apps, schema_editor):
+    CalendarEvent = apps.get_model('api', 'CalendarEvent')
+    CalendarEvent.objects.exclude(role='').update(for_group=models.F('role'))
+    for event in CalendarEvent.objects.filter(role='').select_related('group'):
+        event.for_group = event.group.name if event.group else 'All'
+        event.save(update_fields=['for_group'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudyGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='calendarevent',
+            name='role',
+            field=models.CharField(blank=True, choices=[('student', 'Student'), ('ustoz', 'Ustoz'), ('admin', 'Admin')], default='', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['assignment', 'student'], name='submission_assignment_student'),
+        ),
+        migrations.AddField(
+            model_name='groupmembership',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='studygroup',
+            name='members',
+            field=models.ManyToManyField(related_name='study_groups', through='api.GroupMembership', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='groupmembership',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='api.studygroup'),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignments', to='api.studygroup'),
+        ),
+        migrations.AddField(
+            model_name='calendarevent',
+            name='group',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='api.studygroup'),
+        ),
+        migrations.AddConstraint(
+            model_name='groupmembership',
+            constraint=models.UniqueConstraint(fields=('user', 'group'), name='unique_group_membership'),
+        ),
+        migrations.RunPython(for_group_to_targets, targets_to_for_group),
+        migrations.RemoveField(
+            model_name='calendarevent',
+            name='for_group',
+        ),
+    ]
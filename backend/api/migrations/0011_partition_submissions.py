@@ -0,0 +1,104 @@
+from django.db import migrations
+from django.utils import timezone
+
+from api.terms import next_term, term_bounds, term_for
+
+TABLE = 'api_submission'
+# PostgreSQL'da Submission submitted_at bo'yicha har bir term uchun alohida partitionga bo'linadi.
+# Partition kaliti primary key'da bo'lishi shart, shuning uchun PK (id, submitted_at); id yagonaligini sequence ta'minlaydi.
+# Boshqa backendlarda (SQLite) jadval o'zgarmaydi.
+PARTITIONS_AHEAD = 2
+
+
+def _indexes(cursor):
+    # PK va constraint indekslaridan tashqari hammasi: nomlari o'zgarmasligi uchun aynan shu ta'rif bilan qayta yaratiladi
+    cursor.execute(
+        "SELECT pg_get_indexdef(x.indexrelid) FROM pg_index x "
+        "WHERE x.indrelid = %s::regclass AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)",
+        [TABLE],
+    )
+    return [definition.replace(' ON ONLY ', ' ON ') for (definition,) in cursor.fetchall()]
+
+
+def _foreign_keys(cursor):
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [TABLE],
+    )
+    return cursor.fetchall()
+
+
+def _restore(schema_editor, indexes, foreign_keys, primary_key):
+    quote = schema_editor.quote_name
+    schema_editor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY ({primary_key})")
+    for definition in indexes:
+        schema_editor.execute(definition)
+    for name, definition in foreign_keys:
+        schema_editor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {quote(name)} {definition}")
+
+
+def _bound(value):
+    return f"'{value.isoformat()}'"
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        indexes, foreign_keys = _indexes(cursor), _foreign_keys(cursor)
+        cursor.execute(f"SELECT MIN(submitted_at) FROM {TABLE}")
+        oldest = cursor.fetchone()[0]
+
+    schema_editor.execute(
+        f"CREATE TABLE {TABLE}_new (LIKE {TABLE} INCLUDING CONSTRAINTS) PARTITION BY RANGE (submitted_at)"
+    )
+    # Mavjud ma'lumotlar termlari va oldinda PARTITIONS_AHEAD ta term; qolgani default partitionga tushadi
+    term, last = term_for(oldest or timezone.now()), term_for(timezone.now())
+    for _ in range(PARTITIONS_AHEAD):
+        last = next_term(last)
+    while term <= last:
+        start, end = term_bounds(term)
+        schema_editor.execute(
+            f"CREATE TABLE {TABLE}_p{term.replace('-', '_')} PARTITION OF {TABLE}_new "
+            f"FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})"
+        )
+        term = next_term(term)
+    schema_editor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE}_new DEFAULT")
+
+    schema_editor.execute(f"INSERT INTO {TABLE}_new SELECT * FROM {TABLE}")
+    schema_editor.execute(f"DROP TABLE {TABLE}")
+    schema_editor.execute(f"ALTER TABLE {TABLE}_new RENAME TO {TABLE}")
+    _restore(schema_editor, indexes, foreign_keys, 'id, submitted_at')
+    # Partitionlangan jadvalda IDENTITY ustun bo'lmaydi - oddiy sequence
+    schema_editor.execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    schema_editor.execute(f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)")
+    schema_editor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+
+
+def unpartition(apps, schema_editor):
+    # Ajratilgan (arxiv) partitionlar qaytarilmaydi
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        indexes, foreign_keys = _indexes(cursor), _foreign_keys(cursor)
+
+    schema_editor.execute(f"CREATE TABLE {TABLE}_new (LIKE {TABLE} INCLUDING CONSTRAINTS)")
+    schema_editor.execute(f"INSERT INTO {TABLE}_new SELECT * FROM {TABLE}")
+    schema_editor.execute(f"DROP TABLE {TABLE}")
+    schema_editor.execute(f"ALTER TABLE {TABLE}_new RENAME TO {TABLE}")
+    _restore(schema_editor, indexes, foreign_keys, 'id')
+    schema_editor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_study_groups'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
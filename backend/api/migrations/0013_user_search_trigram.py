@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# Foydalanuvchilar katalogi qidiruvi (api/user_search.py): pg_trgm GIN indekslari "%>" operatorini tezlashtiradi.
+# Boshqa backendlarda xotiradagi n-gram indeks ishlatiladi.
+TRIGRAM_INDEXES = [
+    ('api_user_fullname_trgm', 'api_user', 'fullname'),
+    ('api_user_username_trgm', 'api_user', 'username'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)')
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_revoked_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
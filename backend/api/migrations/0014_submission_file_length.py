@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_user_search_trigram'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='submission',
+            name='file',
+            field=models.FileField(db_index=True, max_length=255, upload_to='submissions/'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-19 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_submission_file_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsumedUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('consumed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
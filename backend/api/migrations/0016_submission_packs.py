@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 12:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def record_latest_packs(apps, schema_editor):
+    # Oldin faqat term'ning oxirgi pack'i saqlangan; uning ulushi term jami ichidan ajratilmagan, shuning
+    # uchun hisoblagichlar 0 (eski pack'larni cleanup_orphaned_media baribir archives/ papkasidan topadi)
+    SubmissionArchive = apps.get_model('api', 'SubmissionArchive')
+    SubmissionPack = apps.get_model('api', 'SubmissionPack')
+    SubmissionPack.objects.bulk_create([
+        SubmissionPack(archive=archive, name=archive.pack) for archive in SubmissionArchive.objects.exclude(pack='')
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_consumed_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionPack',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('file_count', models.PositiveIntegerField(default=0)),
+                ('original_size', models.BigIntegerField(default=0)),
+                ('packed_size', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('archive', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='packs', to='api.submissionarchive')),
+            ],
+        ),
+        migrations.RunPython(record_latest_packs, migrations.RunPython.noop),
+    ]
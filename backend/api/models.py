@@ -2,7 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 
 from root import settings
-from .managers import UserManager
+from .managers import UserManager, ActiveManager
 
 class User(AbstractBaseUser, PermissionsMixin):
     ROLE_CHOICES = [
@@ -36,14 +36,64 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name_plural = 'users'
 
 
+class StudyGroup(models.Model):
+    name = models.CharField(max_length=100, unique=True)  # masalan, "10A"
+    members = models.ManyToManyField(settings.AUTH_USER_MODEL, through='GroupMembership', related_name='study_groups')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+class GroupMembership(models.Model):
+    group = models.ForeignKey(StudyGroup, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='group_memberships')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # (user, group) indeksi foydalanuvchining guruhlarini, group FK indeksi guruh a'zolarini beradi
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'group'], name='unique_group_membership'),
+        ]
+
+    def __str__(self):
+        return f"{self.group} - {self.user}"
+
+
 class Assignment(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
-    file = models.FileField(upload_to='assignments/', blank=True, null=True)
+    file = models.FileField(upload_to='assignments/', blank=True, null=True, db_index=True)
     deadline = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     teacher = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='assignments')
+    # bo'sh bo'lsa barcha studentlarga ko'rinadi
+    group = models.ForeignKey(StudyGroup, on_delete=models.SET_NULL, blank=True, null=True, related_name='assignments')
+    # soft delete: reaper submissionlar va fayllarni fon rejimida bo'laklab o'chiradi
+    deleted_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    # Xulosalar va baholar hisobotiga ta'sir qiladigan maydonlar: signal faqat ular o'zgarganda invalidatsiya qiladi
+    TRACKED_FIELDS = ('deadline', 'group_id', 'teacher_id', 'deleted_at')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_values()
+        return instance
+
+    def remember_tracked_values(self):
+        # Kechiktirilgan (deferred) maydonlar save()da yozilmaydi, ular kuzatilmaydi
+        self._loaded_values = {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
+    def changed_fields(self):
+        # Bazadan o'qilmagan obyektda nima o'zgargani noma'lum - hammasi o'zgargan deb hisoblanadi
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return set(self.TRACKED_FIELDS)
+        return {name for name, value in loaded.items() if value != self.__dict__.get(name)}
 
     def __str__(self):
         return self.title
@@ -51,21 +101,78 @@ class Assignment(models.Model):
 class Submission(models.Model):
     assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='submissions')
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='submissions')
-    file = models.FileField(upload_to='submissions/')
+    # Arxivlangan nom "<pack>::<asl nom>" ko'rinishida bo'lgani uchun standart 100 belgi yetmaydi
+    file = models.FileField(upload_to='submissions/', max_length=255, db_index=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
     grade = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     feedback = models.TextField(blank=True, null=True)
     attempt = models.PositiveSmallIntegerField(default=1)
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    preview = models.ImageField(upload_to='previews/', blank=True, null=True)
+    page_count = models.PositiveIntegerField(blank=True, null=True)
+    # Baholash navbati: faqat oxirgi urinish baholanadi, claim boshqa o'qituvchi bilan to'qnashuvni oldini oladi
+    is_latest = models.BooleanField(default=True)
+    claimed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
+                                   related_name='claimed_submissions')
+    claimed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['assignment', 'student'], name='submission_assignment_student'),
+            models.Index(fields=['assignment', 'submitted_at'], name='submission_grading_queue',
+                         condition=models.Q(grade__isnull=True, is_latest=True)),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # StudentSummary baho o'zgarishini hisoblashi uchun bazadagi eski qiymat
+        instance._loaded_grade = instance.__dict__.get('grade')
+        return instance
 
     def __str__(self):
         return f"{self.assignment.title} - {self.student.fullname}"
 
+class SubmissionArchive(models.Model):
+    term = models.CharField(max_length=7, unique=True)
+    pack = models.CharField(max_length=255)
+    file_count = models.PositiveIntegerField(default=0)
+    original_size = models.BigIntegerField(default=0)
+    packed_size = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def saved_size(self):
+        return self.original_size - self.packed_size
+
+    def __str__(self):
+        return f"{self.term} ({self.file_count} fayl)"
+
+class SubmissionPack(models.Model):
+    # Har bir archive_submissions ishga tushishi yozgan pack: cleanup_orphaned_media ishlatilmay qolganini o'chiradi
+    archive = models.ForeignKey(SubmissionArchive, on_delete=models.CASCADE, related_name='packs')
+    name = models.CharField(max_length=255, unique=True)
+    file_count = models.PositiveIntegerField(default=0)
+    original_size = models.BigIntegerField(default=0)
+    packed_size = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
 class Book(models.Model):
     title = models.CharField(max_length=255)
     subject = models.CharField(max_length=100)
-    file = models.FileField(upload_to='books/')
+    file = models.FileField(upload_to='books/', db_index=True)
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploaded_books')
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    preview = models.ImageField(upload_to='previews/', blank=True, null=True)
+    page_count = models.PositiveIntegerField(blank=True, null=True)
+    deleted_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.title
@@ -84,8 +191,77 @@ class CalendarEvent(models.Model):
     end_time = models.DateTimeField()
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='events')
     created_at = models.DateTimeField(auto_now_add=True)
-    # optional: specific group or user
-    for_group = models.CharField(max_length=100, blank=True, null=True)  # masalan, "10A" yoki "All"
+    # bo'sh bo'lsa hamma guruh / hamma rol uchun
+    group = models.ForeignKey(StudyGroup, on_delete=models.SET_NULL, blank=True, null=True, related_name='events')
+    role = models.CharField(max_length=20, choices=User.ROLE_CHOICES, blank=True, default='')
+
+    def __str__(self):
+        return f"{self.title} ({self.get_event_type_display()})"
+
+class StudentSummary(models.Model):
+    student = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                   related_name='summary')
+    pending_assignments = models.IntegerField(default=0)
+    graded_submissions = models.IntegerField(default=0)
+    ungraded_submissions = models.IntegerField(default=0)
+    grade_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    next_event = models.ForeignKey(CalendarEvent, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    next_event_start = models.DateTimeField(blank=True, null=True)
+    # shu vaqtdan keyin (dedlayn yoki tadbir o'tib ketganda) qayta hisoblanadi
+    valid_until = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def average_grade(self):
+        if not self.graded_submissions:
+            return None
+        return round(self.grade_total / self.graded_submissions, 2)
+
+    def __str__(self):
+        return f"{self.student} summary"
+
+
+class AuditLog(models.Model):
+    ACTION_CHOICES = [
+        ('create', 'Yaratildi'),
+        ('update', "O'zgartirildi"),
+        ('grade', 'Baholandi'),
+        ('delete', "O'chirildi"),
+    ]
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
+                              related_name='audit_logs')
+    action = models.CharField(max_length=16, choices=ACTION_CHOICES)
+    object_type = models.CharField(max_length=64)  # masalan "api.Submission"
+    object_id = models.CharField(max_length=64)
+    object_repr = models.CharField(max_length=255, blank=True)
+    changes = models.JSONField(default=dict, blank=True)
+    # bufferdan keyin yoziladi, shuning uchun vaqt hodisa paytida qo'yiladi
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ('-created_at', '-id')
+        indexes = [
+            models.Index(fields=['actor', 'created_at'], name='auditlog_actor_time'),
+            models.Index(fields=['object_type', 'object_id', 'created_at'], name='auditlog_object_time'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()}: {self.object_type} #{self.object_id}"
+
+class RevokedToken(models.Model):
+    # Faqat token muddati tugaguncha saqlanadi: undan keyin token baribir yaroqsiz (prune_revoked_tokens)
+    jti = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+class ConsumedUpload(models.Model):
+    # To'g'ridan-to'g'ri yuklash kaliti bir marta yakunlanadi: unique kalit takroriy finalize'ni poyga holatida ham to'xtatadi
+    # (partitionlangan Submission.file ustida unique indeks qo'yib bo'lmaydi)
+    key = models.CharField(max_length=255, unique=True)
+    consumed_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.title} ({self.get_event_type_display()})"
\ No newline at end of file
+        return self.key
@@ -0,0 +1,178 @@
+import re
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Submission
+from .reaper import reaping_rows
+from .terms import next_term, previous_term, term_bounds, term_for
+
+TABLE = Submission._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_NAME = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+
+def partition_name(term):
+    return f"{TABLE}_p{term.replace('-', '_')}"
+
+
+def _term_of(name):
+    match = PARTITION_NAME.match(name)
+    return f"{match[1]}-{match[2]}" if match else None
+
+
+def _bound(value):
+    # Chegara SQL'ga literal sifatida yoziladi: qiymatlar term_bounds() dan, foydalanuvchidan emas
+    return f"'{value.isoformat()}'"
+
+
+def term_filter(term):
+    """
+    submitted_at range of a term label ("YYYY-MM" or "current"). The bounds are constants, so
+    PostgreSQL prunes the scan to that term's partition. Raises ValueError for a bad label.
+    """
+    if term == 'current':
+        term = term_for(timezone.now())
+    start, end = term_bounds(term)
+    return Q(submitted_at__gte=start, submitted_at__lt=end)
+
+
+def is_partitioned():
+    """
+    True when the Submission table is range-partitioned (PostgreSQL after migration 0011);
+    SQLite keeps a plain table.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)", [TABLE])
+        return cursor.fetchone()[0]
+
+
+def attached_terms():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    return sorted(term for term in map(_term_of, names) if term)
+
+
+def detached_tables():
+    """
+    Term partitions that retention detached but kept as standalone archive tables.
+    """
+    if connection.vendor != 'postgresql':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = current_schema() AND c.relkind = 'r' AND NOT c.relispartition AND c.relname LIKE %s",
+            [f'{TABLE}_p%'],
+        )
+        return sorted(name for (name,) in cursor.fetchall() if _term_of(name))
+
+
+def archived_values(column, values):
+    """
+    The given values of column that rows of detached partitions still use, so their files
+    are not treated as orphans.
+    """
+    found = set()
+    if not values:
+        return found
+    with connection.cursor() as cursor:
+        for table in detached_tables():
+            cursor.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} = ANY(%s)", [list(values)])
+            found.update(value for (value,) in cursor.fetchall())
+    return found
+
+
+def archived_prefixes(column, prefixes):
+    """
+    The given prefixes that some value of column in a detached partition starts with.
+    """
+    found = set()
+    if not prefixes:
+        return found
+    with connection.cursor() as cursor:
+        for table in detached_tables():
+            for prefix in set(prefixes) - found:
+                cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table} WHERE starts_with({column}, %s))", [prefix])
+                if cursor.fetchone()[0]:
+                    found.add(prefix)
+    return found
+
+
+def create_partition(term):
+    """
+    Creates the partition of a term. Rows that already landed in the default partition for
+    that range are moved into it in the same transaction.
+    """
+    start, end = term_bounds(term)
+    in_range = f"submitted_at >= {_bound(start)} AND submitted_at < {_bound(end)}"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})")
+        stray = cursor.fetchone()[0]
+        if stray:
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        cursor.execute(
+            f"CREATE TABLE {partition_name(term)} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})"
+        )
+        if stray:
+            cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}")
+            cursor.execute(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}")
+            cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+
+
+def detach_partition(term, drop=False):
+    """
+    Detaches a term partition from Submission. The table is kept as an archive (without its
+    foreign keys, so users and assignments can still be deleted) unless drop is set.
+    """
+    name = partition_name(term)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        if drop:
+            cursor.execute(f"DROP TABLE {name}")
+            return
+        cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [name])
+        for (constraint,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {name} DROP CONSTRAINT {connection.ops.quote_name(constraint)}")
+
+
+def upcoming_terms(ahead, now=None):
+    """
+    The current term followed by the next `ahead` terms.
+    """
+    terms = [term_for(now or timezone.now())]
+    for _ in range(ahead):
+        terms.append(next_term(terms[-1]))
+    return terms
+
+
+def oldest_retained_term(retain, now=None):
+    term = term_for(now or timezone.now())
+    for _ in range(retain - 1):
+        term = previous_term(term)
+    return term
+
+
+def delete_before(term, batch_size):
+    """
+    Plain-table fallback of retention: deletes rows submitted before the term in batches.
+    Their files are left to cleanup_orphaned_media.
+    """
+    start, _ = term_bounds(term)
+    submissions = Submission.objects.filter(submitted_at__lt=start).order_by('pk')
+    deleted = 0
+    while True:
+        with transaction.atomic(), reaping_rows():
+            pks = list(submissions.values_list('pk', flat=True)[:batch_size])
+            Submission.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        if len(pks) < batch_size:
+            return deleted
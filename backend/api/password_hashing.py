@@ -0,0 +1,30 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+
+# Worker'lar spawn bilan ishga tushadi va bu modulni import qiladi: bu yerda modellarni import qilib bo'lmaydi
+HASH_CHUNK_SIZE = 200
+
+
+def _init_worker():
+    # spawn'da worker toza interpretator: Django qayta sozlanishi kerak
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'root.settings')
+    django.setup()
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, workers=None):
+    chunks = [passwords[i:i + HASH_CHUNK_SIZE] for i in range(0, len(passwords), HASH_CHUNK_SIZE)]
+    if len(chunks) <= 1:
+        return _hash_chunk(passwords)
+    # fork ko'p oqimli worker ichida (gunicorn threads, runserver) boshqa oqimlar ushlab turgan lock'larni nusxalab
+    # qotib qolishi mumkin, shuning uchun har doim spawn
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        return [hashed for chunk in pool.map(_hash_chunk, chunks) for hashed in chunk]
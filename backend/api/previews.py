@@ -0,0 +1,176 @@
+import hashlib
+import io
+import json
+import logging
+import re
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff')
+PDFINFO_PAGES_RE = re.compile(rb'^Pages:\s+(\d+)', re.MULTILINE)
+CHUNK_SIZE = 64 * 1024
+
+
+def file_hash(field_file):
+    """
+    Returns the sha256 hex digest of the file contents, read in chunks.
+    """
+    digest = hashlib.sha256()
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks(CHUNK_SIZE):
+            digest.update(chunk)
+    finally:
+        field_file.close()
+    return digest.hexdigest()
+
+
+def _cache_names(content_hash):
+    base = f"{settings.PREVIEW_DIR.rstrip('/')}/{content_hash[:2]}/{content_hash}"
+    return f"{base}.jpg", f"{base}.json"
+
+
+def _thumbnail(image):
+    image = image.convert('RGB')
+    image.thumbnail(settings.PREVIEW_SIZE)
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=80, optimize=True)
+    return buffer.getvalue()
+
+
+def _render_image(field_file):
+    from PIL import Image
+
+    field_file.open('rb')
+    try:
+        with Image.open(field_file) as image:
+            return _thumbnail(image), getattr(image, 'n_frames', 1)
+    finally:
+        field_file.close()
+
+
+@contextmanager
+def _local_path(field_file):
+    # Kitoblar 200 MB gacha: xotiraga o'qilmaydi, disk yo'li bo'lmasa (S3, arxiv) vaqtinchalik faylga bo'laklab ko'chiriladi
+    try:
+        path = field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        path = None
+    if path is not None:
+        yield path
+        return
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as tmp:
+        field_file.open('rb')
+        try:
+            for chunk in field_file.chunks(CHUNK_SIZE):
+                tmp.write(chunk)
+        finally:
+            field_file.close()
+        tmp.flush()
+        yield tmp.name
+
+
+def _pdfinfo_page_count(source):
+    if not shutil.which('pdfinfo'):
+        return None
+    result = subprocess.run(['pdfinfo', source], capture_output=True, timeout=60)
+    if result.returncode != 0:
+        return None
+    match = PDFINFO_PAGES_RE.search(result.stdout)
+    return int(match.group(1)) if match else None
+
+
+def _render_pdf(field_file):
+    from PIL import Image
+
+    try:
+        import fitz  # PyMuPDF, ixtiyoriy
+    except ImportError:
+        fitz = None
+
+    with _local_path(field_file) as source:
+        if fitz is not None:
+            with fitz.open(source, filetype='pdf') as document:
+                if not document.page_count:
+                    return None, 0
+                pixmap = document[0].get_pixmap(dpi=72)
+                image = Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+                return _thumbnail(image), document.page_count
+
+        # PyMuPDF bo'lmasa poppler: sahifalar soni pdfinfo'dan (siqilgan object stream'larni ham hisoblaydi)
+        page_count = _pdfinfo_page_count(source)
+        if not shutil.which('pdftoppm'):
+            return None, page_count
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run(
+                ['pdftoppm', '-f', '1', '-l', '1', '-r', '72', '-png', '-singlefile', source, f"{tmp}/page"],
+                capture_output=True, timeout=60,
+            )
+            if result.returncode != 0:
+                return None, page_count
+            with Image.open(f"{tmp}/page.png") as image:
+                return _thumbnail(image), page_count
+
+
+def render_preview(field_file):
+    """
+    Returns (jpeg bytes or None, page count) for the first page of the file.
+    """
+    name = field_file.name.lower()
+    if name.endswith('.pdf'):
+        return _render_pdf(field_file)
+    if name.endswith(IMAGE_EXTENSIONS):
+        return _render_image(field_file)
+    return None, None
+
+
+def get_or_create_preview(field_file, content_hash):
+    """
+    Looks up the on-disk preview cache by content hash and renders only on a miss.
+    Returns (preview name or None, page count).
+    """
+    image_name, meta_name = _cache_names(content_hash)
+    if default_storage.exists(meta_name):
+        with default_storage.open(meta_name, 'rb') as fh:
+            meta = json.loads(fh.read())
+        return meta['preview'], meta['page_count']
+
+    image, page_count = render_preview(field_file)
+    preview = None
+    if image is not None:
+        if default_storage.exists(image_name):
+            default_storage.delete(image_name)
+        preview = default_storage.save(image_name, ContentFile(image))
+    default_storage.save(meta_name, ContentFile(json.dumps({'preview': preview, 'page_count': page_count})))
+    return preview, page_count
+
+
+def generate_preview(model_label, pk):
+    """
+    Fills content_hash, preview and page_count for a Book or Submission row.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not instance.file:
+        return
+    try:
+        # Yuklash paytida hisoblangan hash bo'lsa fayl qayta o'qilmaydi; preview keshi ham shu hash bo'yicha
+        content_hash = instance.content_hash or file_hash(instance.file)
+        preview, page_count = get_or_create_preview(instance.file, content_hash)
+    except Exception:
+        logger.exception("Preview generation failed for %s #%s", model_label, pk)
+        return
+    current = (instance.content_hash, instance.preview.name or None, instance.page_count)
+    if (content_hash, preview, page_count) == current:
+        return
+    # save() emas, update() -- signal va auto_now maydonlarga tegmaslik uchun
+    model.objects.filter(pk=pk).update(content_hash=content_hash, preview=preview, page_count=page_count)
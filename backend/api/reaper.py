@@ -0,0 +1,92 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Assignment, Book, Submission
+from .tasks import run_in_background
+
+logger = logging.getLogger(__name__)
+
+_reaping = ContextVar('reaping', default=False)
+
+
+def is_reaping():
+    # Reaper o'chirayotgan submissionlar uchun har bir qatorga signal ishlovi kerak emas
+    return _reaping.get()
+
+
+@contextmanager
+def reaping_rows():
+    token = _reaping.set(True)
+    try:
+        yield
+    finally:
+        _reaping.reset(token)
+
+
+def soft_delete(instance):
+    """
+    Hides an Assignment or Book right away and schedules the reaper to remove its rows and files.
+    """
+    instance.deleted_at = timezone.now()
+    instance.save(update_fields=['deleted_at'])
+    run_in_background(reap_deleted)
+
+
+def _delete_files(model, names):
+    # Bir xil nomli fayl boshqa qatorda ham ishlatilayotgan bo'lsa qoldiramiz
+    names = {name for name in names if name}
+    if not names:
+        return
+    in_use = set(model._base_manager.filter(file__in=names).values_list('file', flat=True))
+    for name in names - in_use:
+        try:
+            default_storage.delete(name)
+        except OSError:
+            logger.warning("Could not delete %s", name, exc_info=True)
+
+
+def _delete_batch(queryset, model, batch_size):
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().values_list('pk', 'file')[:batch_size])
+        if not rows:
+            return 0
+        with reaping_rows():
+            model._base_manager.filter(pk__in=[pk for pk, _ in rows]).delete()
+        names = [name for _, name in rows]
+        transaction.on_commit(lambda: _delete_files(model, names))
+    return len(rows)
+
+
+def reap_deleted(batch_size=None, deleted_before=None):
+    """
+    Deletes soft-deleted assignments (their submissions first) and books in bounded
+    transactions of batch_size rows, removing their files after each commit.
+    Returns {'submissions': n, 'assignments': n, 'books': n}.
+    """
+    batch_size = batch_size or settings.REAPER_BATCH_SIZE
+    cutoff = deleted_before or timezone.now()
+    counts = {'submissions': 0, 'assignments': 0, 'books': 0}
+
+    assignments = Assignment.all_objects.filter(deleted_at__lte=cutoff).order_by('pk')
+    for assignment_id in list(assignments.values_list('pk', flat=True)):
+        submissions = Submission.objects.filter(assignment_id=assignment_id).order_by('pk')
+        while True:
+            deleted = _delete_batch(submissions, Submission, batch_size)
+            counts['submissions'] += deleted
+            if deleted < batch_size:
+                break
+        counts['assignments'] += _delete_batch(Assignment.all_objects.filter(pk=assignment_id), Assignment, 1)
+
+    books = Book.all_objects.filter(deleted_at__lte=cutoff).order_by('pk')
+    while True:
+        deleted = _delete_batch(books, Book, batch_size)
+        counts['books'] += deleted
+        if deleted < batch_size:
+            break
+    return counts
@@ -0,0 +1,152 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+# Kechroq commit qilingan tranzaksiyalar (va serverlar soatidagi kichik farq) uchun sinxronlash oynasi biroz ustma-ust olinadi
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings: never a false negative, and false positives at about
+    error_rate once capacity items were added.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Bitta blake2b hash'dan k ta pozitsiya (double hashing)
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, step = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        # Qayta qo'shilgan element hisobga olinmaydi
+        self.count += added
+        return added
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """
+    Revoked refresh-token JTIs in a per-process Bloom filter. A miss means "not revoked" without
+    touching the DB; only a hit is confirmed against RevokedToken. Rows written by other processes
+    are picked up every REVOCATION_SYNC_SECONDS, and the filter is rebuilt from unexpired rows once
+    it is over capacity or older than the refresh token lifetime (pruned rows then drop out). A
+    rebuilt filter has room for twice the current rows, so it is not rebuilt again on the next sync.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._built_at = self._synced_at = None
+        self._checked = 0.0
+
+    def rebuild(self):
+        now = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', flat=True)
+        capacity = max(settings.REVOCATION_FILTER_CAPACITY, 2 * rows.count())
+        bloom = BloomFilter(capacity, settings.REVOCATION_FILTER_ERROR_RATE)
+        for jti in rows.iterator(chunk_size=10_000):
+            bloom.add(jti)
+        self._filter, self._built_at, self._synced_at = bloom, now, now
+        return bloom
+
+    def _sync(self):
+        now = timezone.now()
+        if (
+            self._filter is None
+            or self._filter.count > self._filter.capacity
+            or now - self._built_at > api_settings.REFRESH_TOKEN_LIFETIME
+        ):
+            self.rebuild()
+            return
+        rows = RevokedToken.objects.filter(revoked_at__gte=self._synced_at - SYNC_OVERLAP).values_list('jti', flat=True)
+        for jti in rows.iterator(chunk_size=10_000):
+            self._filter.add(jti)
+        self._synced_at = now
+
+    def _maybe_sync(self):
+        if self._filter is None:
+            self._lock.acquire()
+        elif time.monotonic() - self._checked < settings.REVOCATION_SYNC_SECONDS:
+            return
+        elif not self._lock.acquire(blocking=False):
+            # Boshqa thread sinxronlayapti (yoki qayta quryapti) - hozircha eski filtr bilan davom etamiz
+            return
+        try:
+            if self._filter is None or time.monotonic() - self._checked >= settings.REVOCATION_SYNC_SECONDS:
+                self._sync()
+                self._checked = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def might_contain(self, jti):
+        self._maybe_sync()
+        return jti in self._filter
+
+    def is_revoked(self, jti):
+        return self.might_contain(jti) and RevokedToken.objects.filter(jti=jti).exists()
+
+    def add(self, jti):
+        if self._filter is not None:
+            self._filter.add(jti)
+
+
+revoked = RevocationList()
+
+
+def is_revoked(token):
+    return revoked.is_revoked(token[api_settings.JTI_CLAIM])
+
+
+def revoke(token):
+    """
+    Revokes a refresh token until it would expire anyway. Returns False when it was already
+    revoked, so a token can be rotated only once even by concurrent requests.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+    revoked.add(jti)
+    return True
+
+
+def prune(batch_size=5000):
+    """
+    Deletes rows of tokens that have expired (they fail the exp check anyway) in batches.
+    """
+    expired = RevokedToken.objects.filter(expires_at__lte=timezone.now()).order_by('pk')
+    deleted = 0
+    while True:
+        pks = list(expired.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += RevokedToken.objects.filter(pk__in=pks).delete()[0]
@@ -0,0 +1,80 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_state = ContextVar('replica_state', default=None)
+
+PIN_KEY = 'replica-pin:{}'
+# DatabaseCache jadvali: doim primary'da, kesh yozuvlari so'rovni primary'ga bog'lab qo'ymaydi
+CACHE_APP_LABEL = 'django_cache'
+
+
+class RequestState:
+    def __init__(self, request):
+        self.request = request
+        self.force_primary = request.method not in ('GET', 'HEAD', 'OPTIONS')
+        self.wrote = False
+        self.replica = random.choice(settings.REPLICA_DATABASES) if settings.REPLICA_DATABASES else None
+        self._pinned = None
+
+    def pinned(self):
+        # Foydalanuvchi autentifikatsiyadan keyin ma'lum bo'ladi, shuning uchun kechiktirib tekshiramiz
+        if self._pinned is None:
+            user = getattr(self.request, 'user', None)
+            if user is None or not user.is_authenticated:
+                return False
+            self._pinned = bool(caches[settings.REPLICA_PIN_CACHE].get(PIN_KEY.format(user.pk)))
+        return self._pinned
+
+
+def pin(user):
+    # Umumiy keshda: keyingi so'rov boshqa worker'ga tushsa ham primary'dan o'qiydi
+    caches[settings.REPLICA_PIN_CACHE].set(PIN_KEY.format(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def begin_request(request):
+    return _state.set(RequestState(request))
+
+
+def end_request(token):
+    state = _state.get()
+    _state.reset(token)
+    return state
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to a replica alias (one per request) and writes to the primary.
+    Reads stay on the primary for unsafe requests, inside transactions, after a write
+    in the same request and for REPLICA_PIN_SECONDS after the user's last write.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        state = _state.get()
+        if state is None or state.replica is None:
+            return DEFAULT_DB_ALIAS
+        if state.force_primary or state.wrote or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state.pinned():
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Barcha aliaslar bitta bazaning nusxalari
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
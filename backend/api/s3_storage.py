@@ -0,0 +1,61 @@
+import io
+
+from botocore.exceptions import ClientError
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+from .storage import ArchiveMixin
+
+# zipfile markaziy katalogni va a'zoni bir nechta o'qishda oladi: har biri alohida Range so'rovi bo'lmasligi uchun
+PACK_READ_BUFFER = 1024 * 1024
+
+
+class RangeReader(io.RawIOBase):
+    """
+    Seekable read-only view of an S3 object that fetches only the requested byte ranges.
+    """
+
+    def __init__(self, obj):
+        self._obj = obj
+        self._size = obj.content_length
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self._size}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def readinto(self, buffer):
+        if self._position >= self._size:
+            return 0
+        end = min(self._position + len(buffer), self._size) - 1
+        data = self._obj.get(Range=f'bytes={self._position}-{end}')['Body'].read()
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class ArchiveAwareS3Storage(ArchiveMixin, S3Storage):
+    """
+    S3Storage that also reads archived pack::member names from packs kept in the bucket,
+    fetching only the zip directory and the member's bytes instead of the whole pack.
+    """
+
+    def _open_pack(self, pack):
+        obj = self.bucket.Object(self._normalize_name(clean_name(pack)))
+        try:
+            obj.load()
+        except ClientError as exc:
+            if exc.response['ResponseMetadata']['HTTPStatusCode'] == 404:
+                raise FileNotFoundError(f"Pack does not exist: {pack}")
+            raise
+        return io.BufferedReader(RangeReader(obj), buffer_size=PACK_READ_BUFFER)
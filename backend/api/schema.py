@@ -0,0 +1,127 @@
+import gzip
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from rest_framework.views import APIView
+
+SCHEMA_FORMATS = {
+    'yaml': 'application/vnd.oai.openapi; charset=utf-8',
+    'json': 'application/vnd.oai.openapi+json; charset=utf-8',
+}
+
+
+class NullSchema:
+    """
+    Placeholder DEFAULT_SCHEMA_CLASS for API-only workers: lets @extend_schema decorate
+    views without importing rest_framework.schemas or the drf_spectacular generator.
+    """
+
+
+def schema_path(fmt):
+    return os.path.join(settings.OPENAPI_SCHEMA_DIR, f"openapi.{fmt}")
+
+
+def generate_schema():
+    """
+    Generates the OpenAPI document and returns {format: bytes}.
+    """
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=spectacular_settings.SERVE_PUBLIC)
+    return {
+        'yaml': OpenApiYamlRenderer().render(schema, renderer_context={}),
+        'json': OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def write_schema(documents):
+    os.makedirs(settings.OPENAPI_SCHEMA_DIR, exist_ok=True)
+    for fmt, body in documents.items():
+        for path, data in ((schema_path(fmt), body), (schema_path(fmt) + '.gz', gzip.compress(body, 9))):
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+
+
+class SchemaCache:
+    """
+    Keeps the prebuilt schema files in memory, reloading a format when its file changes.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, fmt):
+        path = schema_path(fmt)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        entry = self._entries.get(fmt)
+        if entry is None or entry['mtime'] != mtime:
+            with self._lock:
+                with open(path, 'rb') as fh:
+                    body = fh.read()
+                try:
+                    with open(path + '.gz', 'rb') as fh:
+                        compressed = fh.read()
+                except FileNotFoundError:
+                    compressed = gzip.compress(body, 9)
+                digest = hashlib.sha256(body).hexdigest()[:32]
+                entry = self._entries[fmt] = {
+                    'mtime': mtime,
+                    'body': body,
+                    'gzip': compressed,
+                    'etag': f'"{digest}"',
+                    'gzip_etag': f'"{digest}-gzip"',
+                }
+        return entry
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSchemaAPIView(APIView):
+    """
+    Serves the schema built by the build_schema command with an ETag and gzip.
+    Falls back to live generation only when DEBUG is on and no build exists.
+    """
+    authentication_classes = []
+
+    def get_renderers(self):
+        from drf_spectacular.renderers import (
+            OpenApiJsonRenderer, OpenApiJsonRenderer2, OpenApiYamlRenderer, OpenApiYamlRenderer2,
+        )
+        return [OpenApiYamlRenderer(), OpenApiYamlRenderer2(), OpenApiJsonRenderer(), OpenApiJsonRenderer2()]
+
+    def get(self, request, *args, **kwargs):
+        renderer, media_type = self.perform_content_negotiation(request)
+        entry = schema_cache.get(renderer.format)
+        if entry is None:
+            if settings.DEBUG:
+                from drf_spectacular.views import SpectacularAPIView
+                return SpectacularAPIView.as_view()(request._request, *args, **kwargs)
+            return HttpResponse("OpenAPI schema has not been built, run `manage.py build_schema`.", status=503)
+
+        # gzip va oddiy javob baytlari har xil - strong ETag ham har xil bo'lishi kerak
+        compressed = 'gzip' in request.headers.get('Accept-Encoding', '')
+        etag = entry['gzip_etag'] if compressed else entry['etag']
+        if etag in (tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')):
+            response = HttpResponseNotModified()
+        elif compressed:
+            response = HttpResponse(entry['gzip'], content_type=SCHEMA_FORMATS[renderer.format])
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(entry['body'], content_type=SCHEMA_FORMATS[renderer.format])
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=300'
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
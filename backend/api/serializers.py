@@ -1,5 +1,10 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import User, Assignment, Submission, Book, CalendarEvent
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from . import revocation
+from .models import User, Assignment, Submission, Book, CalendarEvent, StudentSummary, AuditLog, StudyGroup
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -25,11 +30,46 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserImportRowSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['fullname', 'username', 'birthday_date', 'gender', 'address', 'temporarily_address', 'password',
+                  'role']
+        # username takrorlanishi import_users ichida bitta IN so'rov bilan tekshiriladi
+        extra_kwargs = {'username': {'validators': []}}
+
+
+class UserImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=['csv', 'json'], required=False)
+
+
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
 
 
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rejects revoked refresh tokens. With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION the
+    presented token is revoked when its replacement is issued, so it works only once.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if revocation.is_revoked(refresh):
+            raise TokenError("Token bekor qilingan")
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            if not revocation.revoke(refresh):
+                raise TokenError("Token bekor qilingan")
+        return data
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -37,27 +77,115 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ("username", "role")
 
 
+class UserBriefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ["id", "fullname", "username", "role"]
+
+
+class UserSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=settings.USER_SEARCH_MAX_LIMIT, default=10)
+
+
+class UserSearchResultSerializer(UserBriefSerializer):
+    score = serializers.FloatField()
+
+    class Meta(UserBriefSerializer.Meta):
+        fields = UserBriefSerializer.Meta.fields + ["score"]
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    target = serializers.ChoiceField(choices=['submission', 'book', 'assignment'])
+    filename = serializers.CharField(max_length=200)
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r'^[0-9a-f]{64}$')
+    # target=submission uchun
+    assignment = serializers.IntegerField(required=False)
+
+
+class DirectUploadTicketSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    url = serializers.URLField()
+    method = serializers.CharField()
+    headers = serializers.DictField(child=serializers.CharField())
+    expires_in = serializers.IntegerField()
+
+
+class DirectUploadFinalizeSerializer(serializers.Serializer):
+    token = serializers.CharField()
+
+
+class StudyGroupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StudyGroup
+        fields = ["id", "name"]
+
+
+class AssignmentBriefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Assignment
+        fields = ["id", "title", "deadline"]
+
+
+# expandable_fields: ?expand= bilan ichki obyektga aylantirish mumkin bo'lgan ForeignKey maydonlar
 class AssignmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Assignment
-        fields = '__all__'
+        exclude = ['deleted_at']
         read_only_fields = ('teacher', 'created_at', 'updated_at')
+        expandable_fields = {'teacher': UserBriefSerializer, 'group': StudyGroupSerializer}
 
 class SubmissionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Submission
         fields = '__all__'
-        read_only_fields = ('student', 'assignment', 'submitted_at', 'attempt')
+        read_only_fields = ('student', 'assignment', 'submitted_at', 'attempt', 'content_hash', 'preview', 'page_count',
+                            'is_latest', 'claimed_by', 'claimed_at')
+        expandable_fields = {'student': UserBriefSerializer, 'assignment': AssignmentBriefSerializer,
+                             'claimed_by': UserBriefSerializer}
 
 
 class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
-        fields = '__all__'
-        read_only_fields = ('uploaded_by', 'uploaded_at')
+        exclude = ['deleted_at']
+        read_only_fields = ('uploaded_by', 'uploaded_at', 'content_hash', 'preview', 'page_count')
+        expandable_fields = {'uploaded_by': UserBriefSerializer}
 
 class CalendarEventSerializer(serializers.ModelSerializer):
     class Meta:
         model = CalendarEvent
         fields = '__all__'
         read_only_fields = ('created_by', 'created_at')
+        expandable_fields = {'created_by': UserBriefSerializer, 'group': StudyGroupSerializer}
+
+class CalendarEventBriefSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CalendarEvent
+        fields = ["id", "title", "event_type", "start_time", "end_time"]
+
+class StudentSummarySerializer(serializers.ModelSerializer):
+    average_grade = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
+    next_event = CalendarEventBriefSerializer(read_only=True)
+
+    class Meta:
+        model = StudentSummary
+        fields = ["pending_assignments", "graded_submissions", "ungraded_submissions", "average_grade",
+                  "next_event", "updated_at"]
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditLog
+        fields = '__all__'
+        expandable_fields = {'actor': UserBriefSerializer}
+
+class AuditLogFilterSerializer(serializers.Serializer):
+    actor = serializers.IntegerField(required=False)
+    action = serializers.ChoiceField(choices=AuditLog.ACTION_CHOICES, required=False)
+    object_type = serializers.CharField(required=False)
+    object_id = serializers.CharField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=1000, default=100)
@@ -0,0 +1,150 @@
+from decimal import Decimal
+
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import summaries, user_search
+from .reaper import is_reaping
+from .models import User, Assignment, Book, CalendarEvent, GroupMembership, Submission
+from .previews import generate_preview
+from .tasks import run_in_background
+from .terms import term_for
+
+
+@receiver(pre_save, sender=Book)
+@receiver(pre_save, sender=Submission)
+def mark_new_file(sender, instance, **kwargs):
+    # Yangi yuklangan fayl hali storage'ga yozilmagan bo'ladi
+    instance._file_changed = bool(instance.file) and not instance.file._committed
+    if instance._file_changed:
+        # ValidatingUploadHandler yuklash paytida hisoblagan hash; bo'lmasa preview generatsiyasi hisoblaydi
+        instance.content_hash = getattr(instance.file.file, 'content_hash', '')
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Submission)
+def schedule_preview(sender, instance, **kwargs):
+    if getattr(instance, '_file_changed', False):
+        run_in_background(generate_preview, sender._meta.label, instance.pk)
+
+
+def _grade(value):
+    return None if value in (None, '') else Decimal(str(value))
+
+
+@receiver(post_save, sender=Submission)
+def mark_latest_attempt(sender, instance, created, **kwargs):
+    if created:
+        Submission.objects.filter(
+            assignment_id=instance.assignment_id, student_id=instance.student_id, is_latest=True
+        ).exclude(pk=instance.pk).update(is_latest=False)
+
+
+@receiver(post_delete, sender=Submission)
+def restore_latest_attempt(sender, instance, **kwargs):
+    if instance.is_latest and not is_reaping():
+        previous = Submission.objects.filter(
+            assignment_id=instance.assignment_id, student_id=instance.student_id
+        ).order_by('-attempt', '-pk').values_list('pk', flat=True).first()
+        if previous is not None:
+            Submission.objects.filter(pk=previous).update(is_latest=True)
+
+
+@receiver(post_save, sender=Submission)
+def invalidate_grade_report(sender, instance, **kwargs):
+    if _grade(instance.grade) != _grade(getattr(instance, '_loaded_grade', None)):
+        # analytics numpy'ni yuklaydi - worker ishga tushishida emas, birinchi kerak bo'lganda
+        from . import analytics
+        analytics.invalidate(term_for(instance.submitted_at))
+
+
+@receiver(post_delete, sender=Submission)
+def invalidate_grade_report_on_delete(sender, instance, **kwargs):
+    # reaper o'chirayotgan topshiriq soft delete paytida hisobotlarni allaqachon eskirgan deb belgilagan
+    if instance.grade is not None and not is_reaping():
+        from . import analytics
+        analytics.invalidate(term_for(instance.submitted_at))
+
+
+@receiver(post_save, sender=Submission)
+def update_summary_on_submission(sender, instance, created, **kwargs):
+    grade, old_grade = _grade(instance.grade), _grade(getattr(instance, '_loaded_grade', None))
+    instance._loaded_grade = instance.grade
+    if created:
+        first_attempt = not Submission.objects.filter(
+            assignment_id=instance.assignment_id, student_id=instance.student_id
+        ).exclude(pk=instance.pk).exists()
+        open_assignment = first_attempt and instance.assignment.deadline > timezone.now()
+        summaries.apply_submission_delta(
+            instance.student_id, graded=int(grade is not None), ungraded=int(grade is None),
+            grade=grade or Decimal(0), pending=-int(open_assignment),
+        )
+    elif grade != old_grade:
+        graded = int(grade is not None) - int(old_grade is not None)
+        summaries.apply_submission_delta(
+            instance.student_id, graded=graded, ungraded=-graded, grade=(grade or 0) - (old_grade or 0),
+        )
+
+
+@receiver(post_delete, sender=Submission)
+def invalidate_summary_on_submission_delete(sender, instance, **kwargs):
+    # reaper o'chirayotgan topshiriq soft delete paytida barcha xulosalarni allaqachon eskirgan deb belgilagan
+    if not is_reaping():
+        summaries.invalidate(pk=instance.student_id)
+
+
+@receiver(post_save, sender=Assignment)
+def update_summaries_on_assignment(sender, instance, created, **kwargs):
+    if created:
+        if instance.deadline > timezone.now():
+            summaries.assignment_opened(instance)
+    else:
+        changed = instance.changed_fields()
+        if changed & {'deadline', 'group_id', 'deleted_at'}:
+            # Eski va yangi guruh studentlari xulosasi keyingi o'qishda qayta hisoblanadi
+            loaded_group_id = getattr(instance, '_loaded_values', {}).get('group_id')
+            summaries.invalidate_targeted(loaded_group_id, instance.group_id)
+        # soft delete, ustoz yoki dedlayn o'zgarishi baholar hisobotiga ham ta'sir qiladi
+        if changed & {'deadline', 'teacher_id', 'deleted_at'}:
+            from . import analytics
+            analytics.invalidate()
+    instance.remember_tracked_values()
+
+
+@receiver(post_delete, sender=Assignment)
+def invalidate_summaries_on_assignment_delete(sender, instance, **kwargs):
+    # reaper o'chirayotgan topshiriq soft delete paytida allaqachon invalidatsiya qilingan
+    if not is_reaping():
+        summaries.invalidate_targeted(instance.group_id)
+        from . import analytics
+        analytics.invalidate()
+
+
+@receiver(post_save, sender=CalendarEvent)
+def update_summaries_on_event(sender, instance, created, **kwargs):
+    if not created:
+        summaries.invalidate(next_event=instance)
+    if instance.start_time > timezone.now():
+        summaries.event_scheduled(instance)
+
+
+@receiver(post_delete, sender=CalendarEvent)
+def invalidate_summaries_on_event_delete(sender, instance, **kwargs):
+    summaries.invalidate(next_event_start=instance.start_time)
+
+
+@receiver(post_save, sender=GroupMembership)
+@receiver(post_delete, sender=GroupMembership)
+def invalidate_summary_on_membership(sender, instance, **kwargs):
+    summaries.invalidate(pk=instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def update_user_search_index(sender, instance, **kwargs):
+    user_search.index.update(instance)
+
+
+@receiver(post_delete, sender=User)
+def remove_from_user_search_index(sender, instance, **kwargs):
+    user_search.index.remove(instance.pk)
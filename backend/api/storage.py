@@ -0,0 +1,102 @@
+import zipfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+
+# Arxivlangan fayl nomi: "<pack>.zip::<asl nom>"
+ARCHIVE_SEPARATOR = '::'
+# Allaqachon siqilgan formatlar zip'ga qayta siqilmasdan yoziladi
+STORED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.zip', '.rar', '.7z', '.gz', '.mp3', '.mp4',
+                     '.docx', '.xlsx', '.pptx')
+
+
+def split_archived_name(name):
+    """
+    Returns (pack name, member name) for archived names, or (None, name).
+    """
+    if ARCHIVE_SEPARATOR in name:
+        pack, member = name.split(ARCHIVE_SEPARATOR, 1)
+        return pack, member
+    return None, name
+
+
+class ArchivedFile(File):
+    def __init__(self, pack_file, member, name):
+        self._pack_file = pack_file
+        self._archive = zipfile.ZipFile(pack_file)
+        super().__init__(self._archive.open(member), name=name)
+        self._size = self._archive.getinfo(member).file_size
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._archive.close()
+            self._pack_file.close()
+
+
+class ArchiveMixin:
+    """
+    Storage mixin that also reads files packed by the archive_submissions command, streaming
+    them straight out of the zip pack without extracting them. Subclasses open the pack
+    itself as a seekable binary file in _open_pack().
+    """
+
+    def _open_pack(self, pack):
+        raise NotImplementedError
+
+    def _member_info(self, name):
+        pack, member = split_archived_name(name)
+        with zipfile.ZipFile(self._open_pack(pack)) as archive:
+            return archive.getinfo(member)
+
+    def _open(self, name, mode='rb'):
+        pack, member = split_archived_name(name)
+        if pack is None:
+            return super()._open(name, mode)
+        if 'w' in mode or 'a' in mode:
+            raise ValueError("Archived files are read-only.")
+        return ArchivedFile(self._open_pack(pack), member, name)
+
+    def exists(self, name):
+        pack, member = split_archived_name(name)
+        if pack is None:
+            return super().exists(name)
+        if not super().exists(pack):
+            return False
+        try:
+            self._member_info(name)
+        except KeyError:
+            return False
+        return True
+
+    def size(self, name):
+        if split_archived_name(name)[0] is None:
+            return super().size(name)
+        return self._member_info(name).file_size
+
+    def url(self, name):
+        if split_archived_name(name)[0] is None:
+            return super().url(name)
+        return reverse('archived-file', kwargs={'name': name})
+
+    def delete(self, name):
+        # Pack ichidagi a'zoni alohida o'chirib bo'lmaydi; hech bir qator ishora qilmay qolgan pack'ni
+        # cleanup_orphaned_media butunligicha o'chiradi
+        if split_archived_name(name)[0] is None:
+            super().delete(name)
+
+
+class ArchiveAwareStorage(ArchiveMixin, FileSystemStorage):
+    """
+    FileSystemStorage that also reads archived pack::member names.
+    """
+
+    def _open_pack(self, pack):
+        return open(super().path(pack), 'rb')
+
+    def path(self, name):
+        if split_archived_name(name)[0] is not None:
+            raise NotImplementedError("Archived files have no standalone filesystem path.")
+        return super().path(name)
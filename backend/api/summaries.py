@@ -0,0 +1,162 @@
+from decimal import Decimal
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+
+from .groups import group_visible
+from .models import User, Assignment, CalendarEvent, StudentSummary
+
+# Student ko'radigan tadbirlar: hamma uchun yoki student roliga
+STUDENT_EVENT_ROLES = ('', 'student')
+DRIFT_FIELDS = ('pending_assignments', 'graded_submissions', 'ungraded_submissions', 'grade_total', 'next_event_id')
+SUMMARY_FIELDS = ('pending_assignments', 'graded_submissions', 'ungraded_submissions', 'grade_total',
+                  'next_event', 'next_event_start', 'valid_until', 'updated_at')
+
+
+class SubqueryCount(Subquery):
+    template = "(SELECT COUNT(*) FROM (%(subquery)s) _count)"
+    output_field = IntegerField()
+
+
+def _annotated_students(now):
+    student = OuterRef('pk')
+    # a'zolik subquery'si topshiriq/tadbir subquery'si ichida, shuning uchun student ikki daraja tashqarida
+    visible = group_visible(OuterRef(student))
+    pending = (
+        Assignment.objects.filter(visible, deadline__gt=now)
+        .exclude(submissions__student=student).order_by('deadline')
+    )
+    next_event = (
+        CalendarEvent.objects.filter(visible, role__in=STUDENT_EVENT_ROLES, start_time__gt=now)
+        .order_by('start_time', 'pk')
+    )
+    # soft delete qilingan topshiriqlarning javoblari reaper o'chirguncha hisobga olinmaydi
+    active = Q(submissions__assignment__deleted_at__isnull=True)
+    return User.objects.filter(role='student').annotate(
+        graded=Count('submissions', filter=active & Q(submissions__grade__isnull=False)),
+        ungraded=Count('submissions', filter=active & Q(submissions__grade__isnull=True)),
+        grade_sum=Sum('submissions__grade', filter=active),
+        pending=SubqueryCount(pending.values('pk')),
+        first_pending_deadline=Subquery(pending.values('deadline')[:1]),
+        next_event_pk=Subquery(next_event.values('pk')[:1]),
+        next_event_start=Subquery(next_event.values('start_time')[:1]),
+    )
+
+
+def _build(student, now):
+    limits = [value for value in (student.first_pending_deadline, student.next_event_start) if value]
+    return StudentSummary(
+        student_id=student.pk,
+        pending_assignments=student.pending,
+        graded_submissions=student.graded,
+        ungraded_submissions=student.ungraded,
+        grade_total=student.grade_sum or Decimal(0),
+        next_event_id=student.next_event_pk,
+        next_event_start=student.next_event_start,
+        valid_until=min(limits) if limits else None,
+        updated_at=now,
+    )
+
+
+def refresh_summary(student_id):
+    """
+    Recomputes one student's summary from the source tables and stores it.
+    """
+    now = timezone.now()
+    student = _annotated_students(now).filter(pk=student_id).first()
+    if student is None:
+        return None
+    summary = _build(student, now)
+    summary.save()
+    return summary
+
+
+def get_summary(user):
+    """
+    Returns the stored summary with a single primary-key lookup, rebuilding it only when
+    it is missing or a deadline/event it depends on has passed.
+    """
+    summary = StudentSummary.objects.select_related('next_event').filter(pk=user.pk).first()
+    if summary is None or (summary.valid_until and summary.valid_until <= timezone.now()):
+        refresh_summary(user.pk)
+        summary = StudentSummary.objects.select_related('next_event').get(pk=user.pk)
+    return summary
+
+
+def reconcile_summaries(batch_size=500):
+    """
+    Recomputes every student's summary in batches and returns how many stored rows had drifted.
+    """
+    now = timezone.now()
+    fixed = 0
+    students = _annotated_students(now).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = [_build(student, now) for student in students.filter(pk__gt=last_pk)[:batch_size]]
+        if not batch:
+            return fixed
+        last_pk = batch[-1].student_id
+        stored = StudentSummary.objects.in_bulk([summary.student_id for summary in batch])
+        for summary in batch:
+            old = stored.get(summary.student_id)
+            if old is None or any(getattr(old, name) != getattr(summary, name) for name in DRIFT_FIELDS):
+                fixed += 1
+        StudentSummary.objects.bulk_create(batch, update_conflicts=True, unique_fields=['student'],
+                                           update_fields=SUMMARY_FIELDS)
+
+
+def apply_submission_delta(student_id, graded=0, ungraded=0, grade=Decimal(0), pending=0):
+    StudentSummary.objects.filter(pk=student_id).update(
+        graded_submissions=F('graded_submissions') + graded,
+        ungraded_submissions=F('ungraded_submissions') + ungraded,
+        grade_total=F('grade_total') + grade,
+        pending_assignments=F('pending_assignments') + pending,
+        updated_at=timezone.now(),
+    )
+
+
+def _targeted(group_id):
+    summaries = StudentSummary.objects.all()
+    if group_id is not None:
+        summaries = summaries.filter(student__group_memberships__group_id=group_id)
+    return summaries
+
+
+def assignment_opened(assignment):
+    # Yangi topshiriq guruhdagi (guruhsiz bo'lsa har bir) student uchun bitta "kutilayotgan" topshiriq qo'shadi
+    deadline = assignment.deadline
+    _targeted(assignment.group_id).update(
+        pending_assignments=F('pending_assignments') + 1,
+        valid_until=Least(Coalesce('valid_until', Value(deadline)), Value(deadline)),
+        updated_at=timezone.now(),
+    )
+
+
+def event_scheduled(event):
+    if event.role not in STUDENT_EVENT_ROLES:
+        return
+    _targeted(event.group_id).filter(
+        Q(next_event_start__isnull=True) | Q(next_event_start__gt=event.start_time)
+    ).update(
+        next_event=event,
+        next_event_start=event.start_time,
+        valid_until=Least(Coalesce('valid_until', Value(event.start_time)), Value(event.start_time)),
+        updated_at=timezone.now(),
+    )
+
+
+def invalidate(**filters):
+    """
+    Marks matching summaries as stale so the next read rebuilds them.
+    """
+    StudentSummary.objects.filter(**filters).update(valid_until=timezone.now())
+
+
+def invalidate_targeted(*group_ids):
+    """
+    Marks summaries of the students the given assignment groups target as stale (None targets everyone).
+    """
+    group_ids = set(group_ids)
+    for group_id in ({None} if None in group_ids else group_ids):
+        _targeted(group_id).update(valid_until=timezone.now())
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def _start_months():
+    return sorted(getattr(settings, 'TERM_START_MONTHS', (2, 9)))
+
+
+def term_for(value):
+    """
+    Returns the term label ("YYYY-MM" of the term start) that contains the given datetime.
+    """
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    year = value.year
+    started = [month for month in _start_months() if month <= value.month]
+    if started:
+        return f"{year}-{started[-1]:02d}"
+    return f"{year - 1}-{_start_months()[-1]:02d}"
+
+
+def term_bounds(term):
+    """
+    Returns aware (start, end) datetimes of a term label; end is exclusive.
+    """
+    year, month = (int(part) for part in term.split('-'))
+    months = _start_months()
+    index = months.index(month)
+    if index + 1 < len(months):
+        end_year, end_month = year, months[index + 1]
+    else:
+        end_year, end_month = year + 1, months[0]
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime(year, month, 1), tz),
+        timezone.make_aware(datetime(end_year, end_month, 1), tz),
+    )
+
+
+def next_term(term):
+    return term_for(term_bounds(term)[1])
+
+
+def previous_term(term):
+    return term_for(term_bounds(term)[0] - timedelta(microseconds=1))
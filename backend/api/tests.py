@@ -1,3 +1,581 @@
-from django.test import TestCase
+import hashlib
+import io
+import logging
+import shutil
+import tempfile
+import time
+import unittest
+import urllib.request
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, connections
+from django.db.utils import load_backend
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import grading_queue, reaper, revocation, routers, summaries, throttling
+from .models import User, Assignment, Book, StudentSummary, Submission, SubmissionPack, StudyGroup, GroupMembership, \
+    RevokedToken
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='lms-tests-')
+
+try:
+    import boto3
+    from moto.server import ThreadedMotoServer
+except ImportError:
+    ThreadedMotoServer = None
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401 - fakeredis Lua skriptlarini shu bilan bajaradi
+except ImportError:
+    fakeredis = None
+else:
+    FAKE_REDIS_SERVER = fakeredis.FakeServer()
+
+    class SharedFakeRedisConnection(fakeredis.FakeRedisConnection):
+        def __init__(self, *args, **kwargs):
+            kwargs['server'] = FAKE_REDIS_SERVER
+            super().__init__(*args, **kwargs)
+
+
+def make_user(username, role='student'):
+    return User.objects.create_user(
+        username=username, password='Parol123!', fullname=username.title(), birthday_date='2000-01-01',
+        gender='erkak', address='Toshkent', temporarily_address='Toshkent', role=role,
+    )
+
+
+def make_assignment(teacher, days=2, **kwargs):
+    return Assignment.objects.create(title='Topshiriq', description='Tavsif', teacher=teacher,
+                                     deadline=timezone.now() + timedelta(days=days), **kwargs)
+
+
+def submit(assignment, student):
+    attempt = Submission.objects.filter(assignment=assignment, student=student).count() + 1
+    return Submission.objects.create(assignment=assignment, student=student, attempt=attempt,
+                                     file=SimpleUploadedFile('javob.txt', b'javob'))
+
+
+# MD5 faqat testlarni tezlashtirish uchun
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THROTTLE_ENABLED=False,
+                   PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LMSTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+class StudentSummaryDeltaTests(LMSTestCase):
+    def setUp(self):
+        self.teacher = make_user('ustoz', role='ustoz')
+        self.student = make_user('student')
+        summaries.refresh_summary(self.student.pk)
+
+    def assertMatchesRefresh(self):
+        stored = StudentSummary.objects.get(pk=self.student.pk)
+        rebuilt = summaries.refresh_summary(self.student.pk)
+        for field in summaries.DRIFT_FIELDS:
+            self.assertEqual(getattr(stored, field), getattr(rebuilt, field), field)
+
+    def test_submission_and_grade_deltas(self):
+        assignment = make_assignment(self.teacher)
+        self.assertMatchesRefresh()
+        first = submit(assignment, self.student)
+        self.assertMatchesRefresh()
+        first.grade = Decimal('77')
+        first.save()
+        self.assertMatchesRefresh()
+        first.grade = Decimal('80.5')
+        first.save()
+        self.assertMatchesRefresh()
+        submit(assignment, self.student)
+        self.assertMatchesRefresh()
+        summary = StudentSummary.objects.get(pk=self.student.pk)
+        self.assertEqual((summary.graded_submissions, summary.ungraded_submissions, summary.grade_total),
+                         (1, 1, Decimal('80.5')))
+
+    def test_group_assignment_only_counts_for_members(self):
+        group = StudyGroup.objects.create(name='10A')
+        make_assignment(self.teacher, group=group)
+        self.assertMatchesRefresh()
+        self.assertEqual(StudentSummary.objects.get(pk=self.student.pk).pending_assignments, 0)
+        GroupMembership.objects.create(group=group, user=self.student)
+        self.assertEqual(summaries.get_summary(self.student).pending_assignments, 1)
+
+    def test_assignment_save_invalidates_only_on_tracked_changes(self):
+        other = make_user('boshqa')
+        group = StudyGroup.objects.create(name='10B')
+        GroupMembership.objects.create(group=group, user=self.student)
+        summaries.refresh_summary(other.pk)
+        assignment = make_assignment(self.teacher, group=group)
+        StudentSummary.objects.update(valid_until=None)
+
+        assignment = Assignment.objects.get(pk=assignment.pk)
+        assignment.title = 'Yangi nom'
+        assignment.save()
+        self.assertFalse(StudentSummary.objects.exclude(valid_until=None).exists())
+
+        assignment.deadline += timedelta(days=1)
+        assignment.save()
+        stale = set(StudentSummary.objects.exclude(valid_until=None).values_list('pk', flat=True))
+        self.assertEqual(stale, {self.student.pk})
+        self.assertMatchesRefresh()
+
+
+class GradingQueueTests(LMSTestCase):
+    def setUp(self):
+        self.teacher = make_user('ustoz', role='ustoz')
+        self.admin = make_user('admin', role='admin')
+        students = [make_user(f'student{index}') for index in range(5)]
+        self.submissions = []
+        for days in (3, 1, 2):
+            assignment = make_assignment(self.teacher, days=days)
+            for student in students:
+                self.submissions.append(submit(assignment, student))
+
+    def test_cursor_pages_cover_the_queue_in_order(self):
+        client = self.client_for(self.teacher)
+        url = reverse('grading-queue')
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 4, 'fields': 'id'}
+            if cursor:
+                params['cursor'] = cursor
+            response = client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.json()['results']]
+            cursor = response.json()['next']
+            if cursor is None:
+                break
+        expected = list(grading_queue.queue_for(self.teacher).values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), len(self.submissions))
+
+    def test_graded_and_superseded_attempts_leave_the_queue(self):
+        graded, superseded = self.submissions[0], self.submissions[1]
+        graded.grade = Decimal('90')
+        graded.save()
+        submit(superseded.assignment, superseded.student)
+        pks = set(grading_queue.queue_for(self.teacher).values_list('pk', flat=True))
+        self.assertNotIn(graded.pk, pks)
+        self.assertNotIn(superseded.pk, pks)
+
+    def test_bad_cursor(self):
+        response = self.client_for(self.teacher).get(reverse('grading-queue'), {'cursor': 'buzilgan'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_conflicting_claims(self):
+        submission = self.submissions[0]
+        url = reverse('submission-claim', kwargs={'submission_id': submission.pk})
+        teacher, admin = self.client_for(self.teacher), self.client_for(self.admin)
+        self.assertEqual(teacher.post(url).status_code, 200)
+        self.assertEqual(admin.post(url).status_code, 409)
+        grade_url = reverse('set-grade', kwargs={'submission_id': submission.pk})
+        self.assertEqual(admin.post(grade_url, {'grade': 70}, format='json').status_code, 409)
+
+        self.assertEqual(teacher.delete(url).status_code, 204)
+        self.assertEqual(admin.post(url).status_code, 200)
+        self.assertEqual(teacher.post(url).status_code, 409)
+
+    def test_expired_claim_can_be_taken(self):
+        submission = self.submissions[0]
+        self.assertTrue(grading_queue.claim(submission.pk, self.admin))
+        Submission.objects.filter(pk=submission.pk).update(claimed_at=timezone.now() - timedelta(days=1))
+        self.assertTrue(grading_queue.claim(submission.pk, self.teacher))
+
+    def test_superseded_attempt_cannot_be_claimed(self):
+        superseded = self.submissions[0]
+        submit(superseded.assignment, superseded.student)
+        self.assertFalse(grading_queue.claim(superseded.pk, self.teacher))
+
+    def test_grade_write_is_conditional_on_the_claim(self):
+        submission = self.submissions[0]
+        self.assertTrue(grading_queue.claim(submission.pk, self.admin))
+        stale = Submission.objects.get(pk=submission.pk)
+        Submission.objects.filter(pk=submission.pk).update(claimed_by=self.teacher, claimed_at=timezone.now())
+        self.assertFalse(grading_queue.lock_for_grading(stale.pk, self.admin))
+        response = self.client_for(self.admin).post(reverse('set-grade', kwargs={'submission_id': submission.pk}),
+                                                     {'grade': 70}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertIsNone(Submission.objects.get(pk=submission.pk).grade)
+
+        response = self.client_for(self.teacher).post(
+            reverse('assignments-grade', kwargs={'submission_id': submission.pk}), {'grade': 85}, format='json')
+        self.assertEqual(response.status_code, 200)
+        graded = Submission.objects.get(pk=submission.pk)
+        self.assertEqual((graded.grade, graded.claimed_by), (Decimal('85'), None))
+
+    def test_claim_next_skips_claimed(self):
+        first = grading_queue.claim_next(self.teacher)
+        second = grading_queue.claim_next(self.admin)
+        self.assertIsNotNone(first)
+        self.assertNotEqual(first, second)
+
+
+class TokenRotationTests(LMSTestCase):
+    def setUp(self):
+        self.user = make_user('student')
+        self.client = APIClient()
+        self.url = reverse('token-refresh')
+
+    def test_refresh_rotates_and_replay_is_rejected(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        response = self.client.post(self.url, {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        rotated = response.json()['refresh']
+        self.assertNotEqual(rotated, refresh)
+
+        self.assertEqual(self.client.post(self.url, {'refresh': refresh}, format='json').status_code, 401)
+        self.assertEqual(self.client.post(self.url, {'refresh': rotated}, format='json').status_code, 200)
+
+    def test_logged_out_token_is_rejected(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        client = self.client_for(self.user)
+        self.assertEqual(client.post(reverse('logout'), {'refresh': refresh}, format='json').status_code, 205)
+        self.assertEqual(self.client.post(self.url, {'refresh': refresh}, format='json').status_code, 401)
+
+    @override_settings(REVOCATION_FILTER_CAPACITY=100, REVOCATION_SYNC_SECONDS=0)
+    def test_filter_over_capacity_is_rebuilt_once(self):
+        expires_at = timezone.now() + timedelta(days=1)
+        RevokedToken.objects.bulk_create(RevokedToken(jti=f'jti-{index}', expires_at=expires_at) for index in range(150))
+        revocation_list = revocation.RevocationList()
+        with mock.patch.object(revocation_list, 'rebuild', wraps=revocation_list.rebuild) as rebuild:
+            for _ in range(5):
+                self.assertTrue(revocation_list.might_contain('jti-149'))
+        self.assertEqual(rebuild.call_count, 1)
+        self.assertEqual(revocation_list._filter.capacity, 300)
+
+
+class SoftDeleteTests(LMSTestCase):
+    def setUp(self):
+        self.teacher = make_user('ustoz', role='ustoz')
+        self.assignment = make_assignment(self.teacher)
+        self.submission = submit(self.assignment, make_user('student'))
+        self.client = self.client_for(self.teacher)
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_deleted_assignment_cannot_be_graded_and_is_reaped(self):
+        name = self.submission.file.name
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.delete(reverse('assignments-delete', kwargs={'pk': self.assignment.pk}))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(reverse('assignments-detail', kwargs={'pk': self.assignment.pk})).status_code, 404)
+        for url_name in ('assignments-grade', 'set-grade'):
+            url = reverse(url_name, kwargs={'submission_id': self.submission.pk})
+            self.assertEqual(self.client.post(url, {'grade': 90}, format='json').status_code, 404)
+        self.assertFalse(grading_queue.queue_for(self.teacher).exists())
+        self.assertIsNone(Submission.objects.get(pk=self.submission.pk).grade)
+
+        # Reaper on_commit'da ishga tushadi; fayllar esa o'chirish tranzaksiyasi commit bo'lgach o'chadi
+        with self.captureOnCommitCallbacks(execute=True):
+            for callback in callbacks:
+                callback()
+        self.assertFalse(Submission.objects.filter(pk=self.submission.pk).exists())
+        self.assertFalse(Assignment.all_objects.filter(pk=self.assignment.pk).exists())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_cleanup_deletes_packs_left_without_rows(self):
+        Submission.objects.filter(pk=self.submission.pk).update(submitted_at=timezone.now() - timedelta(days=200))
+        call_command('archive_submissions', days=180, stdout=io.StringIO())
+        pack = SubmissionPack.objects.get()
+        self.assertTrue(Submission.objects.get(pk=self.submission.pk).file.name.startswith(f"{pack.name}::"))
+
+        call_command('cleanup_orphaned_media', min_age_hours=0, stdout=io.StringIO())
+        self.assertTrue(default_storage.exists(pack.name))
+
+        reaper.soft_delete(self.assignment)
+        reaper.reap_deleted()
+        call_command('cleanup_orphaned_media', min_age_hours=0, stdout=io.StringIO())
+        self.assertFalse(default_storage.exists(pack.name))
+        self.assertFalse(SubmissionPack.objects.exists())
+        archive = pack.archive
+        archive.refresh_from_db()
+        self.assertEqual((archive.file_count, archive.original_size, archive.packed_size), (0, 0, 0))
+
+    def test_reaper_leaves_live_assignments(self):
+        self.assertEqual(reaper.reap_deleted(), {'submissions': 0, 'assignments': 0, 'books': 0})
+        self.assertTrue(Submission.objects.filter(pk=self.submission.pk).exists())
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_BUCKETS={'default': (2, 60)})
+class ThrottleTests(LMSTestCase):
+    def setUp(self):
+        self.user = make_user('student')
+        patcher = mock.patch.object(throttling, 'local_buckets', throttling.LocalBuckets())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(THROTTLE_CACHE=None)
+    def test_without_redis_buckets_are_in_process(self):
+        client = self.client_for(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            statuses = [client.get(reverse('profile-get')).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        self.assertFalse([query for query in queries.captured_queries if 'django_cache' in query['sql']])
+
+    @unittest.skipIf(fakeredis is None, "fakeredis va lupa o'rnatilmagan")
+    def test_redis_bucket_is_one_key_with_refreshed_ttl(self):
+        redis_cache = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://throttle-test:6379/0',
+            'OPTIONS': {'connection_class': SharedFakeRedisConnection},
+        }
+        with override_settings(CACHES={**settings.CACHES, 'throttle': redis_cache}, THROTTLE_CACHE='throttle'):
+            cache = caches['throttle']
+            cache.clear()
+            self.assertEqual([throttling.consume('bucket', 3, 1.0) > 0 for _ in range(4)],
+                             [False, False, False, True])
+            client = cache._cache.get_client(write=True)
+            self.assertEqual(client.keys('*'), [cache.make_and_validate_key('bucket').encode()])
+            self.assertEqual(client.ttl(cache.make_and_validate_key('bucket')), 4)
+            time.sleep(1.05)
+            self.assertEqual(throttling.consume('bucket', 3, 1.0), 0)
+            self.assertGreater(throttling.consume('bucket', 3, 1.0), 0)
+
+
+class BatchTests(LMSTestCase):
+    def setUp(self):
+        self.student = make_user('student')
+        group = StudyGroup.objects.create(name='10A')
+        GroupMembership.objects.create(group=group, user=self.student)
+        make_assignment(make_user('ustoz', role='ustoz'), group=group)
+        self.client = self.client_for(self.student)
+
+    def batch(self, *paths):
+        response = self.client.post(reverse('batch'), {'requests': [{'path': path} for path in paths]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [item['status'] for item in response.json()['responses']]
+
+    def test_only_api_routes_are_reachable(self):
+        statuses = self.batch('/admin/', '/docs/', '/api/schema/', '/media/yoq.pdf', '/user/profile')
+        self.assertEqual(statuses, [404, 404, 404, 404, 200])
+
+    def test_failing_item_does_not_fail_the_batch(self):
+        with mock.patch('api.views.get_summary', side_effect=RuntimeError), self.assertLogs('api.batch', 'ERROR'):
+            statuses = self.batch('/dashboard/summary/', '/assignments/', '/assignments/999/')
+        self.assertEqual(statuses, [500, 200, 404])
+
+    def test_group_ids_are_shared_between_items(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.batch('/assignments/', '/calendar/')
+        membership = [query for query in queries.captured_queries if 'api_groupmembership' in query['sql']]
+        self.assertEqual(len(membership), 1)
+
+
+class UploadValidationTests(LMSTestCase):
+    def setUp(self):
+        self.assignment = make_assignment(make_user('ustoz', role='ustoz'))
+        self.client = self.client_for(make_user('student'))
+        self.url = reverse('assignments-submit', kwargs={'assignment_id': self.assignment.pk})
+
+    def post_file(self, name, body):
+        return self.client.post(self.url, {'file': SimpleUploadedFile(name, body)}, format='multipart')
+
+    def test_accepted_upload_carries_its_hash(self):
+        response = self.post_file('javob.pdf', b'%PDF-1.4\n' + b'x' * 1000)
+        self.assertEqual(response.status_code, 201)
+        submission = Submission.objects.get()
+        self.assertEqual(submission.content_hash, hashlib.sha256(b'%PDF-1.4\n' + b'x' * 1000).hexdigest())
+
+    def test_type_not_matching_magic_or_extension_is_refused(self):
+        # kengaytma pdf, ichi matn / ruxsat etilmagan kengaytma
+        self.assertEqual(self.post_file('javob.pdf', b'oddiy matn').status_code, 415)
+        self.assertEqual(self.post_file('javob.exe', b'MZ' + b'\0' * 100).status_code, 415)
+        self.assertFalse(Submission.objects.exists())
+
+    @override_settings(UPLOAD_LIMITS={'assignments-submit': {'max_size': 1024, 'types': ('text',)}})
+    def test_oversized_upload_is_refused(self):
+        # Content-Length chegarada (MULTIPART_OVERHEAD ichida): oqim max_size dan oshganda to'xtatiladi
+        self.assertEqual(self.post_file('javob.txt', b'x' * 2048).status_code, 413)
+        # Content-Length o'zi katta: tana o'qilmasdan rad etiladi
+        self.assertEqual(self.post_file('javob.txt', b'x' * (200 * 1024)).status_code, 413)
+        self.assertFalse(Submission.objects.exists())
+
+
+@override_settings(REPLICA_DATABASES=['replica'], THROTTLE_ENABLED=False,
+                   PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ReplicaRoutingTests(TransactionTestCase):
+    # 'replica' - test bazasiga ikkinchi ulanish (DB_REPLICA_HOSTS'dagi TEST MIRROR kabi); qaysi alias so'rovni
+    # bajargani har bir ulanishning o'z so'rovlaridan ko'rinadi. Alias DATABASES'da yo'q, shuning uchun test
+    # runner uni alohida baza sifatida yaratmaydi. Yozuvlar boshqa ulanishga ko'rinishi uchun commit bo'lishi kerak
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        settings_dict = connections['default'].settings_dict
+        connections['replica'] = load_backend(settings_dict['ENGINE']).DatabaseWrapper({**settings_dict}, 'replica')
+
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        super().tearDownClass()
+
+    def setUp(self):
+        self.student = make_user('student')
+        make_assignment(make_user('ustoz', role='ustoz'))
+        caches[settings.REPLICA_PIN_CACHE].delete(routers.PIN_KEY.format(self.student.pk))
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def request(self, method, name, data=None):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(reverse(name), data, format='json')
+        self.assertLess(response.status_code, 400)
+        # Pin keshi (django_cache) doim primary'da - faqat ilova jadvallari sanaladi
+        return ([query['sql'] for query in primary if 'api_' in query['sql']],
+                [query['sql'] for query in replica if 'api_' in query['sql']])
+
+    def test_reads_go_to_replica_and_writes_pin_to_primary(self):
+        primary, replica = self.request('get', 'assignments-list')
+        self.assertEqual(primary, [])
+        self.assertTrue(replica)
+
+        primary, replica = self.request('patch', 'profile-update-field', {'address': 'Samarqand'})
+        self.assertTrue(any(sql.startswith('UPDATE') for sql in primary))
+        self.assertEqual(replica, [])
+
+        # Yozuvdan keyin REPLICA_PIN_SECONDS davomida o'qishlar primary'da
+        primary, replica = self.request('get', 'assignments-list')
+        self.assertTrue(primary)
+        self.assertEqual(replica, [])
+
+        caches[settings.REPLICA_PIN_CACHE].delete(routers.PIN_KEY.format(self.student.pk))
+        primary, replica = self.request('get', 'assignments-list')
+        self.assertEqual(primary, [])
+        self.assertTrue(replica)
+
+
+@unittest.skipIf(ThreadedMotoServer is None, "moto o'rnatilmagan")
+class DirectUploadS3Tests(LMSTestCase):
+    # moto server - MinIO kabi alohida HTTP ombor: presigned PUT haqiqiy so'rov bilan yuboriladi
+    @classmethod
+    def setUpClass(cls):
+        werkzeug_logger = logging.getLogger('werkzeug')
+        cls.addClassCleanup(werkzeug_logger.setLevel, werkzeug_logger.level)
+        werkzeug_logger.setLevel(logging.ERROR)
+        server = ThreadedMotoServer(ip_address='127.0.0.1', port=0, verbose=False)
+        server.start()
+        cls.addClassCleanup(server.stop)
+        endpoint = 'http://%s:%s' % server.get_host_and_port()
+        credentials = {'aws_access_key_id': 'test', 'aws_secret_access_key': 'test', 'region_name': 'us-east-1'}
+        cls.s3 = boto3.client('s3', endpoint_url=endpoint, **credentials)
+        cls.s3.create_bucket(Bucket='lms')
+        cls.enterClassContext(override_settings(DIRECT_UPLOADS=True, STORAGES={
+            **settings.STORAGES,
+            'default': {'BACKEND': 'api.s3_storage.ArchiveAwareS3Storage', 'OPTIONS': {
+                'bucket_name': 'lms', 'endpoint_url': endpoint, 'access_key': 'test', 'secret_key': 'test',
+                'region_name': 'us-east-1', 'signature_version': 's3v4', 'addressing_style': 'path',
+                'file_overwrite': False,
+            }},
+        }))
+        super().setUpClass()
+
+    def setUp(self):
+        self.teacher = make_user('ustoz', role='ustoz')
+        self.client = self.client_for(self.teacher)
+
+    def presign(self, body, filename='kitob.pdf'):
+        response = self.client.post(reverse('uploads-direct'), {
+            'target': 'book', 'filename': filename, 'size': len(body), 'sha256': hashlib.sha256(body).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def put(self, ticket, body, signed_headers=True):
+        headers = {'Content-Type': 'application/octet-stream', **(ticket['headers'] if signed_headers else {})}
+        urllib.request.urlopen(urllib.request.Request(ticket['url'], data=body, headers=headers, method='PUT')).close()
+        return ticket['url'].split('/lms/', 1)[1].split('?', 1)[0]
+
+    def finalize(self, ticket):
+        return self.client.post(reverse('uploads-direct-finalize'),
+                                {'token': ticket['token'], 'title': 'Kitob', 'subject': 'Fizika'}, format='json')
+
+    def assertDeleted(self, key):
+        self.assertEqual(self.s3.list_objects_v2(Bucket='lms', Prefix=urllib.request.unquote(key))['KeyCount'], 0)
+
+    @override_settings(DIRECT_UPLOAD_REQUIRE_CHECKSUM=False)
+    def test_presign_put_finalize_and_replay(self):
+        body = b'%PDF-1.4\n' + b'x' * 1000
+        ticket = self.presign(body)
+        self.assertEqual(self.finalize(ticket).status_code, 409)
+        self.put(ticket, body)
+        response = self.finalize(ticket)
+        self.assertEqual(response.status_code, 201)
+        with Book.objects.get(pk=response.json()['id']).file.open() as fh:
+            self.assertEqual(fh.read(), body)
+        self.assertEqual(self.finalize(ticket).status_code, 409)
+
+    @override_settings(DIRECT_UPLOAD_REQUIRE_CHECKSUM=False)
+    def test_wrong_size_or_type_is_rejected_and_deleted(self):
+        ticket = self.presign(b'%PDF-1.4\n' + b'x' * 1000)
+        key = self.put(ticket, b'%PDF-1.4\n', signed_headers=False)
+        self.assertEqual(self.finalize(ticket).status_code, 400)
+        self.assertDeleted(key)
+
+        body = b'MZ' + b'\0' * 100
+        ticket = self.presign(body)
+        key = self.put(ticket, body)
+        self.assertEqual(self.finalize(ticket).status_code, 415)
+        self.assertDeleted(key)
+
+    def test_unverified_checksum_is_rejected_and_deleted(self):
+        # moto x-amz-checksum-sha256 ni saqlamaydi: DIRECT_UPLOAD_REQUIRE_CHECKSUM bilan bunday obyekt qabul qilinmaydi
+        body = b'%PDF-1.4\n' + b'x' * 1000
+        ticket = self.presign(body)
+        key = self.put(ticket, body)
+        self.assertEqual(self.finalize(ticket).status_code, 400)
+        self.assertDeleted(key)
+
+    def test_oversized_or_unknown_type_is_refused_before_upload(self):
+        response = self.client.post(reverse('uploads-direct'), {
+            'target': 'book', 'filename': 'kitob.pdf', 'size': 10 ** 10, 'sha256': '0' * 64}, format='json')
+        self.assertEqual(response.status_code, 413)
+        response = self.client.post(reverse('uploads-direct'), {
+            'target': 'book', 'filename': 'kitob.exe', 'size': 10, 'sha256': '0' * 64}, format='json')
+        self.assertEqual(response.status_code, 415)
+
+    def test_archived_names_are_read_from_packs_in_the_bucket(self):
+        pack = io.BytesIO()
+        with zipfile.ZipFile(pack, 'w') as archive:
+            archive.writestr('submissions/javob.txt', b'arxivdagi javob')
+        self.s3.put_object(Bucket='lms', Key='archives/submissions-2025-09-1.zip', Body=pack.getvalue())
+        name = 'archives/submissions-2025-09-1.zip::submissions/javob.txt'
+        self.assertTrue(default_storage.exists(name))
+        self.assertFalse(default_storage.exists('archives/submissions-2025-09-1.zip::submissions/yoq.txt'))
+        self.assertFalse(default_storage.exists('archives/yoq.zip::submissions/javob.txt'))
+        self.assertEqual(default_storage.size(name), len(b'arxivdagi javob'))
+        with default_storage.open(name) as fh:
+            self.assertEqual(fh.read(), b'arxivdagi javob')
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, SLOW_REQUEST_SECONDS=0, METRICS_TOKEN='metrika')
+class RequestMetricsTests(LMSTestCase):
+    def test_unknown_methods_share_one_label(self):
+        client = self.client_for(make_user('student'))
+        client.generic('FOOBAR', reverse('profile-get'))
+        client.get(reverse('profile-get'))
+        self.assertEqual(client.get(reverse('metrics')).status_code, 403)
+        body = client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer metrika').content.decode()
+        self.assertIn('lms_request_view_cpu_seconds_count{view="profile-get",method="GET",status="200"}', body)
+        self.assertIn('method="other"', body)
+        self.assertNotIn('FOOBAR', body)
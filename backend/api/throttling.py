@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBuckets:
+    """
+    In-process token buckets, used without Redis or when it is unavailable.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def consume(self, key, capacity, rate, now):
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / rate
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > settings.THROTTLE_LOCAL_MAX_KEYS:
+                self._buckets.clear()
+            return 0.0
+
+
+class RedisBuckets:
+    """
+    Token buckets in the shared Redis cache (THROTTLE_CACHE). One Lua script refills the bucket,
+    takes a token and refreshes its TTL atomically, so each request costs a single round trip
+    and concurrent workers never race on a read-then-write.
+    """
+    SCRIPT = """
+local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens, updated = tonumber(bucket[1]), tonumber(bucket[2])
+if tokens == nil or updated == nil then
+    tokens, updated = capacity, now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local delay = 0
+if tokens < 1 then
+    delay = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(delay)
+"""
+
+    def __init__(self):
+        self._script = None
+
+    def consume(self, key, capacity, rate, now):
+        cache = caches[settings.THROTTLE_CACHE]
+        key = cache.make_and_validate_key(key)
+        client = cache._cache.get_client(key, write=True)
+        if self._script is None:
+            # EVALSHA, skript serverda bo'lmasa bir marta EVAL
+            self._script = client.register_script(self.SCRIPT)
+        return float(self._script(keys=[key], args=[capacity, rate, repr(now)], client=client))
+
+
+local_buckets = LocalBuckets()
+redis_buckets = RedisBuckets()
+
+
+def consume(key, capacity, rate):
+    """
+    Takes one token from the bucket and returns 0 when allowed, otherwise the seconds
+    until a token is available. Uses in-process buckets when THROTTLE_CACHE is not set
+    or the cache fails.
+    """
+    now = time.time()
+    if settings.THROTTLE_CACHE:
+        try:
+            return redis_buckets.consume(key, capacity, rate, now)
+        except Exception:
+            logger.warning("Throttle cache unavailable, using in-process buckets", exc_info=True)
+    return local_buckets.consume(key, capacity, rate, now)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Per user (or per IP when anonymous) and per URL name token bucket. The budget comes from
+    THROTTLE_SCOPES[url_name] (default scope otherwise) looked up in THROTTLE_BUCKETS.
+    """
+
+    def __init__(self):
+        self.delay = 0.0
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        match = request.resolver_match
+        url_name = match.url_name if match else view.__class__.__name__
+        scope = settings.THROTTLE_SCOPES.get(url_name, 'default')
+        capacity, per_seconds = settings.THROTTLE_BUCKETS[scope]
+        user = request.user
+        ident = f"u{user.pk}" if user and user.is_authenticated else f"ip{self.get_ident(request)}"
+        self.delay = consume(f"throttle:{scope}:{url_name}:{ident}", capacity, capacity / per_seconds)
+        return self.delay == 0
+
+    def wait(self):
+        return self.delay
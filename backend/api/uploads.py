@@ -0,0 +1,106 @@
+import codecs
+import hashlib
+import os
+import re
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from rest_framework import status
+from rest_framework.exceptions import APIException, UnsupportedMediaType
+
+# tur -> (boshidagi magic baytlar, shu turga mos kengaytmalar); text uchun magic yo'q - UTF-8 va NUL baytsiz
+FILE_TYPES = {
+    'pdf': (re.compile(rb'%PDF-'), ('.pdf',)),
+    'image': (re.compile(rb'\x89PNG\r\n\x1a\n|\xff\xd8\xff|GIF8[79]a|RIFF.{4}WEBP', re.S),
+              ('.png', '.jpg', '.jpeg', '.gif', '.webp')),
+    # docx/xlsx/pptx/od* - zip, eski doc/xls/ppt - OLE
+    'office': (re.compile(rb'PK\x03\x04|\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),
+               ('.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.doc', '.xls', '.ppt')),
+    'archive': (re.compile(rb'PK\x03\x04|PK\x05\x06|Rar!\x1a\x07|7z\xbc\xaf\x27\x1c|\x1f\x8b'),
+                ('.zip', '.rar', '.7z', '.gz')),
+    'text': (None, ('.txt', '.md', '.csv', '.json', '.py', '.java', '.c', '.cpp', '.sql')),
+}
+# multipart maydonlari va chegaralar uchun Content-Length fayl hajmidan biroz katta bo'ladi
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class RequestEntityTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Fayl hajmi ruxsat etilganidan katta."
+    default_code = 'file_too_large'
+
+
+def _is_text(head):
+    if b'\x00' in head:
+        return False
+    try:
+        # birinchi bo'lak ko'p baytli belgi o'rtasida tugashi mumkin
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def sniff(head, file_name, kinds):
+    """
+    Returns the type among kinds that both the first bytes and the file extension match, or None.
+    """
+    extension = os.path.splitext(file_name or '')[1].lower()
+    for kind in kinds:
+        magic, extensions = FILE_TYPES[kind]
+        if extension in extensions and (magic.match(head) if magic else _is_text(head)):
+            return kind
+    return None
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """
+    First in FILE_UPLOAD_HANDLERS. Checks uploads of the routes in UPLOAD_LIMITS while the body
+    streams in: a Content-Length over the limit is refused before reading, the type is sniffed from
+    the first chunk and the stream is aborted once a file grows past max_size. Every uploaded file
+    gets a sha256 content_hash computed in the same pass, so nothing re-reads it to hash.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        match = getattr(request, 'resolver_match', None)
+        self.limits = settings.UPLOAD_LIMITS.get(match.url_name) if match else None
+        self.digest = None
+        self.size = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if self.limits and content_length and content_length > self.limits['max_size'] + MULTIPART_OVERHEAD:
+            raise RequestEntityTooLarge(self._too_large())
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.limits:
+            if start == 0 and sniff(raw_data, self.file_name, self.limits['types']) is None:
+                raise UnsupportedMediaType(
+                    self.content_type,
+                    detail=f"Fayl turi ruxsat etilmagan yoki kengaytmasiga mos emas. "
+                           f"Ruxsat etilgan turlar: {', '.join(self.limits['types'])}",
+                )
+            self.size += len(raw_data)
+            if self.size > self.limits['max_size']:
+                raise RequestEntityTooLarge(self._too_large())
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Faylni keyingi handler'lar (xotira yoki vaqtinchalik fayl) yaratadi, hash unga biriktiriladi
+        handlers = self.request.upload_handlers
+        for handler in handlers[handlers.index(self) + 1:]:
+            file = handler.file_complete(file_size)
+            if file:
+                file.content_hash = self.digest.hexdigest()
+                return file
+        return None
+
+    def _too_large(self):
+        return f"Fayl hajmi {filesizeformat(self.limits['max_size'])} dan oshmasligi kerak."
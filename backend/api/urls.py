@@ -2,6 +2,10 @@ from django.urls import path
 from .views import (
     RegisterAPIView,
     LoginAPIView,
+    TokenRefreshAPIView,
+    LogoutAPIView,
+    UserImportAPIView,
+    UserSearchAPIView,
     ProfileDetailsAPIView,
     ProfileUpdateAPIView,
     ProfileUpdateFieldAPIView,
@@ -11,24 +15,41 @@ from .views import (
     AssignmentUpdateAPIView,
     AssignmentDeleteAPIView,
     AssignmentSubmissionAPIView,
+    AssignmentMissingSubmittersAPIView,
+    AssignmentSubmissionsZipAPIView,
     AssignmentGradeAPIView,
     BookListAPIView,
     BookCreateAPIView,
+    DirectUploadAPIView,
+    DirectUploadFinalizeAPIView,
     BookDetailAPIView,
     BookDeleteAPIView,
     MyGradesAPIView,
     TeacherGradesAPIView,
     GradeSetAPIView,
     AllGradesAPIView,
+    GradeReportAPIView,
+    GradingQueueAPIView,
+    GradingQueueNextAPIView,
+    SubmissionClaimAPIView,
+    DashboardSummaryAPIView,
     CalendarEventListAPIView,
     CalendarEventCreateAPIView,
     CalendarEventDetailAPIView,
     CalendarEventDeleteAPIView,
+    AuditLogAPIView,
+    ArchivedFileAPIView,
+    MetricsAPIView,
+    BatchAPIView,
 )
 
 urlpatterns = [
     path('register', RegisterAPIView.as_view(), name='register'),
     path('login', LoginAPIView.as_view(), name='login'),
+    path('token/refresh', TokenRefreshAPIView.as_view(), name='token-refresh'),
+    path('logout', LogoutAPIView.as_view(), name='logout'),
+    path('users/import/', UserImportAPIView.as_view(), name='users-import'),
+    path('users/search/', UserSearchAPIView.as_view(), name='users-search'),
     path('user/profile', ProfileDetailsAPIView.as_view(), name='profile-get'),
     path('user/profile/update', ProfileUpdateAPIView.as_view(), name='profile-update'),
     path('user/profile/update/v2', ProfileUpdateFieldAPIView.as_view(), name='profile-update-field'),
@@ -38,18 +59,32 @@ urlpatterns = [
     path('assignments/<int:pk>/update/', AssignmentUpdateAPIView.as_view(), name='assignments-update'),
     path('assignments/<int:pk>/delete/', AssignmentDeleteAPIView.as_view(), name='assignments-delete'),
     path('assignments/<int:assignment_id>/submit/', AssignmentSubmissionAPIView.as_view(), name='assignments-submit'),
+    path('assignments/<int:pk>/missing/', AssignmentMissingSubmittersAPIView.as_view(), name='assignments-missing'),
+    path('assignments/<int:pk>/submissions/zip/', AssignmentSubmissionsZipAPIView.as_view(),
+         name='assignments-submissions-zip'),
     path('submissions/<int:submission_id>/grade/', AssignmentGradeAPIView.as_view(), name='assignments-grade'),
     path('books/', BookListAPIView.as_view(), name='books-list'),
     path('books/create/', BookCreateAPIView.as_view(), name='books-create'),
     path('books/<int:pk>/', BookDetailAPIView.as_view(), name='books-detail'),
+    path('uploads/direct/', DirectUploadAPIView.as_view(), name='uploads-direct'),
+    path('uploads/direct/finalize/', DirectUploadFinalizeAPIView.as_view(), name='uploads-direct-finalize'),
     path('books/<int:pk>/delete/', BookDeleteAPIView.as_view(), name='books-delete'),
     path('grades/my/', MyGradesAPIView.as_view(), name='my-grades'),
     path('grades/teacher/', TeacherGradesAPIView.as_view(), name='teacher-grades'),
     path('grades/all/', AllGradesAPIView.as_view(), name='all-grades'),
+    path('reports/grades/', GradeReportAPIView.as_view(), name='reports-grades'),
     path('grades/<int:submission_id>/set/', GradeSetAPIView.as_view(), name='set-grade'),
+    path('grades/queue/', GradingQueueAPIView.as_view(), name='grading-queue'),
+    path('grades/queue/next/', GradingQueueNextAPIView.as_view(), name='grading-queue-next'),
+    path('submissions/<int:submission_id>/claim/', SubmissionClaimAPIView.as_view(), name='submission-claim'),
+    path('dashboard/summary/', DashboardSummaryAPIView.as_view(), name='dashboard-summary'),
     path('calendar/', CalendarEventListAPIView.as_view(), name='calendar-list'),
     path('calendar/create/', CalendarEventCreateAPIView.as_view(), name='calendar-create'),
     path('calendar/<int:pk>/', CalendarEventDetailAPIView.as_view(), name='calendar-detail'),
     path('calendar/<int:pk>/delete/', CalendarEventDeleteAPIView.as_view(), name='calendar-delete'),
+    path('audit/', AuditLogAPIView.as_view(), name='audit-log'),
+    path('batch/', BatchAPIView.as_view(), name='batch'),
+    path('metrics', MetricsAPIView.as_view(), name='metrics'),
+    path('archives/<path:name>', ArchivedFileAPIView.as_view(), name='archived-file'),
 
 ]
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+from django.db import IntegrityError, transaction
+
+from .models import User
+from .password_hashing import hash_passwords
+from .serializers import UserImportRowSerializer
+
+DUPLICATE_USERNAME = "Bu username bilan foydalanuvchi allaqachon mavjud."
+
+
+def parse_rows(content, fmt):
+    """
+    Parses uploaded CSV or JSON (list of objects) into a list of dicts.
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if fmt == 'json':
+        rows = json.loads(content)
+        if not isinstance(rows, list):
+            raise ValueError("JSON must be a list of user objects.")
+        return rows
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(content)))
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def import_users(rows, batch_size=1000, workers=None):
+    """
+    Validates rows in one pass, rejects duplicate usernames with a single IN query,
+    hashes passwords in a process pool and inserts users with bulk_create. Usernames taken by
+    a concurrent registration meanwhile are reported as row errors and the rest is inserted.
+    Returns {"created": int, "errors": [{"row": n, "errors": {...}}]}.
+    """
+    errors, valid = [], []
+    seen = set()
+    for index, row in enumerate(rows, start=1):
+        serializer = UserImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            errors.append({'row': index, 'errors': serializer.errors})
+            continue
+        username = serializer.validated_data['username']
+        if username in seen:
+            errors.append({'row': index, 'errors': {'username': ["Fayl ichida takrorlangan username."]}})
+            continue
+        seen.add(username)
+        valid.append((index, serializer.validated_data))
+
+    valid = _without_existing(valid, lambda data: data['username'], errors)
+    hashed = hash_passwords([data.pop('password') for _, data in valid], workers=workers)
+    users = [(index, User(password=password, **data)) for (index, data), password in zip(valid, hashed)]
+    while users:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([user for _, user in users], batch_size=batch_size)
+            break
+        except IntegrityError:
+            # Tekshiruvdan keyin parallel ro'yxatdan o'tgan username'lar: ularni xato deb, qolganini qayta yozamiz
+            remaining = _without_existing(users, lambda user: user.username, errors)
+            if len(remaining) == len(users):
+                raise
+            users = remaining
+            # Bekor qilingan tranzaksiyada oldingi batch'lar olgan id'lar
+            for _, user in users:
+                user.pk = None
+
+    errors.sort(key=lambda error: error['row'])
+    return {'created': len(users), 'errors': errors}
+
+
+def _without_existing(rows, username, errors):
+    # rows: (qator raqami, obyekt); bazada bor username'li qatorlar errors'ga qo'shiladi
+    existing = set(User.objects.filter(username__in=[username(row) for _, row in rows])
+                   .values_list('username', flat=True))
+    for index, row in rows:
+        if username(row) in existing:
+            errors.append({'row': index, 'errors': {'username': [DUPLICATE_USERNAME]}})
+    return [(index, row) for index, row in rows if username(row) not in existing]
@@ -0,0 +1,220 @@
+import math
+import re
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Greatest
+
+from .models import User
+from .tasks import submit
+
+# pg_trgm kabi: harf/raqamdan boshqa hamma belgi so'zlarni ajratadi
+_WORD = re.compile(r'[^\W_]+')
+# pg_trgm.word_similarity_threshold standart qiymati
+WORD_SIMILARITY_THRESHOLD = 0.6
+RESULT_FIELDS = ('id', 'fullname', 'username', 'role', 'score')
+
+
+def trigrams(text, prefix=False):
+    """
+    pg_trgm-style trigrams of the lowercased words, padded with two spaces in front and one
+    behind. With prefix=True the last word may be unfinished, so its closing trigram is left out.
+    """
+    words = _WORD.findall(text.lower())
+    grams = set()
+    for index, word in enumerate(words):
+        padded = f"  {word} "
+        if prefix and index == len(words) - 1:
+            padded = padded[:-1]
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _bitset(ranks, size):
+    buffer = bytearray((size + 7) // 8)
+    for rank in ranks:
+        buffer[rank >> 3] |= 1 << (rank & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class NgramIndex:
+    """
+    In-process trigram index over User.fullname and username, used where pg_trgm is not
+    available. A user's score is the share of the query's trigrams found in their name, like
+    pg_trgm's word_similarity.
+
+    Users get a rank in fullname order and every trigram maps to the set of ranks containing it:
+    a bitset (int) for common trigrams, an array of ranks for rare ones. Matching trigrams are
+    counted for all users at once with a bit-sliced adder over the bitsets, and equal scores come
+    out in fullname order by taking the lowest set bits. Saved and deleted users are applied
+    through signals (new users rank last until the next rebuild), and the index is rebuilt in the
+    background every USER_SEARCH_INDEX_SECONDS to pick up bulk writes and other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = None
+        self._users = {}
+        self._ranks = {}
+        self._pks = []
+        self._roles = {}
+        self._built = 0.0
+        self._rebuilding = False
+
+    @property
+    def is_built(self):
+        return self._postings is not None
+
+    def rebuild(self):
+        rows = list(User.objects.order_by('fullname', 'pk').values_list('pk', 'fullname', 'username', 'role'))
+        size = len(rows)
+        postings, roles = defaultdict(lambda: array('l')), defaultdict(lambda: array('l'))
+        for rank, (pk, fullname, username, role) in enumerate(rows):
+            roles[role].append(rank)
+            for gram in trigrams(f"{fullname} {username}"):
+                postings[gram].append(rank)
+        # Zich trigramlar bitset (size/8 bayt), siyraklari ro'yxat: xotira har doim massivdagidan ko'pi bilan 2 barobar
+        dense = size // 64
+        postings = {gram: _bitset(ranks, size) if len(ranks) >= dense else ranks for gram, ranks in postings.items()}
+        with self._lock:
+            self._postings = postings
+            self._roles = {role: _bitset(ranks, size) for role, ranks in roles.items()}
+            self._users = {pk: (fullname, username, role) for pk, fullname, username, role in rows}
+            self._pks = [row[0] for row in rows]
+            self._ranks = {pk: rank for rank, pk in enumerate(self._pks)}
+            self._built, self._rebuilding = time.monotonic(), False
+
+    def _ensure_fresh(self):
+        if self._postings is None:
+            self.rebuild()
+            return
+        if time.monotonic() - self._built < settings.USER_SEARCH_INDEX_SECONDS:
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        submit(self.rebuild)
+
+    def _bits(self, gram):
+        posting = self._postings.get(gram, 0)
+        return posting if isinstance(posting, int) else _bitset(posting, len(self._pks))
+
+    def _toggle(self, rank, entry, present):
+        fullname, username, role = entry
+        bit = 1 << rank
+        for gram in trigrams(f"{fullname} {username}"):
+            posting = self._postings.get(gram)
+            if isinstance(posting, int):
+                self._postings[gram] = posting | bit if present else posting & ~bit
+            elif present:
+                self._postings.setdefault(gram, array('l')).append(rank)
+            elif posting is not None and rank in posting:
+                posting.remove(rank)
+        mask = self._roles.get(role, 0)
+        self._roles[role] = mask | bit if present else mask & ~bit
+
+    def update(self, user):
+        if not self.is_built:
+            return
+        entry = (user.fullname, user.username, user.role)
+        with self._lock:
+            rank = self._ranks.get(user.pk)
+            if rank is None:
+                rank = self._ranks[user.pk] = len(self._pks)
+                self._pks.append(user.pk)
+            elif user.pk in self._users:
+                self._toggle(rank, self._users[user.pk], False)
+            self._users[user.pk] = entry
+            self._toggle(rank, entry, True)
+
+    def remove(self, pk):
+        if not self.is_built:
+            return
+        with self._lock:
+            entry = self._users.pop(pk, None)
+            if entry is not None:
+                self._toggle(self._ranks[pk], entry, False)
+
+    def search(self, query, role=None, limit=10):
+        self._ensure_fresh()
+        grams = trigrams(query, prefix=True)
+        if not grams:
+            return []
+        with self._lock:
+            # planes[i] - mos trigramlar soni i-bitining bitseti
+            planes = []
+            for gram in grams:
+                carry = self._bits(gram)
+                for i, plane in enumerate(planes):
+                    planes[i], carry = plane ^ carry, plane & carry
+                    if not carry:
+                        break
+                if carry:
+                    planes.append(carry)
+            if role is None:
+                allowed = 0
+                for mask in self._roles.values():
+                    allowed |= mask
+            else:
+                allowed = self._roles.get(role, 0)
+            pks, users = self._pks, self._users
+
+        results = []
+        needed = math.ceil(round(WORD_SIMILARITY_THRESHOLD * len(grams), 6))
+        for count in range(len(grams), needed - 1, -1):
+            if count >= 1 << len(planes):
+                continue
+            matched = allowed
+            for i, plane in enumerate(planes):
+                matched &= plane if count >> i & 1 else ~plane
+            while matched and len(results) < limit:
+                lowest = matched & -matched
+                pk = pks[lowest.bit_length() - 1]
+                results.append(dict(zip(RESULT_FIELDS, (pk, *users[pk], round(count / len(grams), 3)))))
+                matched ^= lowest
+            if len(results) >= limit:
+                break
+        return results
+
+
+index = NgramIndex()
+
+
+def _trigram_search(query, role, limit):
+    users = User.objects.all()
+    if role:
+        users = users.filter(role=role)
+    if len(query) < 3:
+        # Trigram uchun juda qisqa: 0009 dagi UPPER(...) text_pattern_ops indekslari bo'yicha prefiks
+        users = users.filter(Q(fullname__istartswith=query) | Q(username__istartswith=query))
+        users = users.annotate(score=Value(1.0, output_field=FloatField())).order_by('fullname', 'pk')
+    else:
+        # %> operatori GIN (gin_trgm_ops) indeksidan foydalanadi, o'xshashlik faqat topilganlar uchun hisoblanadi
+        users = users.filter(Q(fullname__trigram_word_similar=query) | Q(username__trigram_word_similar=query))
+        users = users.annotate(
+            score=Greatest(TrigramWordSimilarity(query, 'fullname'), TrigramWordSimilarity(query, 'username'))
+        ).order_by('-score', 'fullname', 'pk')
+    return [
+        {**row, 'score': round(row['score'], 3)}
+        for row in users.values(*RESULT_FIELDS)[:limit]
+    ]
+
+
+def search_users(query, role=None, limit=10):
+    """
+    Typo-tolerant user lookup by fullname/username, best matches first: pg_trgm GIN indexes on
+    PostgreSQL, the in-process NgramIndex elsewhere.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        return _trigram_search(query, role, limit)
+    return index.search(query, role, limit)
@@ -1,16 +1,53 @@
+import hmac
+
+from django.core.files.storage import default_storage
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.hashers import check_password
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
 from .serializers import LoginSerializer, RegisterSerializer, UserProfileSerializer, AssignmentSerializer, \
-    BookSerializer, CalendarEventSerializer
-from .models import User, Assignment, Book, CalendarEvent
+    BookSerializer, CalendarEventSerializer, UserImportSerializer, StudentSummarySerializer, UserBriefSerializer, \
+    AuditLogSerializer, AuditLogFilterSerializer, RotatingTokenRefreshSerializer, LogoutSerializer, \
+    UserSearchQuerySerializer, UserSearchResultSerializer, DirectUploadSerializer, DirectUploadTicketSerializer, \
+    DirectUploadFinalizeSerializer
+from .user_import import parse_rows, import_users
+from .user_search import search_users
+from .metrics import expose_all
+from .fast_serializers import FieldSelectionError, fast_response, fast_serialize, parse_selection
+from . import audit, direct_uploads, grading_queue, partitions, reaper, revocation
+from .groups import missing_submitters, visible_assignments, visible_events
+from .batch import BatchError, batch_cache, run_batch
+from .downloads import stream_zip, submission_entries
+from .storage import ARCHIVE_SEPARATOR
+from .summaries import get_summary
+from .models import User, Assignment, Book, CalendarEvent, AuditLog
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 
+FIELD_SELECTION_PARAMETERS = [
+    OpenApiParameter('fields', str, description="Faqat kerakli maydonlar, masalan: id,title,deadline"),
+    OpenApiParameter('expand', str, description="ForeignKey maydonlarini ichki obyekt sifatida qaytarish, "
+                                                "masalan: student,assignment"),
+]
+
+TERM_PARAMETER = OpenApiParameter('term', str, description="Faqat shu term javoblari: YYYY-MM (term boshlanish oyi) "
+                                                          "yoki current; berilmasa hamma termlar")
+
+
+def filter_term(submissions, request):
+    # Aniq term chegarasi PostgreSQL'ga faqat shu term partitionini o'qish imkonini beradi
+    term = request.query_params.get('term')
+    if not term:
+        return submissions
+    return submissions.filter(partitions.term_filter(term))
+
 
 class RegisterAPIView(APIView):
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -79,6 +116,108 @@ class LoginAPIView(APIView):
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
 
+class TokenRefreshAPIView(APIView):
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
+
+    @extend_schema(
+        summary="Tokenni yangilash",
+        description="Refresh token evaziga yangi access va refresh token beradi; yuborilgan refresh token bekor qilinadi",
+        request=RotatingTokenRefreshSerializer,
+        responses={
+            200: RotatingTokenRefreshSerializer,
+            401: OpenApiResponse(description="Token yaroqsiz, muddati o'tgan yoki bekor qilingan")
+        },
+        tags=["User Authentication API"]
+    )
+    def post(self, request):
+        serializer = RotatingTokenRefreshSerializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+class LogoutAPIView(APIView):
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
+
+    @extend_schema(
+        summary="Chiqish",
+        description="Refresh tokenni bekor qiladi: u bilan boshqa yangi token olib bo'lmaydi",
+        request=LogoutSerializer,
+        responses={
+            205: OpenApiResponse(description="Token bekor qilindi"),
+            401: OpenApiResponse(description="Token yaroqsiz yoki muddati o'tgan")
+        },
+        tags=["User Authentication API"]
+    )
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            token = RefreshToken(serializer.validated_data['refresh'])
+        except TokenError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+        revocation.revoke(token)
+        return Response(status=status.HTTP_205_RESET_CONTENT)
+
+
+class UserImportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
+
+    @extend_schema(
+        summary="Foydalanuvchilarni ommaviy import qilish",
+        description="CSV yoki JSON fayldan (yoki JSON ro'yxatdan) studentlarni bir martada yaratish (faqat admin). "
+                    "Har bir xato qator uchun hisobot qaytaradi",
+        request=UserImportSerializer,
+        responses={
+            201: OpenApiResponse(description="Yaratilganlar soni va qatorlar bo'yicha xatolar"),
+            400: OpenApiResponse(description="Fayl o'qilmadi")
+        },
+        tags=["User Authentication API"]
+    )
+    def post(self, request):
+        if request.user.role != 'admin':
+            return Response({'error': "Faqat admin import qila oladi!"}, status=403)
+        if isinstance(request.data, list):
+            rows = request.data
+        else:
+            serializer = UserImportSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            upload = serializer.validated_data['file']
+            fmt = serializer.validated_data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            try:
+                rows = parse_rows(upload.read(), fmt)
+            except (ValueError, UnicodeDecodeError) as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        report = import_users(rows)
+        return Response(report, status=status.HTTP_201_CREATED)
+
+
+class UserSearchAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Foydalanuvchilarni qidirish",
+        description="Ism yoki username bo'yicha xatolarga chidamli qidiruv (autocomplete uchun): natijalar o'xshashlik "
+                    "bo'yicha kamayish tartibida, role bo'yicha filtrlash mumkin",
+        parameters=[UserSearchQuerySerializer],
+        responses={200: UserSearchResultSerializer(many=True)},
+        tags=["User Profile API"]
+    )
+    def get(self, request):
+        if request.user.role not in ('ustoz', 'admin'):
+            return Response({'error': "Faqat ustoz yoki admin uchun!"}, status=403)
+        params = UserSearchQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=400)
+        query = params.validated_data
+        return Response(search_users(query['q'], query.get('role'), query['limit']))
+
+
 class ProfileDetailsAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -149,14 +288,14 @@ class AssignmentListAPIView(APIView):
 
     @extend_schema(
         summary="Topshiriqlar ro'yxati",
-        description="Barcha topshiriqlar ro'yxatini olish",
+        description="Topshiriqlar ro'yxatini olish (student guruhsiz va o'z guruhlariga berilgan topshiriqlarni ko'radi)",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: AssignmentSerializer(many=True)},
         tags=["Assignments"]
     )
     def get(self, request):
-        assignments = Assignment.objects.all()
-        serializer = AssignmentSerializer(assignments, many=True)
-        return Response(serializer.data)
+        assignments = visible_assignments(request.user, batch_cache(request))
+        return fast_response(AssignmentSerializer, assignments, request)
 
 
 class AssignmentCreateAPIView(APIView):
@@ -185,13 +324,12 @@ class AssignmentDetailAPIView(APIView):
     @extend_schema(
         summary="Topshiriq ma'lumotlari",
         description="Bitta topshiriq tafsilotlari",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: AssignmentSerializer},
         tags=["Assignments"]
     )
     def get(self, request, pk):
-        assignment = get_object_or_404(Assignment, pk=pk)
-        serializer = AssignmentSerializer(assignment)
-        return Response(serializer.data)
+        return fast_response(AssignmentSerializer, Assignment.objects.filter(pk=pk), request, many=False)
 
 
 class AssignmentUpdateAPIView(APIView):
@@ -211,7 +349,11 @@ class AssignmentUpdateAPIView(APIView):
             return Response({'error': 'Faqat o‘qituvchi o‘zgartira oladi!'}, status=status.HTTP_403_FORBIDDEN)
         serializer = AssignmentSerializer(assignment, data=request.data)
         if serializer.is_valid():
+            fields = ('title', 'description', 'deadline', 'file')
+            old = {name: getattr(assignment, name) for name in fields}
             serializer.save()
+            audit.record(request.user, 'update', assignment,
+                         audit.diff(Assignment, old, {name: getattr(assignment, name) for name in fields}, fields))
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -230,7 +372,8 @@ class AssignmentDeleteAPIView(APIView):
         assignment = get_object_or_404(Assignment, pk=pk)
         if assignment.teacher != request.user:
             return Response({'error': 'Faqat o‘qituvchi o‘chirishi mumkin!'}, status=status.HTTP_403_FORBIDDEN)
-        assignment.delete()
+        reaper.soft_delete(assignment)
+        audit.record(request.user, 'delete', assignment)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -239,6 +382,23 @@ from .models import Submission
 from .serializers import SubmissionSerializer
 
 
+class AssignmentMissingSubmittersAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Topshiriqni topshirmaganlar",
+        description="Topshiriq guruhidagi (guruhsiz bo'lsa barcha) studentlardan hali javob yubormaganlar",
+        parameters=FIELD_SELECTION_PARAMETERS,
+        responses={200: UserBriefSerializer(many=True)},
+        tags=["Assignments"]
+    )
+    def get(self, request, pk):
+        assignment = get_object_or_404(Assignment, pk=pk)
+        if not (assignment.teacher_id == request.user.pk or request.user.role == 'admin'):
+            return Response({'error': "Faqat o‘qituvchi yoki admin ko‘ra oladi!"}, status=403)
+        return fast_response(UserBriefSerializer, missing_submitters(assignment).order_by('fullname', 'pk'), request)
+
+
 class AssignmentSubmissionAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser)
@@ -262,6 +422,25 @@ class AssignmentSubmissionAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AssignmentSubmissionsZipAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Topshiriq javoblarini zip qilib yuklab olish",
+        description="Ustoz topshiriqning har bir studentdan oxirgi urinishini bitta zip arxivda oladi "
+                    "(fayl nomi: \"<F.I.Sh> - <urinish>-urinish.<kengaytma>\"); arxiv oqim bilan hosil qilinadi",
+        responses={200: OpenApiResponse(description="application/zip")},
+        tags=["Assignments"]
+    )
+    def get(self, request, pk):
+        assignment = get_object_or_404(Assignment, pk=pk)
+        if assignment.teacher != request.user:
+            return Response({'error': "Faqat topshiriq ustozi yuklab olishi mumkin!"}, status=status.HTTP_403_FORBIDDEN)
+        response = StreamingHttpResponse(stream_zip(submission_entries(assignment)), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="assignment-{assignment.pk}.zip"'
+        return response
+
+
 class AssignmentGradeAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -274,15 +453,25 @@ class AssignmentGradeAPIView(APIView):
         tags=["Assignments"]
     )
     def post(self, request, submission_id):
-        submission = get_object_or_404(Submission, pk=submission_id)
+        # O'chirilgan (reaper kutayotgan) topshiriq javoblari baholanmaydi
+        submission = get_object_or_404(Submission, pk=submission_id, assignment__deleted_at=None)
         assignment = submission.assignment
         if assignment.teacher != request.user:
             return Response({'error': 'Faqat o‘qituvchi baho qo‘yishi mumkin!'}, status=status.HTTP_403_FORBIDDEN)
         grade = request.data.get('grade')
         feedback = request.data.get('feedback', '')
-        submission.grade = grade
-        submission.feedback = feedback
-        submission.save()
+        with transaction.atomic():
+            if not grading_queue.lock_for_grading(submission.pk, request.user):
+                return Response({'error': "Bu javobni boshqa o'qituvchi baholayapti."}, status=status.HTTP_409_CONFLICT)
+            # Qator band qilingandan keyin qayta o'qiladi: eski baho (delta va audit uchun) boshqa yozuvdan eskirmagan
+            submission = Submission.objects.get(pk=submission.pk)
+            old = {'grade': submission.grade, 'feedback': submission.feedback}
+            submission.grade = grade
+            submission.feedback = feedback
+            submission.claimed_by = submission.claimed_at = None
+            submission.save()
+            audit.record(request.user, 'grade', submission,
+                         audit.diff(Submission, old, {'grade': grade, 'feedback': feedback}, ('grade', 'feedback')))
         serializer = SubmissionSerializer(submission)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -294,13 +483,13 @@ class BookListAPIView(APIView):
     @extend_schema(
         summary="Darsliklar ro'yxati",
         description="Barcha darsliklarni ko‘rish",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: BookSerializer(many=True)},
         tags=["Books"]
     )
     def get(self, request):
         books = Book.objects.all()
-        serializer = BookSerializer(books, many=True)
-        return Response(serializer.data)
+        return fast_response(BookSerializer, books, request)
 
 
 class BookCreateAPIView(APIView):
@@ -324,6 +513,101 @@ class BookCreateAPIView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class DirectUploadAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = (JSONParser, FormParser)
+
+    @extend_schema(
+        summary="To'g'ridan-to'g'ri yuklash uchun presigned URL",
+        description="Fayl (javob, darslik yoki topshiriq fayli) obyekt omboriga serverni chetlab yuklanadi: klient "
+                    "qaytgan url'ga headers bilan PUT qiladi, so'ng token bilan finalize chaqiradi. Hajm va "
+                    "sha256 oldindan e'lon qilinadi, ombor boshqa tarkibni qabul qilmaydi",
+        request=DirectUploadSerializer,
+        responses={200: DirectUploadTicketSerializer},
+        tags=["Uploads"]
+    )
+    def post(self, request):
+        if not settings.DIRECT_UPLOADS:
+            return Response({'error': "Obyekt ombori sozlanmagan: faylni oddiy endpoint orqali yuklang."},
+                            status=status.HTTP_404_NOT_FOUND)
+        serializer = DirectUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        context = {}
+        if data['target'] == 'submission':
+            if 'assignment' not in data:
+                return Response({'assignment': ["Bu maydon talab qilinadi."]}, status=status.HTTP_400_BAD_REQUEST)
+            assignment = get_object_or_404(Assignment, pk=data['assignment'])
+            if Submission.objects.filter(assignment=assignment, student=request.user).count() >= 3:
+                return Response({'error': "Siz 3 martadan ortiq yubora olmaysiz."}, status=status.HTTP_400_BAD_REQUEST)
+            context['assignment'] = assignment.pk
+        elif data['target'] == 'book' and request.user.role not in ('ustoz', 'admin'):
+            return Response({'error': "Faqat ustoz yoki admin fayl yuklashi mumkin!"}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            ticket = direct_uploads.presign(request.user, data['target'], data['filename'], data['size'],
+                                            data['sha256'], **context)
+        except direct_uploads.DirectUploadError as exc:
+            return Response({'error': str(exc)}, status=exc.status)
+        return Response(ticket)
+
+
+class DirectUploadFinalizeAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = (JSONParser, FormParser)
+
+    @extend_schema(
+        summary="To'g'ridan-to'g'ri yuklashni yakunlash",
+        description="Ombordagi obyektni (hajmi, sha256, turi) tekshiradi va Submission/Book/Assignment yozuvini "
+                    "yaratadi; token'dan tashqari maydonlar oddiy yaratish endpointidagi kabi (file'siz)",
+        request=DirectUploadFinalizeSerializer,
+        responses={201: OpenApiResponse(description="SubmissionSerializer, BookSerializer yoki AssignmentSerializer")},
+        tags=["Uploads"]
+    )
+    def post(self, request):
+        if not settings.DIRECT_UPLOADS:
+            return Response({'error': "Obyekt ombori sozlanmagan: faylni oddiy endpoint orqali yuklang."},
+                            status=status.HTTP_404_NOT_FOUND)
+        token = DirectUploadFinalizeSerializer(data=request.data)
+        if not token.is_valid():
+            return Response(token.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload = direct_uploads.finalize(token.validated_data['token'], request.user)
+        except direct_uploads.DirectUploadError as exc:
+            return Response({'error': str(exc)}, status=exc.status)
+
+        extra = {'file': upload['key']}
+        if upload['target'] == 'submission':
+            assignment = get_object_or_404(Assignment, pk=upload['assignment'])
+            prev_attempts = Submission.objects.filter(assignment=assignment, student=request.user).count()
+            if prev_attempts >= 3:
+                return Response({'error': "Siz 3 martadan ortiq yubora olmaysiz."}, status=status.HTTP_400_BAD_REQUEST)
+            serializer_class = SubmissionSerializer
+            extra.update(student=request.user, assignment=assignment, attempt=prev_attempts + 1,
+                         content_hash=upload['verified_sha256'])
+        elif upload['target'] == 'book':
+            if request.user.role not in ('ustoz', 'admin'):
+                return Response({'error': "Faqat ustoz yoki admin fayl yuklashi mumkin!"},
+                                status=status.HTTP_403_FORBIDDEN)
+            serializer_class = BookSerializer
+            extra.update(uploaded_by=request.user, content_hash=upload['verified_sha256'])
+        else:
+            serializer_class = AssignmentSerializer
+            extra.update(teacher=request.user)
+        serializer = serializer_class(data=request.data)
+        # Fayl allaqachon omborda - serializer uni qayta qabul qilmaydi
+        del serializer.fields['file']
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            if not direct_uploads.consume(upload['key']):
+                return Response({'error': "Bu fayl allaqachon qabul qilingan."}, status=status.HTTP_409_CONFLICT)
+            instance = serializer.save(**extra)
+        if upload['target'] != 'assignment':
+            direct_uploads.schedule_preview(instance)
+        return Response(serializer_class(instance).data, status=status.HTTP_201_CREATED)
+
+
 class BookDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -331,13 +615,12 @@ class BookDetailAPIView(APIView):
     @extend_schema(
         summary="Bitta darslik tafsiloti",
         description="Muayyan darslik haqida to'liq ma'lumot",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: BookSerializer},
         tags=["Books"]
     )
     def get(self, request, pk):
-        book = get_object_or_404(Book, pk=pk)
-        serializer = BookSerializer(book)
-        return Response(serializer.data)
+        return fast_response(BookSerializer, Book.objects.filter(pk=pk), request, many=False)
 
 
 class BookDeleteAPIView(APIView):
@@ -353,7 +636,8 @@ class BookDeleteAPIView(APIView):
         book = get_object_or_404(Book, pk=pk)
         if not (book.uploaded_by == request.user or request.user.role == 'admin'):
             return Response({'error': 'Faqat o‘z darsligini yoki admin o‘chira oladi!'}, status=403)
-        book.delete()
+        reaper.soft_delete(book)
+        audit.record(request.user, 'delete', book)
         return Response(status=204)
 
 
@@ -364,13 +648,17 @@ class MyGradesAPIView(APIView):
     @extend_schema(
         summary="Mening baholarim",
         description="Foydalanuvchi o‘ziga tegishli barcha topshiriqlarning baholarini ko‘radi",
+        parameters=FIELD_SELECTION_PARAMETERS + [TERM_PARAMETER],
         responses={200: SubmissionSerializer(many=True)},
         tags=["Grades"]
     )
     def get(self, request):
-        submissions = Submission.objects.filter(student=request.user).exclude(grade=None)
-        serializer = SubmissionSerializer(submissions, many=True)
-        return Response(serializer.data)
+        submissions = Submission.objects.filter(student=request.user, assignment__deleted_at=None).exclude(grade=None)
+        try:
+            submissions = filter_term(submissions, request)
+        except ValueError:
+            return Response({'error': "Noto'g'ri term: YYYY-MM yoki current bo'lishi kerak"}, status=400)
+        return fast_response(SubmissionSerializer, submissions, request)
 
 
 class TeacherGradesAPIView(APIView):
@@ -380,15 +668,19 @@ class TeacherGradesAPIView(APIView):
     @extend_schema(
         summary="Ustoz uchun barcha baholar",
         description="Ustoz o‘zi yaratgan topshiriqlarga barcha studentlar tomonidan yuborilgan baholarni ko‘radi",
+        parameters=FIELD_SELECTION_PARAMETERS + [TERM_PARAMETER],
         responses={200: SubmissionSerializer(many=True)},
         tags=["Grades"]
     )
     def get(self, request):
         if not request.user.role == 'ustoz':
             return Response({'error': "Faqat ustozlar uchun!"}, status=403)
-        submissions = Submission.objects.filter(assignment__teacher=request.user)
-        serializer = SubmissionSerializer(submissions, many=True)
-        return Response(serializer.data)
+        submissions = Submission.objects.filter(assignment__teacher=request.user, assignment__deleted_at=None)
+        try:
+            submissions = filter_term(submissions, request)
+        except ValueError:
+            return Response({'error': "Noto'g'ri term: YYYY-MM yoki current bo'lishi kerak"}, status=400)
+        return fast_response(SubmissionSerializer, submissions, request)
 
 
 class GradeSetAPIView(APIView):
@@ -403,7 +695,8 @@ class GradeSetAPIView(APIView):
         tags=["Grades"]
     )
     def post(self, request, submission_id):
-        submission = get_object_or_404(Submission, pk=submission_id)
+        # O'chirilgan (reaper kutayotgan) topshiriq javoblari baholanmaydi
+        submission = get_object_or_404(Submission, pk=submission_id, assignment__deleted_at=None)
         assignment = submission.assignment
         if not (assignment.teacher == request.user or request.user.role == 'admin'):
             return Response({'error': "Faqat o‘qituvchi yoki admin baho qo‘yishi mumkin!"}, status=403)
@@ -411,13 +704,115 @@ class GradeSetAPIView(APIView):
         feedback = request.data.get('feedback', '')
         if grade is None:
             return Response({'error': 'Grade maydoni majburiy!'}, status=400)
-        submission.grade = grade
-        submission.feedback = feedback
-        submission.save()
+        with transaction.atomic():
+            if not grading_queue.lock_for_grading(submission.pk, request.user):
+                return Response({'error': "Bu javobni boshqa o'qituvchi baholayapti."}, status=409)
+            submission = Submission.objects.get(pk=submission.pk)
+            old = {'grade': submission.grade, 'feedback': submission.feedback}
+            submission.grade = grade
+            submission.feedback = feedback
+            submission.claimed_by = submission.claimed_at = None
+            submission.save()
+            audit.record(request.user, 'grade', submission,
+                         audit.diff(Submission, old, {'grade': grade, 'feedback': feedback}, ('grade', 'feedback')))
         serializer = SubmissionSerializer(submission)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class GradingQueueAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Baholash navbati",
+        description="Ustozning topshiriqlariga yuborilgan, hali baholanmagan oxirgi urinishlar: eng eski dedlayn "
+                    "va yuborilgan vaqt bo'yicha. Sahifalash cursor orqali (javobdagi next qiymati)",
+        parameters=FIELD_SELECTION_PARAMETERS + [
+            OpenApiParameter('cursor', str, description="Oldingi javobdagi next qiymati"),
+            OpenApiParameter('limit', int, description="Sahifa hajmi (standart 50, ko'pi bilan 200)"),
+        ],
+        responses={200: OpenApiResponse(description="{results: [...], next: cursor yoki null}")},
+        tags=["Grades"]
+    )
+    def get(self, request):
+        if request.user.role not in ('ustoz', 'admin'):
+            return Response({'error': "Faqat ustoz yoki admin uchun!"}, status=403)
+        try:
+            limit = min(int(request.query_params.get('limit', settings.GRADING_QUEUE_PAGE_SIZE)),
+                        settings.GRADING_QUEUE_MAX_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response({'error': "limit musbat butun son bo'lishi kerak."}, status=400)
+        try:
+            pks, next_cursor = grading_queue.page(grading_queue.queue_for(request.user),
+                                                  request.query_params.get('cursor'), limit)
+            results = fast_serialize(
+                SubmissionSerializer,
+                Submission.objects.filter(pk__in=pks).order_by(*grading_queue.QUEUE_ORDERING),
+                **parse_selection(request)
+            )
+        except (grading_queue.CursorError, FieldSelectionError) as exc:
+            return Response({'error': str(exc)}, status=400)
+        return Response({'results': results, 'next': next_cursor})
+
+
+class GradingQueueNextAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Navbatdagi javobni band qilish",
+        description="Navbatdagi hali hech kim band qilmagan javobni joriy o'qituvchiga biriktiradi",
+        request=None,
+        responses={200: SubmissionSerializer, 204: OpenApiResponse(description="Navbat bo'sh")},
+        tags=["Grades"]
+    )
+    def post(self, request):
+        if request.user.role not in ('ustoz', 'admin'):
+            return Response({'error': "Faqat ustoz yoki admin uchun!"}, status=403)
+        pk = grading_queue.claim_next(request.user)
+        if pk is None:
+            return Response(status=204)
+        return Response(SubmissionSerializer(Submission.objects.get(pk=pk)).data)
+
+
+class SubmissionClaimAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def _check(self, request, submission_id):
+        submission = get_object_or_404(Submission.objects.select_related('assignment'), pk=submission_id)
+        if not (submission.assignment.teacher_id == request.user.pk or request.user.role == 'admin'):
+            return Response({'error': "Faqat o‘qituvchi yoki admin baho qo‘yishi mumkin!"}, status=403)
+        return None
+
+    @extend_schema(
+        summary="Javobni baholash uchun band qilish",
+        description=f"Boshqa o'qituvchi bir vaqtda baholamasligi uchun javob band qilinadi "
+                    f"(claim {settings.GRADING_CLAIM_SECONDS // 60} daqiqa amal qiladi)",
+        request=None,
+        responses={200: SubmissionSerializer, 409: OpenApiResponse(description="Boshqa o'qituvchi band qilgan")},
+        tags=["Grades"]
+    )
+    def post(self, request, submission_id):
+        denied = self._check(request, submission_id)
+        if denied:
+            return denied
+        if not grading_queue.claim(submission_id, request.user):
+            return Response({'error': "Bu javob band yoki allaqachon baholangan."}, status=409)
+        return Response(SubmissionSerializer(Submission.objects.get(pk=submission_id)).data)
+
+    @extend_schema(
+        summary="Band qilishni bekor qilish",
+        responses={204: None},
+        tags=["Grades"]
+    )
+    def delete(self, request, submission_id):
+        denied = self._check(request, submission_id)
+        if denied:
+            return denied
+        grading_queue.release(submission_id, request.user)
+        return Response(status=204)
+
+
 class AllGradesAPIView(APIView):
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -425,15 +820,55 @@ class AllGradesAPIView(APIView):
     @extend_schema(
         summary="Barcha baholar (admin)",
         description="Admin yoki zamdirektor barcha submissionlarni va baholarni ko‘radi",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: SubmissionSerializer(many=True)},
         tags=["Grades"]
     )
     def get(self, request):
         if not request.user.role in ['admin', 'zamdirektor']:
             return Response({'error': "Faqat admin yoki zamdirektor uchun!"}, status=403)
-        submissions = Submission.objects.exclude(grade=None)
-        serializer = SubmissionSerializer(submissions, many=True)
-        return Response(serializer.data)
+        submissions = Submission.objects.filter(assignment__deleted_at=None).exclude(grade=None)
+        return fast_response(SubmissionSerializer, submissions, request)
+
+
+class GradeReportAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Term bo'yicha baholar hisoboti (admin)",
+        description="Term uchun studentlarning o'rtacha bahosi, GPA va kohortadagi percentil o'rni, ustozlar bo'yicha "
+                    "baholar taqsimoti va topshiriqlar bo'yicha trend. Natija keshlanadi, baho o'zgarsa qayta hisoblanadi",
+        parameters=[OpenApiParameter('term', str, description="YYYY-MM (term boshlanish oyi) yoki current; "
+                                                              "berilmasa current")],
+        responses={200: OpenApiResponse(description="Hisobot: cohort, students, teachers, assignments")},
+        tags=["Grades"]
+    )
+    def get(self, request):
+        if request.user.role not in ['admin', 'zamdirektor']:
+            return Response({'error': "Faqat admin yoki zamdirektor uchun!"}, status=403)
+        # numpy faqat hisobot so'ralganda yuklanadi (worker ishga tushishini sekinlashtirmaydi)
+        from . import analytics
+        try:
+            term = analytics.resolve_term(request.query_params.get('term') or 'current')
+        except ValueError:
+            return Response({'error': "Noto'g'ri term: YYYY-MM yoki current bo'lishi kerak"}, status=400)
+        return Response(analytics.get_report(term))
+
+
+class DashboardSummaryAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Student dashboard xulosasi",
+        description="Kutilayotgan topshiriqlar, baholangan/baholanmagan javoblar soni, o'rtacha baho va "
+                    "keyingi tadbir - oldindan hisoblangan jadvaldan bitta so'rov bilan",
+        responses={200: StudentSummarySerializer},
+        tags=["Dashboard"]
+    )
+    def get(self, request):
+        if request.user.role != 'student':
+            return Response({'error': "Faqat studentlar uchun!"}, status=403)
+        return Response(StudentSummarySerializer(get_summary(request.user)).data)
 
 
 class CalendarEventListAPIView(APIView):
@@ -442,14 +877,14 @@ class CalendarEventListAPIView(APIView):
 
     @extend_schema(
         summary="Kalendar tadbirlar ro'yxati",
-        description="Barcha dars va deadline tadbirlarini ko‘rish",
+        description="Hamma uchun, foydalanuvchi roli yoki guruhlari uchun dars va deadline tadbirlarini ko‘rish",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: CalendarEventSerializer(many=True)},
         tags=["Calendar"]
     )
     def get(self, request):
-        events = CalendarEvent.objects.filter(for_group__in=[request.user.role, "All", "", None])
-        serializer = CalendarEventSerializer(events, many=True)
-        return Response(serializer.data)
+        events = visible_events(request.user, batch_cache(request))
+        return fast_response(CalendarEventSerializer, events, request)
 
 
 class CalendarEventCreateAPIView(APIView):
@@ -480,14 +915,13 @@ class CalendarEventDetailAPIView(APIView):
     @extend_schema(
         summary="Bitta kalendar tadbir tafsiloti",
         description="Muayyan dars yoki deadline haqida to'liq ma'lumot",
+        parameters=FIELD_SELECTION_PARAMETERS,
         responses={200: CalendarEventSerializer},
         tags=["Calendar"]
     )
 
     def get(self, request, pk):
-        event = get_object_or_404(CalendarEvent, pk=pk)
-        serializer = CalendarEventSerializer(event)
-        return Response(serializer.data)
+        return fast_response(CalendarEventSerializer, CalendarEvent.objects.filter(pk=pk), request, many=False)
 
 
 
@@ -505,6 +939,101 @@ class CalendarEventDeleteAPIView(APIView):
         event = get_object_or_404(CalendarEvent, pk=pk)
         if not (event.created_by == request.user or request.user.role == 'admin'):
             return Response({'error': 'Faqat o‘z tadbirini yoki admin o‘chirishi mumkin!'}, status=403)
-        event.delete()
+        audit.delete(request.user, event)
         return Response(status=204)
 
+
+class AuditLogAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Audit jurnali (admin)",
+        description="Baholar, topshiriq o'zgarishlari va o'chirishlar tarixi: kim, qaysi obyekt va vaqt bo'yicha filtrlash",
+        parameters=[AuditLogFilterSerializer],
+        responses={200: AuditLogSerializer(many=True)},
+        tags=["Audit"]
+    )
+    def get(self, request):
+        if request.user.role != 'admin':
+            return Response({'error': "Faqat admin uchun!"}, status=403)
+        filters = AuditLogFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=400)
+        params = filters.validated_data
+        logs = AuditLog.objects.all()
+        if 'actor' in params:
+            logs = logs.filter(actor_id=params['actor'])
+        if 'object_type' in params:
+            logs = logs.filter(object_type=params['object_type'])
+        if 'object_id' in params:
+            logs = logs.filter(object_id=params['object_id'])
+        if 'action' in params:
+            logs = logs.filter(action=params['action'])
+        if 'since' in params:
+            logs = logs.filter(created_at__gte=params['since'])
+        if 'until' in params:
+            logs = logs.filter(created_at__lt=params['until'])
+        return Response(AuditLogSerializer(logs.select_related('actor')[:params['limit']], many=True).data)
+
+
+class ArchivedFileAPIView(APIView):
+    # Arxivga ko'chirilgan submission faylini pack ichidan oqim bilan beradi: faqat studentiga,
+    # topshiriq ustoziga yoki adminga
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Arxivlangan faylni yuklab olish",
+        description="Arxiv pack ichidagi submission faylini to'g'ridan-to'g'ri stream qiladi",
+        responses={200: OpenApiResponse(description="Fayl")},
+        tags=["Assignments"]
+    )
+    def get(self, request, name):
+        if ARCHIVE_SEPARATOR not in name:
+            raise Http404
+        submission = Submission.objects.filter(file=name).select_related('assignment').first()
+        if submission is None or not default_storage.exists(name):
+            raise Http404
+        user = request.user
+        if user.pk not in (submission.student_id, submission.assignment.teacher_id) and user.role != 'admin':
+            return Response({'error': "Faqat fayl egasi, topshiriq ustozi yoki admin yuklab olishi mumkin!"}, status=status.HTTP_403_FORBIDDEN)
+        return FileResponse(default_storage.open(name), filename=name.rsplit('/', 1)[-1])
+
+
+class MetricsAPIView(APIView):
+    authentication_classes = []
+
+    @extend_schema(
+        summary="Prometheus metrikalari",
+        description="So'rovlar davomiyligi, DB so'rovlari va javob hajmi gistogrammalari (Prometheus text format); "
+                    "Authorization: Bearer <METRICS_TOKEN> talab qilinadi",
+        responses={200: OpenApiResponse(description="text/plain metrikalar")},
+        tags=["Monitoring"]
+    )
+    def get(self, request):
+        scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        expected = settings.METRICS_TOKEN.encode()
+        if not expected or scheme != 'Bearer' or not hmac.compare_digest(token.encode(), expected):
+            return Response({'error': "Ruxsat yo'q"}, status=403)
+        return HttpResponse(expose_all(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class BatchAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = (JSONParser,)
+
+    @extend_schema(
+        summary="Bir nechta so'rovni bitta so'rovda bajarish",
+        description="Dashboard uchun: {\"requests\": [{\"method\": \"GET\", \"path\": \"/assignments/\"}, ...]} "
+                    "so'rovlarini bitta autentifikatsiya bilan server ichida bajaradi va natijalarni tartib bilan qaytaradi",
+        responses={
+            200: OpenApiResponse(description="Har bir so'rov uchun status va body"),
+            400: OpenApiResponse(description="Noto'g'ri yoki juda katta batch")
+        },
+        tags=["Batch"]
+    )
+    def post(self, request):
+        try:
+            responses = run_batch(request, request.data.get('requests') if isinstance(request.data, dict) else None)
+        except BatchError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'responses': responses})
@@ -8,6 +8,21 @@ class Settings(BaseSettings):
     db_host: str
     db_port: int
     secret_key: str
+    db_conn_max_age: int = 60
+    app_profile: str = 'full'  # 'api' - admin, jazzmin va schema ilovalarisiz worker
+    db_replica_hosts: str = ''
+    request_metrics: bool = False
+    metrics_token: str = ''
+    slow_request_seconds: float = 0
+    throttling: bool = True
+    # Umumiy kesh (throttle, replika pin, analitika versiyalari); bo'sh bo'lsa DB jadvali (createcachetable)
+    redis_url: str = ''
+    # S3-mos obyekt ombori (AWS S3, MinIO); s3_bucket bo'sh bo'lsa fayllar MEDIA_ROOT'da
+    s3_bucket: str = ''
+    s3_endpoint_url: str = ''
+    s3_access_key: str = ''
+    s3_secret_key: str = ''
+    s3_region: str = 'us-east-1'
 
     class Config:
         env_file = ".env"
@@ -32,12 +32,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'drf_spectacular',
     'api'
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
+    'api.middleware.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -47,6 +50,33 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# APP_PROFILE=api: faqat API xizmat qiladigan worker'lar uchun admin, Jazzmin va
+# OpenAPI schema ilovalari yuklanmaydi (tezroq ishga tushish)
+API_ONLY = env.app_profile == 'api'
+ADMIN_APPS = ['jazzmin', 'django.contrib.admin', 'django.contrib.messages']
+SCHEMA_APPS = ['drf_spectacular']
+if API_ONLY:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_APPS + SCHEMA_APPS]
+    MIDDLEWARE.remove('django.contrib.messages.middleware.MessageMiddleware')
+
+# So'rovlar bo'yicha metrikalar (/metrics) va sekin so'rovlar logi
+REQUEST_METRICS_ENABLED = env.request_metrics
+# /metrics faqat "Authorization: Bearer <METRICS_TOKEN>" bilan (Prometheus: authorization.credentials);
+# token berilmagan bo'lsa endpoint yopiq. Proxy ortida REMOTE_ADDR ishonchli emas, shuning uchun IP bo'yicha tekshirilmaydi
+METRICS_TOKEN = env.metrics_token
+SLOW_REQUEST_SECONDS = env.slow_request_seconds  # 0 - o'chirilgan
+SLOW_REQUEST_PROFILE_RATE = 0.01
+
+# batch/ endpointi cheklovlari
+BATCH_MAX_REQUESTS = 10
+BATCH_ALLOWED_METHODS = ('GET',)
+BATCH_EXCLUDED_ROUTES = ('batch', 'archived-file', 'metrics', 'assignments-submissions-zip')
+
+# Baholash navbati: claim qancha vaqt amal qiladi va sahifa hajmi
+GRADING_CLAIM_SECONDS = 15 * 60
+GRADING_QUEUE_PAGE_SIZE = 50
+GRADING_QUEUE_MAX_PAGE_SIZE = 200
+
 ROOT_URLCONF = 'root.urls'
 
 TEMPLATES = [
@@ -64,6 +94,9 @@ TEMPLATES = [
     },
 ]
 
+if API_ONLY:
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove('django.contrib.messages.context_processors.messages')
+
 WSGI_APPLICATION = 'root.wsgi.application'
 
 # Database
@@ -77,9 +110,46 @@ DATABASES = {
         "PASSWORD": env.db_password,
         "HOST": env.db_host,
         "PORT": env.db_port,
+        # Doimiy ulanishlar: har so'rovda yangi ulanish ochilmaydi, eskirganlari tekshiriladi
+        "CONN_MAX_AGE": env.db_conn_max_age,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# O'qish uchun replikalar: DB_REPLICA_HOSTS=host1:5432,host2:5432
+REPLICA_DATABASES = []
+for index, replica in enumerate(filter(None, env.db_replica_hosts.split(','))):
+    host, _, port = replica.strip().partition(':')
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or env.db_port,
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+# Barcha worker'lar uchun umumiy kesh: REDIS_URL berilsa Redis, aks holda primary bazadagi jadval
+# (python manage.py createcachetable). Process ichidagi LocMemCache ishlatilmaydi - replika pin va analitika
+# versiyalari worker'lar orasida bir xil bo'lishi kerak (throttle uchun THROTTLE_CACHE'ga qarang)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    }
+}
+if env.redis_url:
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env.redis_url,
+    }
+
+DATABASE_ROUTERS = ['api.routers.PrimaryReplicaRouter']
+# Foydalanuvchi yozgandan keyin uning o'qishlari shuncha soniya primary'da qoladi; pin umumiy CACHES aliasida,
+# shuning uchun keyingi so'rov qaysi worker'ga tushishidan qat'i nazar ishlaydi
+REPLICA_PIN_CACHE = 'default'
+REPLICA_PIN_SECONDS = 10
+
 AUTH_USER_MODEL = 'api.User'
 
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -103,12 +173,46 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'api.throttling.TokenBucketThrottle',),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',),
 
     'DATETIME_INPUT_FORMATS': ['%d-%m-%Y %H:%M:%S', '%d-%m-%Y %-H:%M:%S'],
     'DATE_INPUT_FORMATS': ['%d-%m-%Y'],
     'DATETIME_FORMAT': '%d-%m-%Y %-H:%M:%S',
 }
 
+# Token bucket: scope -> (sig'im, shuncha soniyada to'liq to'ladi). Kalit: scope + URL nomi + user id (yoki IP)
+# THROTTLE_CACHE - Redis CACHES aliasi (bitta atomik Lua skript). REDIS_URL bo'lmasa yoki Redis xato bersa chelaklar
+# process ichida: DB kesh jadvali har so'rovga bir nechta so'rov qo'shadi va atomik emas, u throttle uchun ishlatilmaydi
+THROTTLE_ENABLED = env.throttling
+THROTTLE_CACHE = 'default' if env.redis_url else None
+THROTTLE_LOCAL_MAX_KEYS = 100_000
+THROTTLE_BUCKETS = {
+    'default': (120, 60),
+    'login': (10, 60),
+    'expensive': (10, 60),
+    'upload': (20, 60),
+}
+THROTTLE_SCOPES = {
+    'login': 'login',
+    'register': 'login',
+    'all-grades': 'expensive',
+    'teacher-grades': 'expensive',
+    'users-import': 'expensive',
+    'assignments-submissions-zip': 'expensive',
+    'reports-grades': 'expensive',
+    'assignments-submit': 'upload',
+    'books-create': 'upload',
+    'uploads-direct': 'upload',
+    'uploads-direct-finalize': 'upload',
+}
+
+if API_ONLY:
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'api.schema.NullSchema'
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'LMS API',
     'DESCRIPTION': 'Website LMS API',
@@ -117,6 +221,8 @@ SPECTACULAR_SETTINGS = {
     'SCHEMA_PATH_PREFIX': r'/api',
     'COMPONENT_SPLIT_REQUEST': True
 }
+# build_schema komandasi tayyorlagan OpenAPI fayllari (api/schema/ shu yerdan beriladi)
+OPENAPI_SCHEMA_DIR = os.path.join(BASE_DIR, 'schema')
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -137,6 +243,105 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 STATIC_ROOT = os.path.join(BASE_DIR / 'static')
 
+STORAGES = {
+    "default": {"BACKEND": "api.storage.ArchiveAwareStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# S3_BUCKET berilsa fayllar S3-mos obyekt omborida saqlanadi va klient ularni presigned PUT bilan to'g'ridan-to'g'ri
+# yuklaydi (uploads/direct/ -> PUT -> uploads/direct/finalize/), fayl baytlari worker'lardan o'tmaydi.
+# Finalize qilinmagan obyektlar uchun bucket'da lifecycle qoidasi qo'yish tavsiya etiladi.
+# Arxivlangan "pack::a'zo" nomlari S3'da ham o'qiladi, lekin pack'lar bucket'da shu kalit bilan bo'lishi kerak:
+# S3_BUCKET yoqishdan oldin MEDIA_ROOT'dagi fayllarni (archives/ bilan birga) bucket'ga ko'chiring, masalan
+# aws s3 sync $MEDIA_ROOT s3://$S3_BUCKET/
+DIRECT_UPLOADS = bool(env.s3_bucket)
+if DIRECT_UPLOADS:
+    STORAGES["default"] = {
+        "BACKEND": "api.s3_storage.ArchiveAwareS3Storage",
+        "OPTIONS": {
+            "bucket_name": env.s3_bucket,
+            "endpoint_url": env.s3_endpoint_url or None,
+            "access_key": env.s3_access_key or None,
+            "secret_key": env.s3_secret_key or None,
+            "region_name": env.s3_region,
+            "signature_version": "s3v4",
+            # MinIO va boshqa o'z serverimizdagi omborlar uchun
+            "addressing_style": "path" if env.s3_endpoint_url else None,
+            "file_overwrite": False,
+        },
+    }
+# presigned PUT shuncha soniya amal qiladi; finalize token katta fayllar sekin yuklanishi uchun uzoqroq
+PRESIGNED_UPLOAD_SECONDS = 15 * 60
+DIRECT_UPLOAD_FINALIZE_SECONDS = 24 * 60 * 60
+# Ombor x-amz-checksum-sha256 ni saqlamasa (ba'zi S3 o'rinbosarlari) finalize rad etiladi
+DIRECT_UPLOAD_REQUIRE_CHECKSUM = True
+
+# Eski submission fayllari arxivi (archive_submissions komandasi)
+ARCHIVE_DIR = 'archives/'
+# O'quv choraklari (term) boshlanadigan oylar
+TERM_START_MONTHS = (2, 9)
+
+# Topshiriq javoblarini zip qilib oqim bilan berishda fayldan bir martada o'qiladigan hajm
+ZIP_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Yuklashlar oqim davomida tekshiriladi (route nomi bo'yicha): hajm oshishi bilan to'xtatiladi, tur birinchi
+# bo'lakdagi magic baytlardan aniqlanadi; sha256 content_hash ham shu o'qishda hisoblanadi
+FILE_UPLOAD_HANDLERS = [
+    'api.uploads.ValidatingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+UPLOAD_LIMITS = {
+    'assignments-submit': {'max_size': 50 * 1024 * 1024, 'types': ('pdf', 'office', 'image', 'archive', 'text')},
+    'books-create': {'max_size': 200 * 1024 * 1024, 'types': ('pdf', 'office', 'image')},
+    'assignments-create': {'max_size': 50 * 1024 * 1024, 'types': ('pdf', 'office', 'image', 'archive', 'text')},
+    'assignments-update': {'max_size': 50 * 1024 * 1024, 'types': ('pdf', 'office', 'image', 'archive', 'text')},
+}
+
+# Book va Submission fayllari uchun muqova/birinchi sahifa preview'lari (MEDIA_ROOT ichida, content hash bo'yicha)
+PREVIEW_DIR = 'previews/'
+PREVIEW_SIZE = (320, 320)
+
+# Fon vazifalari (preview generatsiyasi va h.k.) uchun thread pool
+BACKGROUND_TASK_WORKERS = 2
+BACKGROUND_TASKS_EAGER = False
+
+# Admin ro'yxatlarida shundan ko'p qator bo'lsa COUNT(*) o'rniga PostgreSQL planner bahosi ko'rsatiladi
+ADMIN_EXACT_COUNT_THRESHOLD = 10_000
+
+# PostgreSQL'da Submission term bo'yicha partitionlangan: manage_partitions shuncha kelgusi term partitionini
+# oldindan yaratadi va joriy term bilan birga SUBMISSION_RETAIN_TERMS tadan eski termlarni ajratadi (None - hammasi qoladi)
+SUBMISSION_PARTITIONS_AHEAD = 2
+SUBMISSION_RETAIN_TERMS = None
+
+# O'chirilgan topshiriq/kitoblarni reaper shuncha qatordan bo'lib o'chiradi (har bir bo'lak alohida tranzaksiya)
+REAPER_BATCH_SIZE = 500
+
+# Bekor qilingan refresh tokenlar filtri: kamida shuncha yozuvga mo'ljallangan (ko'proq bo'lsa, qayta qurilganda
+# mavjud yozuvlarning ikki barobariga), boshqa
+# worker'lardagi bekor qilishlar shuncha soniyada bir olinadi
+REVOCATION_FILTER_CAPACITY = 1_000_000
+REVOCATION_FILTER_ERROR_RATE = 0.001
+REVOCATION_SYNC_SECONDS = 5
+
+# Foydalanuvchilar qidiruvi: PostgreSQL'da pg_trgm, boshqa bazalarda xotiradagi n-gram indeks
+# (shuncha soniyada bir fonda qayta quriladi)
+USER_SEARCH_INDEX_SECONDS = 300
+USER_SEARCH_MAX_LIMIT = 50
+
+# Term bo'yicha baholar hisoboti: baholar bazadan shuncha qatorlik bo'laklarda o'qiladi, natija ANALYTICS_CACHE'da
+# saqlanadi (baho o'zgarsa darhol eskiradi; signalsiz bulk yozuvlar uchun muddat ham bor).
+# Versiya hisoblagichlari ham shu keshda: invalidate() barcha worker'larga ta'sir qilishi uchun u umumiy bo'lishi kerak
+ANALYTICS_CACHE = 'default'
+ANALYTICS_CHUNK_SIZE = 20_000
+ANALYTICS_CACHE_SECONDS = 6 * 60 * 60
+# GPA: (eng past baho, ball) - 5 ballik tizim
+GPA_SCALE = ((86, 5), (71, 4), (56, 3), (0, 2))
+
+# Audit jurnali xotirada yig'iladi va shuncha yozuv yoki soniyadan keyin bitta bulk_create bilan yoziladi
+AUDIT_BATCH_SIZE = 200
+AUDIT_FLUSH_SECONDS = 5
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -222,8 +427,10 @@ JAZZMIN_UI_TWEAKS = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
-    "ROTATE_REFRESH_TOKENS": False,
-    "BLACKLIST_AFTER_ROTATION": False,
+    # Har bir refresh'da yangi refresh token beriladi, eskisi api.revocation orqali bekor qilinadi
+    # (token_blacklist app'i o'rniga: tekshiruv xotiradagi Bloom filter bilan, DB faqat filter topganda)
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": False,
 
     "ALGORITHM": "HS256",
@@ -252,7 +459,7 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
 
     "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
-    "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.serializers.RotatingTokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers.TokenVerifySerializer",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
     "SLIDING_TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer",
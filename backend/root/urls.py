@@ -1,15 +1,37 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 from django.conf.urls.static import static
+from django.utils.module_loading import import_string
 from .settings import STATIC_URL, STATIC_ROOT, MEDIA_URL, MEDIA_ROOT
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    Imports the view class on the first request, so heavy modules stay out of worker startup.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = True
+    return wrapper
+
+
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('', include('api.urls'))
 ]
 
+if not settings.API_ONLY:
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 urlpatterns += static(STATIC_URL, document_root=STATIC_ROOT) + static(MEDIA_URL, document_root=MEDIA_ROOT)
-urlpatterns += [
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui')
-]
+if not settings.API_ONLY:
+    urlpatterns += [
+        path('api/schema/', lazy_view('api.schema.CachedSchemaAPIView'), name='schema'),
+        path('docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui')
+    ]